@@ -1,8 +1,14 @@
 from django.contrib import admin, messages
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
+from . import facets
 from .models import AuctionListing, BidTransaction, Product
+from .rankings import close_auctions, open_auctions
+from .tasks import schedule_auction_lifecycle
 
 
 class BidTransactionInline(admin.TabularInline):
@@ -44,15 +50,45 @@ class AuctionListingAdmin(admin.ModelAdmin):
         (None, {"fields": ("product", "status", "winner")}),
         (_("Time Settings"), {"fields": ("start_time", "end_time")}),
         (_("Price Settings"), {"fields": ("starting_price", "buy_now_price", "current_price")}),
+        (_("Bid Stats"), {"fields": ("bid_count", "unique_bidders", "last_bid_at")}),
+        (_("Settlement"), {"fields": ("settled_at", "settlement_failed_at")}),
         (_("System Info"), {"fields": ("created_at", "updated_at")}),
     )
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = (
+        "bid_count",
+        "unique_bidders",
+        "last_bid_at",
+        "settled_at",
+        "settlement_failed_at",
+        "created_at",
+        "updated_at",
+    )
+
+    def save_model(self, request, obj, form, change):
+        old_status = form.initial.get("status") if change else None
+        super().save_model(request, obj, form, change)
+        transaction.on_commit(lambda: schedule_auction_lifecycle(obj))
+
+        # Keep the ranking indexes and facets in step, as every other lifecycle path does
+        if obj.status == AuctionListing.Status.ACTIVE:
+            rows = [(obj.id, obj.end_time)]  # Re-scored if only its end_time changed
+            transaction.on_commit(lambda: open_auctions(rows))
+        elif old_status == AuctionListing.Status.ACTIVE:
+            transaction.on_commit(lambda: close_auctions([obj.id]))
+        if obj.status != old_status:
+            transaction.on_commit(facets.invalidate)
 
     @admin.action(description=_("Cancel selected auctions"))
     def cancel_auctions(self, request, queryset):
-        updated_count = queryset.filter(status__in=[AuctionListing.Status.ACTIVE, AuctionListing.Status.DRAFT]).update(
-            status=AuctionListing.Status.CANCELLED
+        cancellable = [AuctionListing.Status.ACTIVE, AuctionListing.Status.DRAFT]
+        auction_ids = list(queryset.filter(status__in=cancellable).values_list("id", flat=True))
+        updated_count = AuctionListing.objects.filter(id__in=auction_ids, status__in=cancellable).update(
+            status=AuctionListing.Status.CANCELLED,
+            version=F("version") + 1,
+            updated_at=timezone.now(),
         )
+        transaction.on_commit(lambda: close_auctions(auction_ids))
+        transaction.on_commit(facets.invalidate)
 
         self.message_user(
             request,
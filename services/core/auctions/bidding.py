@@ -0,0 +1,131 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import NamedTuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+from payments.services import pay_buy_now
+
+from . import facets
+from .models import AuctionListing, BidTransaction, Product
+from .rankings import close_auctions, record_bid
+
+PLACE_BID_SQL = Path(__file__).parent / "sql" / "place_bid.sql"
+
+# Refusal statuses of auction_place_bid -> API error messages
+BID_ERRORS = {
+    "not_found": "Auction not found.",
+    "not_active": "Auction is not active.",
+    "ended": "Auction has ended.",
+    "own_auction": "You cannot bid on your own auction.",
+    "too_low": "Bid must be higher than current price.",
+    "insufficient_funds": "Insufficient funds.",
+}
+
+
+class BidResult(NamedTuple):
+    status: str
+    bid_id: uuid.UUID | None
+    bid_at: datetime | None
+    price: Decimal | None
+    previous_winner_id: uuid.UUID | None
+    bid_count: int | None
+    unique_bidders: int | None
+    balance: Decimal | None
+    held_balance: Decimal | None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    @property
+    def error(self) -> str | None:
+        return BID_ERRORS.get(self.status)
+
+
+def install_place_bid_function(connection=connection):
+    """
+    (Re)create the auction_place_bid() stored function. Run by migrations, and by the test setup (--nomigrations).
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(PLACE_BID_SQL.read_text())
+
+
+def place_bid(auction_id, bidder_id, amount: Decimal) -> BidResult:
+    """
+    Place a bid through auction_place_bid() in one round trip (see auctions/sql/place_bid.sql).
+    Refused bids come back with a non-'ok' status and change nothing. Wrap the caller in
+    common.db.retry_on_conflict: the function takes row locks. Accepted bids count towards the hot index once
+    committed (auctions.rankings).
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT * FROM auction_place_bid(%s, %s, %s)", [str(auction_id), str(bidder_id), amount])
+        result = BidResult(*cursor.fetchone())
+
+    if result.ok:
+        transaction.on_commit(lambda: record_bid(auction_id, result.bid_at))
+    return result
+
+
+class BuyNowResult(NamedTuple):
+    price: Decimal
+    winner_id: uuid.UUID
+    previous_winner_id: uuid.UUID | None
+    finished_at: datetime
+
+
+# Guarded state transition ACTIVE -> FINISHED, plus the purchase logged as the closing bid, in one statement.
+# The self-join reads the row's previous winner and price under the same lock (RETURNING only sees new values).
+BUY_NOW_SQL = f"""
+    WITH finished AS (
+        UPDATE "{AuctionListing._meta.db_table}" a
+        SET status = '{AuctionListing.Status.FINISHED}', winner_id = %(buyer_id)s, current_price = a.buy_now_price,
+            end_time = %(now)s, settled_at = %(now)s,
+            bid_count = a.bid_count + 1, last_bid_at = %(now)s,
+            unique_bidders = a.unique_bidders + (NOT EXISTS (
+                SELECT 1 FROM "{BidTransaction._meta.db_table}" b
+                WHERE b.auction_id = a.id AND b.bidder_id = %(buyer_id)s AND b.created_at >= a.created_at
+            ))::integer,
+            version = a.version + 1, updated_at = %(now)s
+        FROM (
+            SELECT id, winner_id, current_price FROM "{AuctionListing._meta.db_table}"
+            WHERE id = %(auction_id)s FOR UPDATE
+        ) previous, "{Product._meta.db_table}" p
+        WHERE a.id = previous.id AND p.id = a.product_id
+          AND a.status = '{AuctionListing.Status.ACTIVE}' AND a.end_time > %(now)s
+          AND a.buy_now_price IS NOT NULL AND p.owner_id <> %(buyer_id)s
+        RETURNING a.id, a.current_price AS price, previous.winner_id AS previous_winner_id,
+            previous.current_price AS previous_price, p.owner_id AS seller_id
+    ), bid AS (
+        INSERT INTO "{BidTransaction._meta.db_table}" (id, created_at, updated_at, bidder_id, auction_id, amount)
+        SELECT gen_random_uuid(), %(now)s, %(now)s, %(buyer_id)s, id, price FROM finished
+    )
+    SELECT price, previous_winner_id, previous_price, seller_id FROM finished
+"""
+
+
+def buy_now(auction_id, buyer_id) -> BuyNowResult | None:
+    """
+    Buy an auction outright in the caller's transaction: finish it with one guarded UPDATE, then pay at once
+    (refund the previous top bidder, charge the buyer, credit the seller; the auction is stamped settled).
+    Returns None when the auction can't be bought (not found, not ACTIVE, ended, no buy-now price, own item).
+    Raises InsufficientFunds, which must roll the transaction back.
+    """
+
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(BUY_NOW_SQL, {"auction_id": str(auction_id), "buyer_id": str(buyer_id), "now": now})
+        row = cursor.fetchone()
+    if row is None:
+        return None
+
+    price, previous_winner_id, previous_price, seller_id = row
+    pay_buy_now(str(auction_id), buyer_id, seller_id, price, previous_winner_id, previous_price)
+    transaction.on_commit(lambda: close_auctions([auction_id]))
+    transaction.on_commit(facets.invalidate)
+
+    return BuyNowResult(price, buyer_id, previous_winner_id, now)
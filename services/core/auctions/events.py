@@ -0,0 +1,49 @@
+import json
+import logging
+
+import redis
+from common.valkey import get_client
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_realtime_client() -> redis.Redis:
+    """
+    Client for the Valkey instance the realtime service listens on.
+    """
+
+    return get_client(settings.VALKEY_REALTIME_URL)
+
+
+def mask_username(username: str | None) -> str:
+    # SYNC: Matches the realtime service's masking of bidder names
+    if not username:
+        return "Anonymous"
+    if len(username) <= 2:
+        return f"{username[0]}***"
+    return f"{username[0]}***{username[-1]}"
+
+
+def publish_auction_event(auction_id, message: dict) -> None:
+    """
+    Publish to the auction's channel (`auction:<id>`); the realtime service forwards it to every connected client.
+    Best effort: clients that miss it still see the new state on their next read.
+    """
+
+    try:
+        get_realtime_client().publish(f"auction:{auction_id}", json.dumps(message))
+    except redis.RedisError as exc:
+        logger.warning(f"Could not publish {message.get('type')} for Auction {auction_id}: {exc}")
+
+
+def publish_auction_finished(auction_id, winner, price, finished_at) -> None:
+    publish_auction_event(
+        auction_id,
+        {
+            "type": "AUCTION_FINISHED",
+            "amount": str(price),
+            "winner": {"id": str(winner.id), "username": mask_username(winner.username)},
+            "timestamp": finished_at.isoformat(),
+        },
+    )
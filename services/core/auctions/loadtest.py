@@ -0,0 +1,335 @@
+"""
+Contention load harness for bidding, driven by the `bid_load` command.
+
+N bidders bid in a closed loop (send, wait for the ack, think, repeat) against M auctions for a fixed duration,
+over REST (`PlaceBidAPIView`) or WebSocket (the realtime service). Auctions are picked with a Zipf-like skew:
+with `skew` s the auction of rank k gets weight 1 / (k + 1) ** s, so 0 spreads the load evenly and higher values
+pile it onto a few hot auctions. Each bidder bids a step above the highest price it knows of; losing a race is
+a `too_low` rejection, which is part of what is measured.
+
+Only the network side lives here (asyncio, httpx, websockets); setting up bidders and auctions and reading the
+database's deadlock and lock-wait counters is the command's job.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from urllib.parse import quote
+
+import httpx
+import websockets
+from django.db import connection
+
+from .bidding import BID_ERRORS
+
+# SYNC: The realtime service's refusal messages (services/realtime/auction_service.py BID_ERRORS), by prefix
+REALTIME_BID_ERRORS = {
+    "Auction not found": "not_found",
+    "Auction is not active": "not_active",
+    "Auction has expired": "ended",
+    "You cannot bid on your own auction": "own_auction",
+    "Bid amount must be higher than current price": "too_low",
+    "Insufficient funds": "insufficient_funds",
+}
+REST_BID_ERRORS = {message: status for status, message in BID_ERRORS.items()}
+
+# One INFO line per request would drown the report
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+ACK_TIMEOUT = 10  # Seconds to wait for one bid's answer before counting it as a timeout
+
+
+class ServerError(Exception):
+    """
+    The server failed the bid (5xx): an error, not a rejection.
+    """
+
+
+@dataclass
+class LoadConfig:
+    protocol: str  # "rest" or "ws"
+    duration: float
+    skew: float
+    step: Decimal  # Bid increment over the highest known price
+    think: float  # Seconds between a bidder's ack and its next bid
+    core_url: str
+    realtime_url: str
+    seed: int = 0
+
+
+@dataclass
+class LoadResult:
+    accepted_ms: list[float] = field(default_factory=list)  # Ack latency of accepted bids
+    rejected_ms: list[float] = field(default_factory=list)
+    rejections: Counter = field(default_factory=Counter)  # auction_place_bid status (or HTTP status) -> count
+    errors: Counter = field(default_factory=Counter)  # Transport failures and server errors
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        attempts = len(self.accepted_ms) + sum(self.rejections.values()) + sum(self.errors.values())
+        return {
+            "elapsed_s": round(self.elapsed, 2),
+            "attempts": attempts,
+            "accepted": len(self.accepted_ms),
+            "accepted_per_s": round(len(self.accepted_ms) / self.elapsed, 1) if self.elapsed else 0.0,
+            "attempts_per_s": round(attempts / self.elapsed, 1) if self.elapsed else 0.0,
+            "ack_ms": latency_summary(self.accepted_ms),
+            "rejection_ack_ms": latency_summary(self.rejected_ms),
+            "rejections": dict(self.rejections.most_common()),
+            "errors": dict(self.errors.most_common()),
+        }
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """
+    Nearest-rank percentile, None for no values.
+    """
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def latency_summary(values: list[float]) -> dict:
+    return {name: percentile(values, pct) for name, pct in (("p50", 50), ("p95", 95), ("p99", 99))} | {
+        "max": max(values, default=None)
+    }
+
+
+def skewed_picker(items: list, skew: float, rng: random.Random):
+    """
+    A function picking one of `items`, the first ones most often (see module docstring).
+    """
+
+    weights = [1 / (rank + 1) ** skew for rank in range(len(items))]
+    return lambda: rng.choices(items, weights)[0]
+
+
+def rest_rejection(response: httpx.Response) -> str:
+    try:
+        message = response.json().get("error", "")
+    except ValueError:
+        message = ""
+    return REST_BID_ERRORS.get(message, f"http_{response.status_code}")
+
+
+def realtime_rejection(message: str) -> str:
+    for prefix, reason in REALTIME_BID_ERRORS.items():
+        if message.startswith(prefix):
+            return reason
+    return message or "unknown"
+
+
+class PriceBook:
+    """
+    The highest price each auction is known to have reached, shared by the bidders of one run.
+    """
+
+    def __init__(self, prices: dict[str, Decimal], step: Decimal):
+        self.prices = dict(prices)
+        self.step = step
+
+    def next_bid(self, auction_id: str) -> Decimal:
+        return self.prices[auction_id] + self.step
+
+    def observe(self, auction_id: str, price) -> None:
+        price = Decimal(str(price))
+        if price > self.prices[auction_id]:
+            self.prices[auction_id] = price
+
+
+class Bidder(ABC):
+    def __init__(self, token: str, config: LoadConfig, book: PriceBook, pick, result: LoadResult):
+        self.token = token
+        self.config = config
+        self.book = book
+        self.pick = pick
+        self.result = result
+
+    async def run(self, deadline: float) -> None:
+        try:
+            await self.open()
+            while time.monotonic() < deadline:
+                auction_id = self.pick()
+                amount = self.book.next_bid(auction_id)
+                started = time.perf_counter()
+                try:
+                    reason = await asyncio.wait_for(self.bid(auction_id, amount), ACK_TIMEOUT)
+                except (TimeoutError, ServerError, httpx.HTTPError, websockets.WebSocketException, OSError) as exc:
+                    self.result.errors[str(exc) if isinstance(exc, ServerError) else type(exc).__name__] += 1
+                    await self.discard(auction_id)
+                    await asyncio.sleep(0.1)
+                    continue
+                latency = (time.perf_counter() - started) * 1000
+
+                if reason is None:
+                    self.result.accepted_ms.append(latency)
+                    self.book.observe(auction_id, amount)
+                else:
+                    self.result.rejected_ms.append(latency)
+                    self.result.rejections[reason] += 1
+                    if reason == "too_low":  # Someone got there first: the price is at least what we offered
+                        self.book.observe(auction_id, amount)
+                if self.config.think:
+                    await asyncio.sleep(self.config.think)
+        finally:
+            await self.close()
+
+    @abstractmethod
+    async def open(self) -> None:
+        """
+        Set up the connection state, before the first bid.
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Release the connection state, after the last bid.
+        """
+
+    async def discard(self, auction_id: str) -> None:
+        """
+        Forget the connection state for `auction_id` after a failure (a late answer must not match the next bid).
+        Nothing to forget by default.
+        """
+
+        return
+
+    @abstractmethod
+    async def bid(self, auction_id: str, amount: Decimal) -> str | None:
+        """
+        Place one bid, returning None if accepted, else the rejection reason.
+        """
+
+
+class RestBidder(Bidder):
+    async def open(self) -> None:
+        self.client = httpx.AsyncClient(
+            base_url=self.config.core_url, headers={"Authorization": f"Bearer {self.token}"}, timeout=ACK_TIMEOUT
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    async def bid(self, auction_id: str, amount: Decimal) -> str | None:
+        response = await self.client.post(f"/api/auctions/{auction_id}/bid/", json={"amount": str(amount)})
+        if response.status_code >= 500:
+            raise ServerError(f"http_{response.status_code}")
+        if response.status_code == 201:
+            return None
+        return rest_rejection(response)
+
+
+class WebSocketBidder(Bidder):
+    """
+    Keeps one connection per auction it has bid on; the auction's NEW_BID broadcasts keep the price book current.
+    """
+
+    async def open(self) -> None:
+        self.sockets: dict[str, websockets.ClientConnection] = {}
+
+    async def close(self) -> None:
+        await asyncio.gather(*(socket.close() for socket in self.sockets.values()), return_exceptions=True)
+
+    async def discard(self, auction_id: str) -> None:
+        socket = self.sockets.pop(auction_id, None)
+        if socket is not None:
+            await socket.close()
+
+    async def socket(self, auction_id: str):
+        if auction_id not in self.sockets:
+            url = f"{self.config.realtime_url}/ws/auction/{auction_id}?token={quote(self.token)}"
+            self.sockets[auction_id] = await websockets.connect(url)
+        return self.sockets[auction_id]
+
+    async def bid(self, auction_id: str, amount: Decimal) -> str | None:
+        socket = await self.socket(auction_id)
+        await socket.send(json.dumps({"action": "BID", "amount": str(amount)}))
+        while True:
+            message = json.loads(await socket.recv())
+            if message["type"] == "NEW_BID":
+                self.book.observe(auction_id, message["amount"])
+            elif message["type"] == "BID_ACK":
+                return None
+            elif message["type"] == "ERROR":
+                return realtime_rejection(message["message"])
+
+
+async def run_load(config: LoadConfig, tokens: list[str], prices: dict[str, Decimal]) -> LoadResult:
+    """
+    Run one bidder per token against the auctions in `prices` (auction id -> current price) for the duration.
+    """
+
+    rng = random.Random(config.seed)
+    auctions = list(prices)
+    rng.shuffle(auctions)  # Which auction is the hot one shouldn't depend on creation order
+    book = PriceBook(prices, config.step)
+    result = LoadResult()
+    bidder_class = RestBidder if config.protocol == "rest" else WebSocketBidder
+    bidders = [
+        bidder_class(token, config, book, skewed_picker(auctions, config.skew, random.Random(rng.random())), result)
+        for token in tokens
+    ]
+
+    started = time.monotonic()
+    await asyncio.gather(*(bidder.run(started + config.duration) for bidder in bidders))
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+# Database side, read through Django's connection before, during and after the run
+
+DATABASE_COUNTERS_SQL = """
+    SELECT deadlocks, xact_commit, xact_rollback FROM pg_stat_database WHERE datname = current_database()
+"""
+LOCK_WAITERS_SQL = """
+    SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND wait_event_type = 'Lock'
+"""
+
+
+def database_counters() -> dict:
+    with connection.cursor() as cursor:
+        cursor.execute(DATABASE_COUNTERS_SQL)
+        deadlocks, commits, rollbacks = cursor.fetchone()
+    return {"deadlocks": deadlocks, "commits": commits, "rollbacks": rollbacks}
+
+
+class LockWaitSampler(threading.Thread):
+    """
+    Counts the backends waiting on a lock every `interval` seconds, from its own connection, until stopped.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples: list[int] = []
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        try:
+            while not self.stopped.wait(self.interval):
+                with connection.cursor() as cursor:
+                    cursor.execute(LOCK_WAITERS_SQL)
+                    self.samples.append(cursor.fetchone()[0])
+        finally:
+            connection.close()
+
+    def stop(self) -> dict:
+        self.stopped.set()
+        self.join()
+        samples = self.samples or [0]
+        return {
+            "waiting_max": max(samples),
+            "waiting_mean": round(sum(samples) / len(samples), 2),
+            # Backend-seconds spent waiting on locks, estimated from the samples
+            "wait_seconds": round(sum(samples) * self.interval, 2),
+        }
@@ -0,0 +1,167 @@
+import asyncio
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from auctions.loadtest import LoadConfig, LockWaitSampler, database_counters, run_load
+from auctions.models import AuctionListing, Product
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from payments.models import Wallet, WalletTransaction
+from payments.services import apply_wallet_deltas
+from users.serializers import MyTokenObtainPairSerializer
+
+User = get_user_model()
+
+BIDDER_FUNDS = Decimal("1000000.00")  # Deposited to every bidder per run, so funds never limit the bidding
+STARTING_PRICE = Decimal("10.00")
+
+
+class Command(BaseCommand):
+    help = "Measures bidding throughput and contention: N funded bidders against M fresh auctions, REST or WebSocket"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--protocol", choices=["rest", "ws"], default="rest")
+        parser.add_argument("--bidders", type=int, default=50)
+        parser.add_argument("--auctions", type=int, default=10)
+        parser.add_argument("--skew", type=float, default=1.0, help="0 spreads bids evenly, higher piles them up")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds")
+        parser.add_argument("--think-ms", type=float, default=0, help="Pause between a bidder's ack and next bid")
+        parser.add_argument("--step", type=Decimal, default=Decimal("1.00"), help="Bid increment")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--core-url", default="http://core:8000")
+        parser.add_argument("--realtime-url", default="ws://realtime:8000")
+        parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+        parser.add_argument("--force", action="store_true", help="Run even though DEBUG is off")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("Refusing to create load-test users and auctions with DEBUG off, pass --force.")
+
+        tokens = self.prepare_bidders(options["bidders"])
+        prices = self.prepare_auctions(options["auctions"], options["duration"])
+        config = LoadConfig(
+            protocol=options["protocol"],
+            duration=options["duration"],
+            skew=options["skew"],
+            step=options["step"],
+            think=options["think_ms"] / 1000,
+            core_url=options["core_url"].rstrip("/"),
+            realtime_url=options["realtime_url"].rstrip("/"),
+            seed=options["seed"],
+        )
+        self.stdout.write(
+            f"{config.protocol}: {len(tokens)} bidders, {len(prices)} auctions, skew {config.skew}, "
+            f"{config.duration:g}s..."
+        )
+
+        before = database_counters()
+        sampler = LockWaitSampler()
+        sampler.start()
+        try:
+            result = asyncio.run(run_load(config, tokens, prices))
+        finally:
+            locks = sampler.stop()
+        after = database_counters()
+
+        report = {
+            "protocol": config.protocol,
+            "bidders": len(tokens),
+            "auctions": len(prices),
+            "skew": config.skew,
+            **result.summary(),
+            "database": {name: after[name] - before[name] for name in after} | {"lock_waits": locks},
+        }
+        self.print_report(report)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as output:
+                json.dump(report, output, indent=2)
+
+    def prepare_bidders(self, count: int) -> list[str]:
+        """
+        Bidders `loadbidder<i>`, created on first use and topped up with a logged deposit; one access token each.
+        """
+
+        users = []
+        for index in range(count):
+            user, created = User.objects.get_or_create(
+                username=f"loadbidder{index}", defaults={"email": f"loadbidder{index}@example.com"}
+            )
+            if created:
+                user.set_unusable_password()  # No hashing, nobody logs in as them
+                user.save(update_fields=["password"])
+            users.append(user)
+
+        with transaction.atomic():
+            Wallet.objects.bulk_create([Wallet(user_id=user.pk) for user in users], ignore_conflicts=True)
+            wallets = dict(
+                Wallet.objects.select_for_update()
+                .filter(user_id__in=[user.pk for user in users])
+                .order_by("user_id")
+                .values_list("user_id", "id")
+            )
+            apply_wallet_deltas({user.pk: BIDDER_FUNDS for user in users}, "balance", timezone.now())
+            WalletTransaction.objects.bulk_create(
+                [
+                    WalletTransaction(
+                        wallet_id=wallet_id,
+                        transaction_type=WalletTransaction.Type.DEPOSIT,
+                        amount=BIDDER_FUNDS,
+                        reference_id="bid_load",
+                    )
+                    for wallet_id in wallets.values()
+                ]
+            )
+
+        return [str(MyTokenObtainPairSerializer.get_token(user).access_token) for user in users]
+
+    def prepare_auctions(self, count: int, duration: float) -> dict[str, Decimal]:
+        """
+        Fresh ACTIVE auctions of `loadseller`, open well past the run. They close through the regular sweeper.
+        """
+
+        seller, _ = User.objects.get_or_create(username="loadseller", defaults={"email": "loadseller@example.com"})
+        now = timezone.now()
+        end_time = now + timedelta(seconds=duration) + timedelta(minutes=10)
+        with transaction.atomic():
+            products = Product.objects.bulk_create(
+                [Product(owner_id=seller.pk, title=f"Load test lot {index}") for index in range(count)]
+            )
+            auctions = AuctionListing.objects.bulk_create(
+                [
+                    AuctionListing(
+                        product=product,
+                        status=AuctionListing.Status.ACTIVE,
+                        start_time=now,
+                        end_time=end_time,
+                        starting_price=STARTING_PRICE,
+                        current_price=STARTING_PRICE,
+                    )
+                    for product in products
+                ]
+            )
+        return {str(auction.id): STARTING_PRICE for auction in auctions}
+
+    def print_report(self, report: dict) -> None:
+        def ms(value):
+            return "-" if value is None else f"{value:.1f}"
+
+        ack = report["ack_ms"]
+        database = report["database"]
+        self.stdout.write(
+            f"{report['accepted']} accepted / {report['attempts']} attempts in {report['elapsed_s']}s: "
+            f"{report['accepted_per_s']} bids/s accepted, {report['attempts_per_s']} attempts/s"
+        )
+        self.stdout.write(
+            f"ack latency (ms): p50 {ms(ack['p50'])}, p95 {ms(ack['p95'])}, p99 {ms(ack['p99'])}, max {ms(ack['max'])}"
+        )
+        self.stdout.write(f"rejections: {report['rejections'] or 'none'}")
+        self.stdout.write(f"errors: {report['errors'] or 'none'}")
+        self.stdout.write(
+            f"database: {database['deadlocks']} deadlocks, {database['rollbacks']} rollbacks, "
+            f"{database['commits']} commits; lock waiters max {database['lock_waits']['waiting_max']}, "
+            f"mean {database['lock_waits']['waiting_mean']}, {database['lock_waits']['wait_seconds']} backend-s"
+        )
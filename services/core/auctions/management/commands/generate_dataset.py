@@ -0,0 +1,82 @@
+import time
+from datetime import datetime
+
+from auctions.models import AuctionListing, BidTransaction, Product
+from auctions.synthetic import (
+    AUCTION_COLUMNS,
+    BID_COLUMNS,
+    GENERATED_MODELS,
+    LEDGER_COLUMNS,
+    PRODUCT_COLUMNS,
+    USER_COLUMNS,
+    WALLET_COLUMNS,
+    SyntheticDataset,
+    copy_rows,
+    prepare_partitions,
+)
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from payments.models import Wallet, WalletTransaction
+
+
+class Command(BaseCommand):
+    help = "Generates a large, deterministic synthetic dataset (users to ledger) with COPY, for load and plan testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--auctions", type=int, default=200_000)
+        parser.add_argument("--bids-per-auction", type=float, default=15, help="Mean of the skewed bid count")
+        parser.add_argument("--months", type=int, default=12, help="Months of auction history before --now")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--now",
+            type=datetime.fromisoformat,
+            help="Anchor of the history (ISO 8601), default: the current hour. Same seed and anchor, same data.",
+        )
+        parser.add_argument("--flush", action="store_true", help="Empty the generated tables first (TRUNCATE)")
+        parser.add_argument("--force", action="store_true", help="Run even though DEBUG is off")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("Refusing to generate synthetic data with DEBUG off, pass --force if you mean it.")
+
+        now = options["now"] or timezone.now().replace(minute=0, second=0, microsecond=0)
+        if timezone.is_naive(now):
+            now = timezone.make_aware(now)
+        dataset = SyntheticDataset(
+            options["users"], options["auctions"], options["bids_per_auction"], options["months"], options["seed"], now
+        )
+
+        with transaction.atomic():
+            if options["flush"]:
+                tables = ", ".join(f'"{model._meta.db_table}"' for model in GENERATED_MODELS)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"TRUNCATE {tables} CASCADE")
+            prepare_partitions(connection, dataset)
+
+            # Foreign key order; the auction pass tallies the money the wallets and the ledger need.
+            self.load(get_user_model(), USER_COLUMNS, dataset.user_rows())
+            self.load(Product, PRODUCT_COLUMNS, dataset.product_rows())
+            self.load(AuctionListing, AUCTION_COLUMNS, dataset.auction_rows())
+            self.load(BidTransaction, BID_COLUMNS, dataset.bid_rows())
+            self.load(Wallet, WALLET_COLUMNS, dataset.wallet_rows())
+            self.load(WalletTransaction, LEDGER_COLUMNS, dataset.ledger_rows())
+
+        with connection.cursor() as cursor:
+            for model in GENERATED_MODELS:
+                cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated dataset (seed {options['seed']}, anchored at {now:%Y-%m-%d %H:%M}).")
+        )
+
+    def load(self, model, columns, rows):
+        started = time.monotonic()
+        count = copy_rows(connection, model, columns, rows)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"{model._meta.db_table}: {count} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-6):,.0f}/s)"
+        )
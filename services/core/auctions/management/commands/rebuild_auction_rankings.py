@@ -0,0 +1,10 @@
+from auctions.rankings import rebuild_rankings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the ending-soon and hot auction indexes in Valkey from the database (after a flush or outage)"
+
+    def handle(self, *args, **options):
+        ending, hot = rebuild_rankings()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {ending} active auctions, {hot} with recent bids."))
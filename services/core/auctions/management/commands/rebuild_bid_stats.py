@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from auctions.models import AuctionListing, BidTransaction
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+Status = AuctionListing.Status
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized bid stats (bid_count, unique_bidders, last_bid_at) from the bid history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--auction", action="append", dest="auction_ids", help="Only repair these auction IDs")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+        parser.add_argument(
+            "--archive-after-days",
+            type=int,
+            default=settings.PARTITION_ARCHIVE_AFTER_DAYS,
+            help="Archive age manage_partitions runs with: older closed auctions are skipped",
+        )
+
+    def handle(self, *args, **options):
+        # The created_at bound lets Postgres skip bid partitions older than the auction.
+        bids = (
+            BidTransaction.objects.filter(auction=OuterRef("pk"), created_at__gte=OuterRef("created_at"))
+            .order_by()
+            .values("auction")
+        )
+        auctions = AuctionListing.objects.annotate(
+            actual_count=Coalesce(
+                Subquery(bids.annotate(n=Count("id")).values("n")), Value(0), output_field=IntegerField()
+            ),
+            actual_bidders=Coalesce(
+                Subquery(bids.annotate(n=Count("bidder", distinct=True)).values("n")),
+                Value(0),
+                output_field=IntegerField(),
+            ),
+            actual_last_bid_at=Subquery(bids.annotate(last=Max("created_at")).values("last")),
+        ).order_by()
+        if options["auction_ids"]:
+            auctions = auctions.filter(id__in=options["auction_ids"])
+
+        # Auctions whose bid partitions `manage_partitions --archive` may have detached (the negation of its
+        # BIDS_IN_USE): their live bids no longer add up to the counters, which stopped changing when they closed.
+        cutoff = timezone.now() - timedelta(days=options["archive_after_days"])
+        archivable = Q(end_time__lte=cutoff) & (
+            Q(status__in=[Status.EXPIRED, Status.CANCELLED]) | Q(status=Status.FINISHED, settled_at__lte=cutoff)
+        )
+        skipped = auctions.filter(archivable).count()
+        auctions = auctions.exclude(archivable)
+
+        fields = ["bid_count", "unique_bidders", "last_bid_at", "version"]
+        stale: list[AuctionListing] = []
+        checked = repaired = 0
+
+        for auction in auctions.only("id", *fields).iterator(chunk_size=options["batch_size"]):
+            checked += 1
+            if (auction.bid_count, auction.unique_bidders, auction.last_bid_at) == (
+                auction.actual_count,
+                auction.actual_bidders,
+                auction.actual_last_bid_at,
+            ):
+                continue
+
+            auction.bid_count = auction.actual_count
+            auction.unique_bidders = auction.actual_bidders
+            auction.last_bid_at = auction.actual_last_bid_at
+            auction.version = F("version") + 1
+            stale.append(auction)
+
+            if len(stale) >= options["batch_size"]:
+                repaired += self.flush(stale, fields, options["dry_run"])
+
+        repaired += self.flush(stale, fields, options["dry_run"])
+
+        verb = "would be repaired" if options["dry_run"] else "repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} auctions, {repaired} {verb}, {skipped} past the archive age skipped."
+            )
+        )
+
+    def flush(self, stale, fields, dry_run):
+        count = len(stale)
+        if count and not dry_run:
+            AuctionListing.objects.bulk_update(stale, fields)
+        stale.clear()
+        return count
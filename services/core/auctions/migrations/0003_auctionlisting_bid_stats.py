@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0002_auctionlisting_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctionlisting',
+            name='bid_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Bid Count'),
+        ),
+        migrations.AddField(
+            model_name='auctionlisting',
+            name='last_bid_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Last Bid At'),
+        ),
+        migrations.AddField(
+            model_name='auctionlisting',
+            name='unique_bidders',
+            field=models.PositiveIntegerField(default=0, verbose_name='Unique Bidders'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionlisting',
+            index=models.Index(models.OrderBy(models.F('bid_count'), descending=True), condition=models.Q(('status', 'DRAFT'), _negated=True), name='auction_public_bid_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionlisting',
+            index=models.Index(models.OrderBy(models.F('last_bid_at'), descending=True, nulls_last=True), condition=models.Q(('status', 'DRAFT'), _negated=True), name='auction_public_last_bid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bidtransaction',
+            index=models.Index(fields=['auction', 'bidder'], name='auctions_bi_auction_7e063e_idx'),
+        ),
+    ]
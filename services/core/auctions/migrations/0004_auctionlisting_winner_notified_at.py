@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0003_auctionlisting_bid_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctionlisting',
+            name='winner_notified_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Winner Notified At'),
+        ),
+    ]
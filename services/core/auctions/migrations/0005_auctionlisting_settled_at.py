@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0004_auctionlisting_winner_notified_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctionlisting',
+            name='settled_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Settled At'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionlisting',
+            index=models.Index(condition=models.Q(('settled_at__isnull', True), ('status', 'FINISHED')), fields=['end_time'], name='auction_unsettled_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from common.partitioning import partition_by_month
+from django.db import migrations
+
+
+def partition_bids(apps, schema_editor):
+    partition_by_month(schema_editor.connection, apps.get_model("auctions", "BidTransaction")._meta.db_table)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auctions", "0005_auctionlisting_settled_at"),
+    ]
+
+    # Model state is unchanged: the partitioned table has the same columns, indexes and constraints.
+    # Not reversed, the partitioned table works as-is for the previous migrations too.
+    operations = [
+        migrations.RunPython(partition_bids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from django.db import migrations
+
+# The function as of this migration, frozen next to it (auctions/sql/place_bid.sql is the live copy).
+PLACE_BID_SQL = Path(__file__).parent / "sql" / "0007_place_bid_function.sql"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auctions", "0006_partition_bidtransaction"),
+        ("payments", "0005_partition_wallettransaction"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            PLACE_BID_SQL.read_text(),
+            reverse_sql="DROP FUNCTION IF EXISTS auction_place_bid(uuid, uuid, numeric);",
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0007_place_bid_function'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctionlisting',
+            name='settlement_failed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Settlement Failed At'),
+        ),
+    ]
@@ -0,0 +1,117 @@
+-- auction_place_bid: the one bid-placement routine, called by core (auctions.bidding) and realtime (AuctionService).
+--
+-- In one round trip and one transaction: locks the auction, validates the bid, locks the bidder's and the previous
+-- winner's wallets in user id order (the canonical wallet lock order, see payments.services), releases the previous
+-- hold, holds the new amount, writes the bid and both ledger rows, and bumps the auction's bid stats and versions.
+--
+-- Returns one row. `status` is 'ok' or the reason the bid was refused ('not_found', 'not_active', 'ended',
+-- 'own_auction', 'too_low', 'insufficient_funds'); a refused bid changes nothing.
+-- Changing this file needs a new migration shipping a frozen copy of it (CREATE OR REPLACE), see
+-- auctions/migrations/sql.
+
+CREATE OR REPLACE FUNCTION auction_place_bid(p_auction_id uuid, p_bidder_id uuid, p_amount numeric)
+RETURNS TABLE (
+    status text,
+    bid_id uuid,
+    bid_at timestamptz,
+    price numeric,
+    previous_winner_id uuid,
+    bid_count integer,
+    unique_bidders integer,
+    balance numeric,
+    held_balance numeric
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_auction auctions_auctionlisting%ROWTYPE;
+    v_now timestamptz;
+    v_available numeric;
+    v_wallet_id uuid;
+    v_new_bidder boolean;
+BEGIN
+    -- Lock the auction before any wallet (settlement takes the same order): bids on it queue up here.
+    SELECT * INTO v_auction FROM auctions_auctionlisting a WHERE a.id = p_auction_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'not_found', NULL::uuid, NULL::timestamptz, NULL::numeric, NULL::uuid,
+            NULL::integer, NULL::integer, NULL::numeric, NULL::numeric;
+        RETURN;
+    END IF;
+
+    v_now := clock_timestamp();  -- After the lock wait, so the end_time check is current.
+    status := CASE
+        WHEN v_auction.status <> 'ACTIVE' THEN 'not_active'
+        WHEN v_auction.end_time < v_now THEN 'ended'
+        WHEN EXISTS (SELECT 1 FROM auctions_product p WHERE p.id = v_auction.product_id AND p.owner_id = p_bidder_id)
+            THEN 'own_auction'
+        WHEN p_amount <= v_auction.current_price THEN 'too_low'
+    END;
+    IF status IS NOT NULL THEN
+        price := v_auction.current_price;
+        RETURN NEXT;
+        RETURN;
+    END IF;
+
+    PERFORM 1 FROM payments_wallet w
+    WHERE w.user_id IN (p_bidder_id, v_auction.winner_id)
+    ORDER BY w.user_id
+    FOR UPDATE;
+
+    -- Raising your own bid only needs the difference: the old hold is released first.
+    SELECT w.balance + CASE WHEN v_auction.winner_id = p_bidder_id THEN v_auction.current_price ELSE 0 END
+    INTO v_available
+    FROM payments_wallet w WHERE w.user_id = p_bidder_id;
+    IF v_available IS NULL OR v_available < p_amount THEN
+        status := 'insufficient_funds';
+        price := v_auction.current_price;
+        RETURN NEXT;
+        RETURN;
+    END IF;
+
+    -- 1. Release previous winner's hold
+    IF v_auction.winner_id IS NOT NULL THEN
+        UPDATE payments_wallet w
+        SET held_balance = w.held_balance - v_auction.current_price, balance = w.balance + v_auction.current_price,
+            version = w.version + 1, updated_at = v_now
+        WHERE w.user_id = v_auction.winner_id
+        RETURNING w.id INTO v_wallet_id;
+
+        INSERT INTO payments_wallettransaction (id, created_at, updated_at, wallet_id, transaction_type, amount, reference_id)
+        VALUES (gen_random_uuid(), v_now, v_now, v_wallet_id, 'BID_RELEASE', v_auction.current_price, p_auction_id::text);
+    END IF;
+
+    -- 2. Hold funds for the new bidder
+    UPDATE payments_wallet w
+    SET balance = w.balance - p_amount, held_balance = w.held_balance + p_amount,
+        version = w.version + 1, updated_at = v_now
+    WHERE w.user_id = p_bidder_id
+    RETURNING w.id, w.balance, w.held_balance INTO v_wallet_id, balance, held_balance;
+
+    INSERT INTO payments_wallettransaction (id, created_at, updated_at, wallet_id, transaction_type, amount, reference_id)
+    VALUES (gen_random_uuid(), v_now, v_now, v_wallet_id, 'BID_HOLD', p_amount, p_auction_id::text);
+
+    -- 3. Create Bid (the created_at bound prunes bid partitions older than the auction)
+    v_new_bidder := NOT EXISTS (
+        SELECT 1 FROM auctions_bidtransaction b
+        WHERE b.auction_id = p_auction_id AND b.bidder_id = p_bidder_id AND b.created_at >= v_auction.created_at
+    );
+    bid_id := gen_random_uuid();
+    INSERT INTO auctions_bidtransaction (id, created_at, updated_at, bidder_id, auction_id, amount)
+    VALUES (bid_id, v_now, v_now, p_bidder_id, p_auction_id, p_amount);
+
+    -- 4. Update Auction
+    UPDATE auctions_auctionlisting a
+    SET current_price = p_amount, winner_id = p_bidder_id,
+        bid_count = a.bid_count + 1, unique_bidders = a.unique_bidders + v_new_bidder::integer, last_bid_at = v_now,
+        version = a.version + 1, updated_at = v_now
+    WHERE a.id = p_auction_id
+    RETURNING a.bid_count, a.unique_bidders INTO bid_count, unique_bidders;
+
+    status := 'ok';
+    bid_at := v_now;
+    price := p_amount;
+    previous_winner_id := v_auction.winner_id;
+    RETURN NEXT;
+END;
+$$;
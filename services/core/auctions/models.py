@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from common.models import TimestampMixin, UUIDMixin
+from common.models import TimestampMixin, UUIDMixin, VersionMixin
 from django.conf import settings
 from django.db import models
 from django.db.models import F, Q
@@ -68,7 +68,7 @@ class Product(UUIDMixin, TimestampMixin):
         return self.title
 
 
-class AuctionListing(UUIDMixin, TimestampMixin):
+class AuctionListing(UUIDMixin, TimestampMixin, VersionMixin):
     """
     Auction Round (Auction Item)
     """
@@ -123,7 +123,7 @@ class AuctionListing(UUIDMixin, TimestampMixin):
     )
 
     #  Winner Info
-    winner: models.ForeignKey = models.ForeignKey(
+    winner: Any = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
         null=True,
@@ -132,8 +132,60 @@ class AuctionListing(UUIDMixin, TimestampMixin):
         verbose_name=_("Winner"),
     )
 
+    winner_notified_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Winner Notified At"),
+    )
+
+    settled_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Settled At"),
+    )
+
+    # Set when settlement failed on this auction alone (see payments.settlement): no longer claimed until cleared.
+    settlement_failed_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Settlement Failed At"),
+    )
+
+    # Bid Stats (denormalized from BidTransaction, maintained by every bid path; see `rebuild_bid_stats`)
+    bid_count: models.PositiveIntegerField = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Bid Count"),
+    )
+    unique_bidders: models.PositiveIntegerField = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Unique Bidders"),
+    )
+    last_bid_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Last Bid At"),
+    )
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Back the "most bids" / "recently active" orderings of the public list (which excludes drafts).
+            models.Index(F("bid_count").desc(), name="auction_public_bid_count_idx", condition=~Q(status="DRAFT")),
+            models.Index(
+                F("last_bid_at").desc(nulls_last=True),
+                name="auction_public_last_bid_idx",
+                condition=~Q(status="DRAFT"),
+            ),
+            # Settlement work queue: stays tiny however large the auction history grows.
+            models.Index(
+                fields=["end_time"],
+                name="auction_unsettled_idx",
+                condition=Q(status="FINISHED", settled_at__isnull=True),
+            ),
+        ]
         constraints = [
             # Constraint 1: start_time must be before end_time
             models.CheckConstraint(
@@ -151,6 +203,13 @@ class AuctionListing(UUIDMixin, TimestampMixin):
     def __str__(self):
         return f"{self.product.title} (Status: {self.status})"
 
+    def bid_history(self):
+        """
+        This auction's bids. No bid predates its auction, so the created_at bound limits the scan
+        to the bid table's partitions since then (runtime partition pruning).
+        """
+        return self.bids.filter(created_at__gte=self.created_at)
+
 
 class BidTransaction(UUIDMixin, TimestampMixin):
     """
@@ -173,6 +232,7 @@ class BidTransaction(UUIDMixin, TimestampMixin):
         ordering = ["-amount"]
         indexes = [
             models.Index(fields=["auction", "amount"]),
+            models.Index(fields=["auction", "bidder"]),
         ]
         constraints = [
             # Constraint: The bid price cannot be negative or zero.
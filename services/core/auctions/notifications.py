@@ -0,0 +1,90 @@
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AuctionListing
+
+logger = logging.getLogger(__name__)
+
+
+def claim_winner_notifications(auction_ids) -> list[AuctionListing]:
+    """
+    Mark the not-yet-notified finished auctions as notified and return them (with winner/product loaded).
+    Rows already claimed by another worker are skipped, so each winner is emailed at most once per claim.
+    """
+
+    with transaction.atomic():
+        auctions = list(
+            AuctionListing.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("winner", "product")
+            .filter(
+                id__in=auction_ids,
+                status=AuctionListing.Status.FINISHED,
+                winner__isnull=False,
+                winner_notified_at__isnull=True,
+            )
+            .order_by()
+        )
+        if auctions:
+            AuctionListing.objects.filter(id__in=[auction.id for auction in auctions]).update(
+                winner_notified_at=timezone.now()
+            )
+
+    return auctions
+
+
+def release_winner_notifications(auction_ids):
+    """
+    Undo a claim for auctions whose email could not be sent, so a retry (or a later run) picks them up again.
+    """
+
+    AuctionListing.objects.filter(id__in=auction_ids).update(winner_notified_at=None)
+
+
+def build_winner_message(auction: AuctionListing) -> EmailMessage:
+    return EmailMessage(
+        subject="You won the auction!",
+        body=(
+            f"Congratulations {auction.winner.username}!\n\n"
+            f'You have won "{auction.product.title}" for {auction.current_price}.'
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[auction.winner.email],
+    )
+
+
+def send_winner_notifications(auction_ids) -> tuple[list[str], list[str]]:
+    """
+    Email the winners of a batch of auctions over one SMTP connection.
+    Returns `(sent_ids, failed_ids)`; failed claims are released for the retry.
+    """
+
+    auctions = claim_winner_notifications(auction_ids)
+    if not auctions:
+        return [], []
+
+    sent: list[str] = []
+    failed: list[str] = []
+
+    try:
+        # One connection (and one TLS/auth handshake) for the whole batch
+        with get_connection(timeout=settings.EMAIL_TIMEOUT) as connection:
+            for auction in auctions:
+                try:
+                    connection.send_messages([build_winner_message(auction)])
+                    sent.append(str(auction.id))
+                except Exception as exc:
+                    logger.error(f"Failed to send winner email for Auction {auction.id}: {exc}")
+                    failed.append(str(auction.id))
+    except Exception as exc:
+        # Could not open (or cleanly close) the connection: everything not confirmed is retried.
+        logger.error(f"SMTP connection failed for {len(auctions)} winner emails: {exc}")
+        failed = [str(auction.id) for auction in auctions if str(auction.id) not in sent]
+
+    if failed:
+        release_winner_notifications(failed)
+
+    return sent, failed
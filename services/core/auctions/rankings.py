@@ -0,0 +1,166 @@
+"""
+"Ending soon" and "hot right now" indexes of the open auctions, kept in Valkey sorted sets.
+
+- ENDING_SOON_KEY: every ACTIVE auction, scored by its end_time (epoch seconds). Added on activation, removed on
+  close, buy-now or cancellation, so it is also the set of auctions that may still take bids.
+- HOT_KEY: ACTIVE auctions that took bids, scored by their bid activity decayed with HOT_HALF_LIFE.
+
+A decayed sum sum(2^-((now - bid_at) / half_life)) changes with `now`, but its order does not, so the score kept is
+its logarithm in units fixed in time: ln(sum(e^(bid_at / tau))), tau = half_life / ln 2. Each bid folds
+e^(bid_at / tau) into it (log-sum-exp) atomically in Valkey, no rewrite of the other members.
+
+Both live on the realtime Valkey, shared with the realtime service, which records its own bids (SYNC: realtime's
+utils/redis.py). Writes are best effort, after the database commit: the endpoints hydrate ids against Postgres,
+leaving out what is no longer ACTIVE, and `manage.py rebuild_auction_rankings` rebuilds both sets from the database.
+"""
+
+import logging
+import math
+from datetime import timedelta
+
+import redis
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from .events import get_realtime_client
+from .models import AuctionListing, BidTransaction
+
+logger = logging.getLogger(__name__)
+
+ENDING_SOON_KEY = "auctions:ending_soon"
+HOT_KEY = "auctions:hot"
+
+HOT_HALF_LIFE = timedelta(hours=1)
+HOT_TAU = HOT_HALF_LIFE.total_seconds() / math.log(2)
+# Older bids weigh less than 2^-24 of a new one: left out of a rebuild.
+HOT_WINDOW = HOT_HALF_LIFE * 24
+
+# KEYS: ending-soon set, hot set. ARGV: auction id, bid score. Auctions no longer open are not (re)added.
+RECORD_BID_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+local score = tonumber(ARGV[2])
+local current = redis.call('ZSCORE', KEYS[2], ARGV[1])
+if current then
+    current = tonumber(current)
+    local high = math.max(current, score)
+    score = high + math.log(math.exp(current - high) + math.exp(score - high))
+end
+redis.call('ZADD', KEYS[2], string.format('%.17g', score), ARGV[1])
+return 1
+"""
+
+
+def bid_score(bid_at) -> float:
+    return bid_at.timestamp() / HOT_TAU
+
+
+def combine_scores(scores) -> float:
+    """
+    ln(sum(e^score)) without overflow: what RECORD_BID_SCRIPT keeps folding in, one bid at a time.
+    """
+
+    high = max(scores)
+    return high + math.log(sum(math.exp(score - high) for score in scores))
+
+
+def record_bid(auction_id, bid_at) -> None:
+    try:
+        get_realtime_client().eval(RECORD_BID_SCRIPT, 2, ENDING_SOON_KEY, HOT_KEY, str(auction_id), bid_score(bid_at))
+    except redis.RedisError as exc:
+        logger.warning(f"Could not record a bid on Auction {auction_id} in the hot index: {exc}")
+
+
+def open_auctions(rows) -> None:
+    """
+    Add newly ACTIVE auctions, given as (id, end_time) rows.
+    """
+
+    mapping = {str(auction_id): end_time.timestamp() for auction_id, end_time in rows}
+    if not mapping:
+        return
+    try:
+        get_realtime_client().zadd(ENDING_SOON_KEY, mapping)
+    except redis.RedisError as exc:
+        logger.warning(f"Could not add {len(mapping)} auctions to the ending-soon index: {exc}")
+
+
+def close_auctions(auction_ids) -> None:
+    """
+    Remove auctions that stopped taking bids (closed, expired, bought) from both indexes.
+    """
+
+    members = [str(auction_id) for auction_id in auction_ids]
+    if not members:
+        return
+    try:
+        with get_realtime_client().pipeline() as pipe:
+            pipe.zrem(ENDING_SOON_KEY, *members)
+            pipe.zrem(HOT_KEY, *members)
+            pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning(f"Could not remove {len(members)} auctions from the ranking indexes: {exc}")
+
+
+def ending_soon_ids(offset: int, limit: int, now=None) -> list[str]:
+    """
+    A page of the auctions still open, soonest end first. Raises RedisError (callers fall back to Postgres).
+    """
+
+    now = now or timezone.now()
+    ids = get_realtime_client().zrange(ENDING_SOON_KEY, now.timestamp(), "+inf", byscore=True, offset=offset, num=limit)
+    return [auction_id.decode() for auction_id in ids]  # type: ignore[union-attr]
+
+
+def hot_ids(offset: int, limit: int) -> list[str]:
+    """
+    A page of the most active auctions, hottest first. Raises RedisError (callers fall back to Postgres).
+    """
+
+    ids = get_realtime_client().zrange(HOT_KEY, offset, offset + limit - 1, desc=True)
+    return [auction_id.decode() for auction_id in ids]  # type: ignore[union-attr]
+
+
+def hydrate(queryset, auction_ids):
+    """
+    The ACTIVE auctions of `queryset` among `auction_ids`, in that order, in one query.
+    Ids that are no longer ACTIVE (a missed removal) are left out.
+    """
+
+    if not auction_ids:
+        return queryset.none()
+
+    position = Case(
+        *[When(id=auction_id, then=Value(i)) for i, auction_id in enumerate(auction_ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(id__in=auction_ids, status=AuctionListing.Status.ACTIVE).order_by(position)
+
+
+def rebuild_rankings(now=None) -> tuple[int, int]:
+    """
+    Rebuild both indexes from Postgres: ACTIVE auctions, and their bids within HOT_WINDOW.
+    Swapped in atomically; bids recorded while it runs may be missed (their weight decays away).
+    Returns the size of each index.
+    """
+
+    now = now or timezone.now()
+    active = AuctionListing.objects.filter(status=AuctionListing.Status.ACTIVE)
+    ending = {str(auction_id): end_time.timestamp() for auction_id, end_time in active.values_list("id", "end_time")}
+
+    bid_scores: dict[str, list[float]] = {}
+    bids = BidTransaction.objects.filter(created_at__gte=now - HOT_WINDOW, auction__in=active)
+    for auction_id, bid_at in bids.values_list("auction_id", "created_at").iterator():
+        bid_scores.setdefault(str(auction_id), []).append(bid_score(bid_at))
+    hot = {auction_id: combine_scores(scores) for auction_id, scores in bid_scores.items()}
+
+    with get_realtime_client().pipeline() as pipe:  # MULTI/EXEC
+        pipe.delete(ENDING_SOON_KEY, HOT_KEY)
+        if ending:
+            pipe.zadd(ENDING_SOON_KEY, ending)
+        if hot:
+            pipe.zadd(HOT_KEY, hot)
+        pipe.execute()
+
+    return len(ending), len(hot)
@@ -3,7 +3,7 @@ import logging
 from django.dispatch import receiver
 
 from .signals import auction_finished
-from .tasks import notify_winner_task
+from .tasks import notify_winners_task
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,6 @@ def on_auction_finished(sender=None, auction=None, **kwargs):
     # Asynchronous task execution
     # .delay() assigns the task to a Worker (the User doesn't have to wait)
     if auction.winner:
-        notify_winner_task.delay(auction_id=str(auction.id))
+        notify_winners_task.delay([str(auction.id)])
     else:
         logger.info("No winner for this auction. Skipping email task.")
@@ -1,7 +1,10 @@
+from common.serializers import RowSerializer, datetime_string, decimal_string, file_url
+from django.db import transaction
 from rest_framework import serializers
 from users.models import User
 
 from .models import AuctionListing, BidTransaction, Product
+from .tasks import schedule_auction_lifecycle
 
 
 class UserSummarySerializer(serializers.ModelSerializer):
@@ -49,9 +52,63 @@ class AuctionListingSerializer(serializers.ModelSerializer):
             "status",
             "start_time",
             "end_time",
+            "bid_count",
+            "unique_bidders",
+            "last_bid_at",
         ]
 
 
+class AuctionListingRowSerializer(RowSerializer):
+    """
+    AuctionListingSerializer's output from `.values()` rows (see common.serializers), for the list endpoint.
+    """
+
+    columns: tuple[str, ...] = (
+        "id",
+        "product_id",
+        "product__title",
+        "product__description",
+        "product__image",
+        "product__category",
+        "product__condition",
+        "product__owner_id",
+        "product__owner__username",
+        "product__created_at",
+        "current_price",
+        "starting_price",
+        "status",
+        "start_time",
+        "end_time",
+        "bid_count",
+        "unique_bidders",
+        "last_bid_at",
+    )
+    image_storage = Product._meta.get_field("image").storage
+
+    def to_representation(self, row):
+        return {
+            "id": str(row["id"]),
+            "product": {
+                "id": str(row["product_id"]),
+                "title": row["product__title"],
+                "description": row["product__description"],
+                "image": file_url(self.image_storage, row["product__image"], self.context.get("request")),
+                "category": row["product__category"],
+                "condition": row["product__condition"],
+                "owner": {"id": str(row["product__owner_id"]), "username": row["product__owner__username"]},
+                "created_at": datetime_string(row["product__created_at"]),
+            },
+            "current_price": decimal_string(row["current_price"]),
+            "starting_price": decimal_string(row["starting_price"]),
+            "status": row["status"],
+            "start_time": datetime_string(row["start_time"]),
+            "end_time": datetime_string(row["end_time"]),
+            "bid_count": row["bid_count"],
+            "unique_bidders": row["unique_bidders"],
+            "last_bid_at": datetime_string(row["last_bid_at"]),
+        }
+
+
 class BidTransactionSerializer(serializers.ModelSerializer):
     bidder = MaskedUserSummarySerializer(read_only=True)
 
@@ -61,11 +118,15 @@ class BidTransactionSerializer(serializers.ModelSerializer):
 
 
 class AuctionDetailSerializer(AuctionListingSerializer):
-    bids = BidTransactionSerializer(many=True, read_only=True)
+    bids = serializers.SerializerMethodField()
 
     class Meta(AuctionListingSerializer.Meta):
         fields = AuctionListingSerializer.Meta.fields + ["bids"]
 
+    def get_bids(self, obj):
+        # One partition-pruned query with the bidders joined, not one user lookup per bid.
+        return BidTransactionSerializer(obj.bid_history().select_related("bidder"), many=True).data
+
 
 class UserAuctionSerializer(AuctionListingSerializer):
     user_status = serializers.SerializerMethodField()
@@ -78,8 +139,9 @@ class UserAuctionSerializer(AuctionListingSerializer):
         user = self.context["request"].user
         if not user.is_authenticated:
             return None
-        # Simplified: fetch latest bid by user
-        highest_bid = obj.bids.filter(bidder=user).order_by("-amount").first()
+        if hasattr(obj, "my_highest_bid"):  # Annotated by the my-bids queryset, no query per row
+            return obj.my_highest_bid
+        highest_bid = obj.bid_history().filter(bidder_id=user.id).order_by("-amount").first()
         return highest_bid.amount if highest_bid else None
 
     def get_user_status(self, obj):
@@ -87,15 +149,32 @@ class UserAuctionSerializer(AuctionListingSerializer):
         if not user.is_authenticated:
             return "GUEST"
 
-        highest_bid_amount = self.get_my_highest_bid(obj)
-        if not highest_bid_amount:
-            return "NO_BID"
+        return user_bid_status(self.get_my_highest_bid(obj), obj.current_price)
+
+
+def user_bid_status(highest_bid_amount, current_price) -> str:
+    if not highest_bid_amount:
+        return "NO_BID"
 
-        # Simplified winning logic
-        if highest_bid_amount >= obj.current_price:
-            return "WINNING"
-        else:
-            return "OUTBID"
+    # Simplified winning logic
+    if highest_bid_amount >= current_price:
+        return "WINNING"
+    else:
+        return "OUTBID"
+
+
+class UserAuctionRowSerializer(AuctionListingRowSerializer):
+    """
+    UserAuctionSerializer's output from rows annotated with the user's `my_highest_bid`, for the my-bids endpoint.
+    """
+
+    columns = AuctionListingRowSerializer.columns + ("my_highest_bid",)
+
+    def to_representation(self, row):
+        representation = super().to_representation(row)
+        representation["user_status"] = user_bid_status(row["my_highest_bid"], row["current_price"])
+        representation["my_highest_bid"] = row["my_highest_bid"]  # A method field there: the Decimal, unformatted
+        return representation
 
 
 class AuctionCreateSerializer(serializers.ModelSerializer):
@@ -129,13 +208,16 @@ class AuctionCreateSerializer(serializers.ModelSerializer):
         owner = self.context["request"].user
 
         # Create Product
-        product = Product.objects.create(owner=owner, **product_data)
+        product = Product.objects.create(owner_id=owner.id, **product_data)
 
         # Create Auction Listing
         # Initialize current_price to starting_price
         validated_data["current_price"] = validated_data["starting_price"]
         auction = AuctionListing.objects.create(product=product, status=AuctionListing.Status.DRAFT, **validated_data)
 
+        # Register start/end deadlines once the listing is committed
+        transaction.on_commit(lambda: schedule_auction_lifecycle(auction))
+
         return auction
 
 
@@ -0,0 +1,378 @@
+"""
+Synthetic marketplace data at production scale, for load tests and realistic query plans.
+
+Every row is derived from `(seed, kind, index)`: ids are hashes of it and each auction is simulated from its own
+`random.Random`, so a table can be streamed on its own pass (one COPY at a time) and re-simulating an auction for
+its bids or ledger rows gives exactly the same result. Only per-user money totals are kept in memory.
+
+Distributions:
+- power bidders (2% of the users) place 40% of the bids, sellers are a tenth of the users;
+- bids per auction are log-normal (most auctions get a handful, hot ones thousands), placed mostly near the end;
+- auctions end in the evening peak on quarter hours, so end times cluster the way they do in production.
+
+Balances reconcile with the ledger: each user's deposit covers what they paid and still hold, and the ledger
+records every hold, release (outbid), payment and sale.
+"""
+
+import hashlib
+import math
+import random
+import uuid
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from common.partitioning import ensure_partitions, is_partitioned
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from payments.models import Wallet, WalletTransaction
+
+from .models import AuctionListing, BidTransaction, Product
+
+PASSWORD = "synthetic-password"  # Every generated user's password (one hash, hashing millions would take hours)
+
+CLOSING_HOURS = (18, 19, 19, 20, 20, 20, 21, 21, 22)  # UTC, weighted toward the evening peak
+CLOSING_MINUTES = (0, 0, 0, 15, 30, 30, 45)
+DURATION_DAYS = (1, 3, 3, 5, 7, 7, 7, 10)
+BID_COUNT_SIGMA = 1.3  # Spread of the log-normal bid count: the higher, the hotter the hot auctions
+MAX_BIDS = 5000
+POWER_BIDDER_SHARE = 0.02  # The first 2% of the users...
+POWER_BIDDER_BIDS = 0.4  # ...place 40% of the bids, without one user dominating however many there are
+SELLER_SHARE = 10  # One user in ten sells
+CANCELLED_RATE = 0.02
+BUY_NOW_RATE = 0.25
+
+Status = AuctionListing.Status
+Tx = WalletTransaction.Type
+
+
+def stable_uuid(seed: int, kind: str, index) -> uuid.UUID:
+    digest = hashlib.md5(f"{seed}:{kind}:{index}".encode()).digest()
+    return uuid.UUID(bytes=digest, version=4)
+
+
+def money(cents: int) -> str:
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+@dataclass
+class SimulatedAuction:
+    index: int
+    owner: int  # User index
+    status: str
+    created_at: datetime
+    start_time: datetime
+    end_time: datetime
+    starting_price: int  # Cents
+    buy_now_price: int | None
+    bids: list[tuple[int, int, datetime]] = field(default_factory=list)  # (bidder index, cents, at)
+    settled_at: datetime | None = None
+
+    @property
+    def price(self) -> int:
+        return self.bids[-1][1] if self.bids else self.starting_price
+
+    @property
+    def top_bidder(self) -> int | None:
+        return self.bids[-1][0] if self.bids else None
+
+
+class SyntheticDataset:
+    def __init__(self, users: int, auctions: int, bids_per_auction: float, months: int, seed: int, now: datetime):
+        self.users = users
+        self.auctions = auctions
+        self.months = months
+        self.seed = seed
+        self.now = now
+        self.history_start = now - timedelta(days=30 * months)
+        self.bid_count_mu = math.log(bids_per_auction) - BID_COUNT_SIGMA**2 / 2
+        self.sellers = max(1, users // SELLER_SHARE)
+
+        # Per-user money (cents) gathered while the auctions are simulated, needed for wallets and deposits
+        self.held = array("q", bytes(8 * users))
+        self.paid = array("q", bytes(8 * users))
+        self.sold = array("q", bytes(8 * users))
+
+    def user_id(self, index: int) -> uuid.UUID:
+        return stable_uuid(self.seed, "user", index)
+
+    def wallet_id(self, index: int) -> uuid.UUID:
+        return stable_uuid(self.seed, "wallet", index)
+
+    def joined_at(self, index: int) -> datetime:
+        # Everyone joins in the year before the simulated history, so no bid predates its bidder.
+        offset = int.from_bytes(hashlib.md5(f"{self.seed}:joined:{index}".encode()).digest()[:4]) % (365 * 86400)
+        return self.history_start - timedelta(seconds=offset + 3600)
+
+    def simulate(self, index: int, bids: bool = True) -> SimulatedAuction:
+        """
+        The auction at `index`, with its bids unless `bids` is False (the listing is drawn first, so it's the same).
+        """
+
+        rng = random.Random(f"{self.seed}:auction:{index}")
+
+        created_at = self.history_start + timedelta(
+            seconds=rng.uniform(0, (self.now - self.history_start).total_seconds())
+        )
+        start_time = created_at + timedelta(hours=rng.choice((0, 0, 0, 1, 6, 24, 48)))
+        end_day = (start_time + timedelta(days=rng.choice(DURATION_DAYS))).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        end_time = end_day.replace(hour=rng.choice(CLOSING_HOURS), minute=rng.choice(CLOSING_MINUTES))
+        if end_time <= start_time:
+            end_time += timedelta(days=1)
+
+        starting_price = 100 + int(rng.lognormvariate(math.log(2000), 1.0))
+        buy_now_price = int(starting_price * rng.uniform(3, 8)) if rng.random() < BUY_NOW_RATE else None
+        owner = self.users - 1 - int(self.sellers * rng.random() ** 1.5)
+
+        auction = SimulatedAuction(
+            index, owner, Status.ACTIVE, created_at, start_time, end_time, starting_price, buy_now_price
+        )
+        if rng.random() < CANCELLED_RATE:
+            auction.status = Status.CANCELLED
+            return auction
+        if start_time > self.now:
+            auction.status = Status.DRAFT
+            return auction
+        if not bids:
+            return auction
+
+        bidding_ends = min(end_time, self.now)
+        elapsed = (bidding_ends - start_time) / (end_time - start_time)
+        count = min(MAX_BIDS, int(rng.lognormvariate(self.bid_count_mu, BID_COUNT_SIGMA) * elapsed))
+        span = (bidding_ends - start_time).total_seconds()
+        # Bids crowd toward the end (sniping)
+        times = sorted(start_time + timedelta(seconds=span * (1 - rng.random() ** 2.5)) for _ in range(count))
+
+        price = starting_price
+        for at in times:
+            if rng.random() < POWER_BIDDER_BIDS:
+                bidder = rng.randrange(max(1, int(self.users * POWER_BIDDER_SHARE)))
+            else:
+                bidder = rng.randrange(self.users)
+            if bidder == owner:
+                bidder = (bidder + 1) % self.users
+            # Steps scale with the starting price, not the current one: compounding would overflow on hot auctions
+            price += max(100, int(starting_price * rng.uniform(0.02, 0.1)))
+            auction.bids.append((bidder, price, at))
+
+        if end_time <= self.now:
+            auction.status = Status.FINISHED if auction.bids else Status.EXPIRED
+            if auction.bids:
+                auction.settled_at = end_time + timedelta(seconds=rng.uniform(30, 600))
+        return auction
+
+    # Rows, one generator per table, in COPY column order
+
+    def user_rows(self):
+        password = make_password(PASSWORD, salt=f"synthetic{self.seed}")
+        for index in range(self.users):
+            joined = self.joined_at(index)
+            username = f"user{index:07d}"
+            yield (
+                self.user_id(index),
+                password,
+                username,
+                f"{username}@example.com",
+                "",
+                "",
+                joined,
+                joined,
+                joined,
+                False,
+                False,
+                True,
+            )
+
+    def product_rows(self):
+        categories = Product.Category.values
+        conditions = Product.Condition.values
+        for index in range(self.auctions):
+            auction = self.simulate(index, bids=False)
+            rng = random.Random(f"{self.seed}:product:{index}")
+            category = rng.choice(categories)
+            yield (
+                stable_uuid(self.seed, "product", index),
+                auction.created_at,
+                auction.created_at,
+                self.user_id(auction.owner),
+                f"{category.title()} item #{index}",
+                f"Synthetic listing {index}.",
+                category,
+                rng.choice(conditions),
+            )
+
+    def auction_rows(self):
+        """
+        Auctions with their bid stats, tallying what each user holds, paid and sold along the way.
+        """
+
+        for index in range(self.auctions):
+            auction = self.simulate(index)
+            top_bidder = auction.top_bidder
+            if top_bidder is not None and auction.status == Status.ACTIVE:
+                self.held[top_bidder] += auction.price
+            elif top_bidder is not None and auction.status == Status.FINISHED:
+                self.paid[top_bidder] += auction.price
+                self.sold[auction.owner] += auction.price
+
+            last_bid_at = auction.bids[-1][2] if auction.bids else None
+            yield (
+                stable_uuid(self.seed, "auction", index),
+                auction.created_at,
+                auction.settled_at or last_bid_at or auction.created_at,
+                len(auction.bids),
+                stable_uuid(self.seed, "product", index),
+                auction.status,
+                auction.start_time,
+                auction.end_time,
+                money(auction.starting_price),
+                money(auction.buy_now_price) if auction.buy_now_price else None,
+                money(auction.price),
+                self.user_id(top_bidder) if top_bidder is not None else None,
+                auction.settled_at,
+                auction.settled_at,
+                len(auction.bids),
+                len({bidder for bidder, _, _ in auction.bids}),
+                last_bid_at,
+            )
+
+    def bid_rows(self):
+        for index in range(self.auctions):
+            auction_id = stable_uuid(self.seed, "auction", index)
+            for number, (bidder, cents, at) in enumerate(self.simulate(index).bids):
+                yield (
+                    stable_uuid(self.seed, f"bid:{index}", number),
+                    at,
+                    at,
+                    self.user_id(bidder),
+                    auction_id,
+                    money(cents),
+                )
+
+    def extra_funds(self, index: int) -> int:
+        return int(random.Random(f"{self.seed}:funds:{index}").lognormvariate(math.log(20000), 1.0))
+
+    def wallet_rows(self):
+        for index in range(self.users):
+            balance = self.extra_funds(index) + self.sold[index]
+            joined = self.joined_at(index)
+            yield (
+                self.wallet_id(index),
+                joined,
+                self.now,
+                0,
+                self.user_id(index),
+                money(balance),
+                money(self.held[index]),
+            )
+
+    def ledger_rows(self):
+        def row(kind, index, number, user, transaction_type, cents, at, reference):
+            return (
+                stable_uuid(self.seed, kind, f"{index}:{number}"),
+                at,
+                at,
+                self.wallet_id(user),
+                transaction_type,
+                money(cents),
+                reference,
+            )
+
+        for index in range(self.users):
+            deposit = self.extra_funds(index) + self.paid[index] + self.held[index]
+            yield row(
+                "deposit",
+                index,
+                0,
+                index,
+                Tx.DEPOSIT,
+                deposit,
+                self.joined_at(index) + timedelta(minutes=5),
+                f"cs_synthetic_{index}",
+            )
+
+        for index in range(self.auctions):
+            auction = self.simulate(index)
+            reference = str(stable_uuid(self.seed, "auction", index))
+            number = 0
+            previous = None
+            for bidder, cents, at in auction.bids:
+                if previous is not None:
+                    yield row("tx", index, number, previous[0], Tx.BID_RELEASE, previous[1], at, reference)
+                    number += 1
+                yield row("tx", index, number, bidder, Tx.BID_HOLD, cents, at, reference)
+                number += 1
+                previous = (bidder, cents)
+            if auction.status == Status.FINISHED:
+                yield row(
+                    "tx", index, number, auction.top_bidder, Tx.PAYMENT, auction.price, auction.settled_at, reference
+                )
+                yield row("tx", index, number + 1, auction.owner, Tx.SALE, auction.price, auction.settled_at, reference)
+
+
+USER_COLUMNS = (
+    "id",
+    "password",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "date_joined",
+    "created_at",
+    "updated_at",
+    "is_superuser",
+    "is_staff",
+    "is_active",
+)
+PRODUCT_COLUMNS = ("id", "created_at", "updated_at", "owner_id", "title", "description", "category", "condition")
+AUCTION_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "version",
+    "product_id",
+    "status",
+    "start_time",
+    "end_time",
+    "starting_price",
+    "buy_now_price",
+    "current_price",
+    "winner_id",
+    "winner_notified_at",
+    "settled_at",
+    "bid_count",
+    "unique_bidders",
+    "last_bid_at",
+)
+BID_COLUMNS = ("id", "created_at", "updated_at", "bidder_id", "auction_id", "amount")
+WALLET_COLUMNS = ("id", "created_at", "updated_at", "version", "user_id", "balance", "held_balance")
+LEDGER_COLUMNS = ("id", "created_at", "updated_at", "wallet_id", "transaction_type", "amount", "reference_id")
+
+
+def copy_rows(connection, model, columns, rows) -> int:
+    """
+    Stream `rows` into the model's table with COPY (psycopg 3), returning how many were written.
+    """
+
+    names = ", ".join(f'"{column}"' for column in columns)
+    count = 0
+    with connection.cursor() as cursor, cursor.copy(f'COPY "{model._meta.db_table}" ({names}) FROM STDIN') as copy:
+        for row in rows:
+            copy.write_row(row)
+            count += 1
+    return count
+
+
+def prepare_partitions(connection, dataset: SyntheticDataset) -> None:
+    oldest = dataset.history_start - timedelta(days=366)
+    months = dataset.months + 13 + settings.PARTITION_MONTHS_AHEAD
+    for model in (BidTransaction, WalletTransaction):
+        table = model._meta.db_table
+        if is_partitioned(connection, table):
+            ensure_partitions(connection, table, oldest.date(), months)
+
+
+GENERATED_MODELS = (WalletTransaction, BidTransaction, AuctionListing, Product, Wallet, get_user_model())
@@ -1,70 +1,256 @@
 import logging
-import time
+from datetime import timedelta
 
 from celery import shared_task
 from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
 from django.utils import timezone
 
+from . import facets
 from .models import AuctionListing
+from .notifications import send_winner_notifications
+from .rankings import close_auctions, open_auctions
 
 logger = logging.getLogger(__name__)
 
 
+NOTIFY_BATCH_SIZE = 100
+
+
 @shared_task(bind=True, max_retries=3)
-def notify_winner_task(self, auction_id: str):
-    """
-    Task for sending email notifications to winners (running in the background).
-    bind=True: To allow access to the task instance (e.g., self.retry)
-    max_retries=3: Allows 3 attempts if the task fails
-    """
-    try:
-        # Simulate email sending process
-        logger.info(f"Starting email task for Auction ID: {auction_id}.")
-        time.sleep(5)
-
-        # Retrieving the actual data (This comment will be enabled in the future for actual sending).
-        # auction = AuctionListing.objects.get(id=auction_id)
-        # if auction.winner:
-        #     logger.info(f"Sending email to {auction.winner.email}...")
-        #     send_mail(
-        #         subject="You won the auction!",
-        #         message="Congratulations! You have won the auction.",
-        #         from_email="from@example.com",
-        #         recipient_list=[auction.winner.email],
-        #     )
-        logger.info(f"Email sent successfully for Auction {auction_id}.")
-        return "Email Sent Successfully"
-
-    except Exception as exc:
-        logger.error(f"Failed to send email for Auction {auction_id}: {exc}")
-        raise self.retry(exc=exc, countdown=60) from exc
+def notify_winners_task(self, auction_ids: list[str]):
+    """
+    Task for emailing a batch of auction winners over one SMTP connection (runs on the "notifications" queue).
+    Each auction is claimed before sending (at most one email per auction); only the failed part of a batch is
+    retried, with exponential backoff.
+    """
+
+    logger.info(f"Starting winner email batch for {len(auction_ids)} auctions.")
+    sent, failed = send_winner_notifications(auction_ids)
+    logger.info(f"Winner emails sent: {len(sent)}, failed: {len(failed)}.")
+
+    if failed:
+        raise self.retry(args=(failed,), countdown=60 * 2**self.request.retries)
+
+    return f"Sent {len(sent)} winner emails."
 
 
 @shared_task
-def check_and_close_expired_auctions():
+def notify_winner_task(auction_id: str):
     """
-    Task for checking and closing expired auctions (running in the background every 1 minute).
+    Single-auction entry point (kept for the auction_finished receiver and already-queued messages).
     """
 
-    now = timezone.now()
+    notify_winners_task.delay([str(auction_id)])
+
+
+CLOSE_BATCH_SIZE = 500
+CLOSE_MAX_BATCHES = 20
+
+
+def enqueue_winner_notifications(auction_ids):
+    """
+    Hand finished auctions to the notification queue in batches of NOTIFY_BATCH_SIZE.
+    """
+
+    auction_ids = [str(auction_id) for auction_id in auction_ids]
+    for i in range(0, len(auction_ids), NOTIFY_BATCH_SIZE):
+        notify_winners_task.delay(auction_ids[i : i + NOTIFY_BATCH_SIZE])
+
+
+def announce_closed(closed_ids, finished_ids):
+    """
+    Once closed auctions are committed: drop them from the ranking indexes, email the winners, and drop cached facets.
+    """
+
+    close_auctions(closed_ids)
+    enqueue_winner_notifications(finished_ids)
+    facets.invalidate()
+
+
+def close_expired_batch(now, batch_size: int = CLOSE_BATCH_SIZE, auction_ids=None, skip_locked: bool = True) -> int:
+    """
+    Close up to `batch_size` expired auctions in one short transaction and return how many were closed.
+    Rows locked by bidders or by another closer are skipped (picked up on the next pass) instead of waited on.
+    """
+
+    expired = AuctionListing.objects.filter(status=AuctionListing.Status.ACTIVE, end_time__lte=now)
+    if auction_ids is not None:
+        expired = expired.filter(id__in=auction_ids)
 
     with transaction.atomic():
-        expired_auctions = AuctionListing.objects.select_for_update().filter(
-            status=AuctionListing.Status.ACTIVE,
-            end_time__lt=now,
+        rows = list(
+            expired.select_for_update(skip_locked=skip_locked)
+            .order_by("end_time")
+            .values_list("id", "current_price", "starting_price")[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        # A price above the start means somebody bid: FINISHED (has a winner), otherwise EXPIRED.
+        AuctionListing.objects.filter(id__in=[auction_id for auction_id, _, _ in rows]).update(
+            status=Case(
+                When(current_price__gt=F("starting_price"), then=Value(AuctionListing.Status.FINISHED)),
+                default=Value(AuctionListing.Status.EXPIRED),
+            ),
+            version=F("version") + 1,
+            updated_at=now,
         )
 
-        count = 0
-        for auction in expired_auctions:
-            if auction.current_price > auction.starting_price:
-                auction.status = AuctionListing.Status.FINISHED
-                notify_winner_task.delay(auction.id)
-            else:
-                auction.status = AuctionListing.Status.EXPIRED
+        finished_ids = [
+            auction_id for auction_id, current_price, starting_price in rows if current_price > starting_price
+        ]
+        closed_ids = [auction_id for auction_id, _, _ in rows]
+        transaction.on_commit(lambda: announce_closed(closed_ids, finished_ids))
 
-            auction.save()
-            count += 1
+    return len(rows)
+
+
+@shared_task
+def check_and_close_expired_auctions(batch_size: int = CLOSE_BATCH_SIZE, max_batches: int = CLOSE_MAX_BATCHES):
+    """
+    Safety net for expired auctions whose exact-time close was missed (run by `sweep_auction_lifecycle`).
+    Works in bounded chunks with SKIP LOCKED, so several workers can drain a backlog in parallel.
+    """
+
+    now = timezone.now()
+
+    count = 0
+    for _ in range(max_batches):
+        closed = close_expired_batch(now, batch_size)
+        count += closed
+        if closed < batch_size:
+            break
+    else:
+        # Still a full backlog after max_batches: hand the rest to another run instead of hogging this worker.
+        check_and_close_expired_auctions.delay(batch_size=batch_size, max_batches=max_batches)
 
     logger.info(f"Closed {count} expired auctions.")
 
     return f"Closed {count} expired auctions."
+
+
+# Lifecycle Scheduling
+# Start/end deadlines are registered as ETA tasks when they come within LIFECYCLE_HORIZON (on create/edit, or by the
+# sweeper as they approach). The horizon stays below the broker's visibility timeout (1h on Redis) so long ETAs are
+# never redelivered. Every task re-checks the row, so stale schedules left behind by an edit are harmless no-ops.
+
+LIFECYCLE_HORIZON = timedelta(minutes=30)
+LIFECYCLE_SWEEP_INTERVAL = timedelta(minutes=5)
+
+
+def schedule_auction_lifecycle(auction, now=None, future_only: bool = False):
+    """
+    Register the start/end deadlines of a DRAFT or ACTIVE auction that fall within the horizon.
+    Overdue deadlines fire immediately, unless `future_only` (then they are left to the sweeper).
+    """
+
+    now = now or timezone.now()
+    horizon = now + LIFECYCLE_HORIZON
+
+    def due(deadline):
+        return deadline <= horizon and (deadline > now or not future_only)
+
+    if auction.status == AuctionListing.Status.DRAFT and due(auction.start_time):
+        activate_auction_task.apply_async((str(auction.id),), eta=max(auction.start_time, now))
+
+    if auction.status in (AuctionListing.Status.DRAFT, AuctionListing.Status.ACTIVE) and due(auction.end_time):
+        close_auction_task.apply_async((str(auction.id),), eta=max(auction.end_time, now))
+
+
+@shared_task
+def activate_auction_task(auction_id: str):
+    """
+    Open a DRAFT auction for bidding once its start_time has arrived.
+    """
+
+    now = timezone.now()
+    activated = AuctionListing.objects.filter(
+        id=auction_id,
+        status=AuctionListing.Status.DRAFT,
+        start_time__lte=now,
+    ).update(status=AuctionListing.Status.ACTIVE, version=F("version") + 1, updated_at=now)
+
+    if activated:
+        open_auctions(AuctionListing.objects.filter(id=auction_id).values_list("id", "end_time"))
+        facets.invalidate()
+    else:
+        reschedule_if_early(auction_id, now)
+
+    return activated
+
+
+@shared_task
+def close_auction_task(auction_id: str):
+    """
+    Close one auction at its end_time (same decision and notification path as the batch closer).
+    """
+
+    now = timezone.now()
+    # Wait for an in-flight bid to commit rather than skipping the row: this is the exact-time close.
+    closed = close_expired_batch(now, batch_size=1, auction_ids=[auction_id], skip_locked=False)
+
+    if not closed:
+        reschedule_if_early(auction_id, now)
+
+    return closed
+
+
+def reschedule_if_early(auction_id, now):
+    """
+    A task that fired before its deadline (clock skew, or the auction was edited) registers the current one again.
+    Anything else (already transitioned, deleted, cancelled) is a no-op.
+    """
+
+    auction = AuctionListing.objects.filter(id=auction_id).only("id", "status", "start_time", "end_time").first()
+    if auction is not None:
+        schedule_auction_lifecycle(auction, now, future_only=True)
+
+
+@shared_task
+def sweep_auction_lifecycle():
+    """
+    Periodic safety net (every LIFECYCLE_SWEEP_INTERVAL):
+    1. Activate overdue drafts and close overdue auctions (missed or lost ETA tasks).
+    2. Register the deadlines that are entering the scheduling horizon.
+    """
+
+    now = timezone.now()
+
+    overdue = list(
+        AuctionListing.objects.filter(status=AuctionListing.Status.DRAFT, start_time__lte=now).values_list(
+            "id", "end_time"
+        )
+    )
+    activated = AuctionListing.objects.filter(
+        id__in=[auction_id for auction_id, _ in overdue], status=AuctionListing.Status.DRAFT
+    ).update(
+        status=AuctionListing.Status.ACTIVE,
+        version=F("version") + 1,
+        updated_at=now,
+    )
+    open_auctions(overdue)  # Any activated by their own task meanwhile are already in: adding again is a no-op
+    if activated:
+        facets.invalidate()
+    check_and_close_expired_auctions.delay()
+
+    # Deadlines between the previous sweep's horizon and this one's (one extra minute of overlap absorbs beat jitter).
+    window_start = now + LIFECYCLE_HORIZON - LIFECYCLE_SWEEP_INTERVAL - timedelta(minutes=1)
+    window_end = now + LIFECYCLE_HORIZON
+    upcoming = AuctionListing.objects.filter(
+        Q(status=AuctionListing.Status.DRAFT, start_time__gt=window_start, start_time__lte=window_end)
+        | Q(
+            status__in=[AuctionListing.Status.DRAFT, AuctionListing.Status.ACTIVE],
+            end_time__gt=window_start,
+            end_time__lte=window_end,
+        )
+    ).only("id", "status", "start_time", "end_time")
+
+    scheduled = 0
+    for auction in upcoming.iterator():
+        schedule_auction_lifecycle(auction, now)
+        scheduled += 1
+
+    logger.info(f"Lifecycle sweep: activated {activated} overdue drafts, scheduled {scheduled} upcoming auctions.")
+
+    return f"Activated {activated}, scheduled {scheduled}."
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory
+
+from auctions import facets, rankings
+from auctions.admin import AuctionListingAdmin
+from auctions.models import AuctionListing
+from auctions.tests.factories import AuctionListingFactory
+
+
+def save(auction, **changes):
+    """Save `changes` to `auction` as the change form would."""
+    model_admin = AuctionListingAdmin(AuctionListing, AdminSite())
+    form = model_admin.get_form(None, auction, change=True)(instance=auction)  # Holds the values before the edit
+    for name, value in changes.items():
+        setattr(auction, name, value)
+    model_admin.save_model(None, auction, form, change=True)
+
+
+def cancel(queryset):
+    model_admin = AuctionListingAdmin(AuctionListing, AdminSite())
+    with patch.object(model_admin, "message_user"):
+        model_admin.cancel_auctions(RequestFactory().post("/admin/"), queryset)
+
+
+@pytest.mark.django_db
+class TestCancelAuctionsAction:
+    def test_cancelled_auctions_leave_the_ranking_indexes(self, realtime_valkey, django_capture_on_commit_callbacks):
+        """Test that cancelling drops the auctions from both indexes once committed, and leaves the others."""
+        cancelled, kept = AuctionListingFactory(), AuctionListingFactory()
+        rankings.open_auctions([(auction.id, auction.end_time) for auction in (cancelled, kept)])
+        rankings.record_bid(cancelled.id, cancelled.start_time)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            cancel(AuctionListing.objects.filter(id=cancelled.id))
+
+        cancelled.refresh_from_db()
+        assert cancelled.status == AuctionListing.Status.CANCELLED
+        assert realtime_valkey.zrange(rankings.ENDING_SOON_KEY, 0, -1) == [str(kept.id).encode()]
+        assert realtime_valkey.zcard(rankings.HOT_KEY) == 0
+
+    def test_cancelling_drops_cached_facets(self, django_capture_on_commit_callbacks):
+        """Test that cancelling starts a new facets generation once committed."""
+        auction = AuctionListingFactory()
+        before = facets.cache_key({}, [])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            cancel(AuctionListing.objects.filter(id=auction.id))
+
+        assert facets.cache_key({}, []) != before
+
+
+@pytest.mark.django_db
+class TestSaveModel:
+    @pytest.fixture(autouse=True)
+    def lifecycle(self):
+        with patch("auctions.admin.schedule_auction_lifecycle"):
+            yield
+
+    def test_status_edits_follow_the_ranking_indexes(self, realtime_valkey, django_capture_on_commit_callbacks):
+        """Test that activating adds the auction, and cancelling it removes it from both indexes."""
+        auction = AuctionListingFactory(status=AuctionListing.Status.DRAFT)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            save(auction, status=AuctionListing.Status.ACTIVE)
+        assert realtime_valkey.zscore(rankings.ENDING_SOON_KEY, str(auction.id)) == auction.end_time.timestamp()
+
+        rankings.record_bid(auction.id, auction.start_time)
+        with django_capture_on_commit_callbacks(execute=True):
+            save(auction, status=AuctionListing.Status.CANCELLED)
+        assert realtime_valkey.zcard(rankings.ENDING_SOON_KEY) == 0
+        assert realtime_valkey.zcard(rankings.HOT_KEY) == 0
+
+    def test_status_edits_drop_cached_facets(self, django_capture_on_commit_callbacks):
+        """Test that a status change starts a new facets generation, other edits don't."""
+        auction = AuctionListingFactory()
+        before = facets.cache_key({}, [])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            save(auction, current_price="500.00")
+        assert facets.cache_key({}, []) == before
+
+        with django_capture_on_commit_callbacks(execute=True):
+            save(auction, status=AuctionListing.Status.CANCELLED)
+        assert facets.cache_key({}, []) != before
@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
 from auctions.models import AuctionListing, Product
@@ -80,3 +83,25 @@ class TestAuctionSearchAPI:
         assert len(results) == 2
         assert results[0]["id"] == str(a2.id)
         assert results[1]["id"] == str(a1.id)
+
+    def test_sort_by_last_bid_keeps_unbid_last(self, api_client):
+        """Test sorting by most recent activity, with never-bid auctions last."""
+        now = timezone.now()
+        never = AuctionListingFactory(status=AuctionListing.Status.ACTIVE)
+        older = AuctionListingFactory(status=AuctionListing.Status.ACTIVE, last_bid_at=now - timedelta(hours=1))
+        recent = AuctionListingFactory(status=AuctionListing.Status.ACTIVE, last_bid_at=now)
+
+        url = reverse("auction_list")
+        response = api_client.get(url, {"ordering": "-last_bid_at"})
+        assert [r["id"] for r in response.data] == [str(recent.id), str(older.id), str(never.id)]
+
+        response = api_client.get(url, {"ordering": "last_bid_at"})
+        assert [r["id"] for r in response.data] == [str(older.id), str(recent.id), str(never.id)]
+
+    def test_sort_by_bid_count(self, api_client):
+        """Test sorting by number of bids."""
+        quiet = AuctionListingFactory(status=AuctionListing.Status.ACTIVE, bid_count=1)
+        busy = AuctionListingFactory(status=AuctionListing.Status.ACTIVE, bid_count=12)
+
+        response = api_client.get(reverse("auction_list"), {"ordering": "-bid_count"})
+        assert [r["id"] for r in response.data] == [str(busy.id), str(quiet.id)]
@@ -1,8 +1,9 @@
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 from django.urls import reverse
-from payments.models import Wallet
+from payments.models import Wallet, WalletTransaction
 from rest_framework import status
 from users.tests.factories import UserFactory
 
@@ -85,7 +86,17 @@ class TestAuctionFlows:
         assert w2.balance == 400  # 500 - 100
         assert w2.held_balance == 100
 
-    def test_buy_now_flow(self, api_client):
+        # 4. Bidder 1 bids again: counted as a bid, but not as a new bidder
+        api_client.force_authenticate(user=bidder1)
+        response = api_client.post(url_bid, {"amount": "150.00"})
+        assert response.status_code == status.HTTP_201_CREATED
+
+        auction.refresh_from_db()
+        assert auction.bid_count == 3
+        assert auction.unique_bidders == 2
+        assert auction.last_bid_at == auction.bids.order_by("-created_at").first().created_at
+
+    def test_buy_now_flow(self, api_client, django_capture_on_commit_callbacks):
         buyer = UserFactory()
         Wallet.objects.create(user=buyer, balance=1000)
 
@@ -96,15 +107,106 @@ class TestAuctionFlows:
         api_client.force_authenticate(user=buyer)
         url = reverse("auction_buy_now", kwargs={"id": auction.id})
 
-        response = api_client.post(url)
+        with (
+            patch("auctions.views.publish_auction_finished") as publish,
+            patch("auctions.views.notify_winners_task.delay") as notify,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            response = api_client.post(url)
         assert response.status_code == status.HTTP_200_OK
 
         auction.refresh_from_db()
         assert auction.status == AuctionListing.Status.FINISHED
         assert auction.winner == buyer
         assert auction.current_price == Decimal("500.00")
+        assert auction.settled_at is not None
+
+        # Purchase is logged as the closing bid
+        assert auction.bid_count == 1
+        assert auction.bids.get().amount == Decimal("500.00")
+
+        # Paid at once: nothing stays held, the seller is credited
+        assert Wallet.objects.filter(user=buyer).values_list("balance", "held_balance").get() == (500, 0)
+        assert Wallet.objects.get(user=auction.product.owner).balance == 500
+        assert set(
+            WalletTransaction.objects.filter(reference_id=str(auction.id)).values_list("transaction_type", flat=True)
+        ) == {WalletTransaction.Type.BID_HOLD, WalletTransaction.Type.PAYMENT, WalletTransaction.Type.SALE}
+
+        publish.assert_called_once()
+        assert publish.call_args.args[:3] == (auction.id, buyer, Decimal("500.00"))
+        notify.assert_called_once_with([str(auction.id)])
+
+    def test_buy_now_refunds_previous_winner(self, api_client):
+        previous, buyer = UserFactory(), UserFactory()
+        Wallet.objects.create(user=previous, balance=0, held_balance=150)
+        Wallet.objects.create(user=buyer, balance=500)
+        auction = AuctionListingFactory(
+            status=AuctionListing.Status.ACTIVE, current_price="150.00", buy_now_price="500.00", winner=previous
+        )
+
+        api_client.force_authenticate(user=buyer)
+        with patch("auctions.views.publish_auction_finished"):
+            response = api_client.post(reverse("auction_buy_now", kwargs={"id": auction.id}))
 
-        # Check wallet
-        w = Wallet.objects.get(user=buyer)
-        assert w.balance == 500
-        assert w.held_balance == 500  # Moved to held awaiting payout logic
+        assert response.status_code == status.HTTP_200_OK
+        assert Wallet.objects.filter(user=previous).values_list("balance", "held_balance").get() == (150, 0)
+        assert Wallet.objects.filter(user=buyer).values_list("balance", "held_balance").get() == (0, 0)
+        assert WalletTransaction.objects.filter(
+            wallet__user=previous, transaction_type=WalletTransaction.Type.BID_RELEASE, amount=150
+        ).exists()
+
+    def test_buy_now_insufficient_funds_rolls_back(self, api_client):
+        previous, buyer = UserFactory(), UserFactory()
+        Wallet.objects.create(user=previous, balance=0, held_balance=150)
+        Wallet.objects.create(user=buyer, balance=499)
+        auction = AuctionListingFactory(
+            status=AuctionListing.Status.ACTIVE, current_price="150.00", buy_now_price="500.00", winner=previous
+        )
+
+        api_client.force_authenticate(user=buyer)
+        response = api_client.post(reverse("auction_buy_now", kwargs={"id": auction.id}))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {"error": "Insufficient funds."}
+        auction.refresh_from_db()
+        assert auction.status == AuctionListing.Status.ACTIVE
+        assert auction.winner == previous
+        assert auction.bid_count == 0
+        assert Wallet.objects.filter(user=previous).values_list("balance", "held_balance").get() == (0, 150)
+        assert Wallet.objects.get(user=buyer).balance == 499
+
+    def test_buy_now_only_once(self, api_client):
+        first, second = UserFactory(), UserFactory()
+        Wallet.objects.create(user=first, balance=500)
+        Wallet.objects.create(user=second, balance=500)
+        auction = AuctionListingFactory(status=AuctionListing.Status.ACTIVE, buy_now_price="500.00")
+        url = reverse("auction_buy_now", kwargs={"id": auction.id})
+
+        with patch("auctions.views.publish_auction_finished"):
+            api_client.force_authenticate(user=first)
+            assert api_client.post(url).status_code == status.HTTP_200_OK
+            api_client.force_authenticate(user=second)
+            response = api_client.post(url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {"error": "Auction is not active."}
+        assert Wallet.objects.get(user=second).balance == 500
+
+    def test_insufficient_funds_keeps_previous_hold(self, api_client):
+        """Test that a rejected bid rolls back entirely, leaving the previous winner's hold in place."""
+        first, second = UserFactory(), UserFactory()
+        Wallet.objects.create(user=first, balance=0, held_balance=50)
+        Wallet.objects.create(user=second, balance=60)
+        auction = AuctionListingFactory(
+            status=AuctionListing.Status.ACTIVE, starting_price="10.00", current_price="50.00", winner=first
+        )
+
+        api_client.force_authenticate(user=second)
+        response = api_client.post(reverse("auction_bid", kwargs={"id": auction.id}), {"amount": "70.00"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {"error": "Insufficient funds."}
+        assert Wallet.objects.filter(user=first).values_list("balance", "held_balance").get() == (0, 50)
+        auction.refresh_from_db()
+        assert auction.winner == first
+        assert auction.bid_count == 0
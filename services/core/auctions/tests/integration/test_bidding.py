@@ -0,0 +1,88 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from payments.models import Wallet, WalletTransaction
+from users.tests.factories import UserFactory
+
+from auctions.bidding import place_bid
+from auctions.models import AuctionListing
+from auctions.tests.factories import AuctionListingFactory
+
+
+@pytest.mark.django_db
+class TestPlaceBidFunction:
+    def balances(self, user):
+        return Wallet.objects.filter(user=user).values_list("balance", "held_balance").get()
+
+    def test_places_bid_and_moves_holds(self):
+        """Test that one call holds, releases, logs and updates the auction."""
+        first, second = UserFactory(), UserFactory()
+        Wallet.objects.create(user=first, balance=0, held_balance=50)
+        Wallet.objects.create(user=second, balance=100)
+        auction = AuctionListingFactory(current_price="50.00", winner=first)
+        version = auction.version
+
+        result = place_bid(auction.id, second.id, Decimal("80.00"))
+
+        assert result.ok
+        assert (result.price, result.previous_winner_id, result.bid_count, result.unique_bidders) == (
+            Decimal("80.00"),
+            first.id,
+            1,
+            1,
+        )
+        assert (result.balance, result.held_balance) == (Decimal("20.00"), Decimal("80.00"))
+        assert self.balances(first) == (50, 0)
+
+        auction.refresh_from_db()
+        assert (auction.winner, auction.current_price, auction.last_bid_at) == (second, Decimal("80.00"), result.bid_at)
+        assert auction.version == version + 1
+        assert auction.bids.get().id == result.bid_id
+        assert set(WalletTransaction.objects.values_list("transaction_type", flat=True)) == {"BID_HOLD", "BID_RELEASE"}
+
+    def test_raising_own_bid_needs_only_the_difference(self):
+        """Test that the bidder's current hold counts toward their higher bid."""
+        user = UserFactory()
+        Wallet.objects.create(user=user, balance=20, held_balance=50)
+        auction = AuctionListingFactory(current_price="50.00", winner=user, unique_bidders=1)
+
+        result = place_bid(auction.id, user.id, Decimal("70.00"))
+
+        assert result.ok
+        assert self.balances(user) == (0, 70)
+
+    @pytest.mark.parametrize(
+        "setup, amount, expected",
+        [
+            ({"status": AuctionListing.Status.DRAFT}, "80.00", "not_active"),
+            (
+                {"end_time": timezone.now() - timedelta(minutes=1), "start_time": timezone.now() - timedelta(days=1)},
+                "80.00",
+                "ended",
+            ),
+            ({}, "50.00", "too_low"),
+            ({}, "500.00", "insufficient_funds"),
+        ],
+    )
+    def test_refused_bids_change_nothing(self, setup, amount, expected):
+        """Test that every refusal reason comes back as a status and leaves all rows untouched."""
+        user = UserFactory()
+        Wallet.objects.create(user=user, balance=100)
+        auction = AuctionListingFactory(current_price="50.00", **setup)
+
+        result = place_bid(auction.id, user.id, Decimal(amount))
+
+        assert result.status == expected
+        assert result.error
+        assert self.balances(user) == (100, 0)
+        assert not auction.bids.exists()
+        assert not WalletTransaction.objects.exists()
+
+    def test_own_auction_refused(self):
+        """Test that sellers can't bid on their own auctions."""
+        auction = AuctionListingFactory()
+        Wallet.objects.create(user=auction.product.owner, balance=100)
+
+        assert place_bid(auction.id, auction.product.owner_id, Decimal("20.00")).status == "own_auction"
@@ -0,0 +1,222 @@
+from collections import Counter
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from common.partitioning import ensure_partitions, list_partitions
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from payments.ledger import create_checkpoints, ledger_deltas
+from payments.models import Wallet, WalletCheckpoint, WalletTransaction
+from users.tests.factories import UserFactory
+
+from auctions.loadtest import LoadResult
+from auctions.management.commands.bid_load import BIDDER_FUNDS
+from auctions.models import AuctionListing, BidTransaction
+from auctions.synthetic import SyntheticDataset, stable_uuid
+from auctions.tests.factories import AuctionListingFactory, BidTransactionFactory
+
+
+@pytest.mark.django_db
+class TestRebuildBidStatsCommand:
+    def test_rebuilds_drifted_counters(self):
+        """Test that counters are recomputed from the bid history."""
+        bidder = UserFactory()
+        auction = AuctionListingFactory(bid_count=99, unique_bidders=99)
+        BidTransactionFactory(auction=auction, bidder=bidder, amount="20.00")
+        last = BidTransactionFactory(auction=auction, bidder=bidder, amount="30.00")
+        BidTransactionFactory(auction=auction, amount="40.00")
+        untouched = AuctionListingFactory()
+        version = auction.version
+
+        call_command("rebuild_bid_stats")
+
+        auction.refresh_from_db()
+        assert auction.bid_count == 3
+        assert auction.unique_bidders == 2
+        assert auction.last_bid_at >= last.created_at
+        assert auction.version == version + 1
+
+        untouched.refresh_from_db()
+        assert untouched.bid_count == 0
+        assert untouched.last_bid_at is None
+
+    def test_skips_auctions_whose_bids_may_be_archived(self):
+        """Test that counters of auctions past the archive age are kept, their bids may be gone."""
+        ended = datetime(2020, 1, 20, tzinfo=UTC)
+        old = {"start_time": datetime(2020, 1, 1, tzinfo=UTC), "end_time": ended, "bid_count": 7, "unique_bidders": 3}
+        expired = AuctionListingFactory(status=AuctionListing.Status.EXPIRED, **old)
+        settled = AuctionListingFactory(status=AuctionListing.Status.FINISHED, settled_at=ended, **old)
+        unsettled = AuctionListingFactory(status=AuctionListing.Status.FINISHED, **old)
+
+        call_command("rebuild_bid_stats")
+
+        assert AuctionListing.objects.get(id=expired.id).bid_count == 7
+        assert AuctionListing.objects.get(id=settled.id).bid_count == 7
+        assert AuctionListing.objects.get(id=unsettled.id).bid_count == 0  # Its bids are still live
+
+    def test_dry_run_does_not_write(self):
+        """Test that --dry-run only reports."""
+        auction = AuctionListingFactory(bid_count=5)
+
+        call_command("rebuild_bid_stats", "--dry-run")
+
+        assert AuctionListing.objects.get(id=auction.id).bid_count == 5
+
+
+@pytest.mark.django_db
+class TestManagePartitionsCommand:
+    table = BidTransaction._meta.db_table
+
+    def bid_at(self, auction, when):
+        bid = BidTransactionFactory(auction=auction, amount="20.00")
+        BidTransaction.objects.filter(id=bid.id).update(created_at=when)
+        return bid
+
+    def partitions(self):
+        return [name for name, _, _ in list_partitions(connection, self.table)]
+
+    def test_creates_partitions_ahead(self):
+        """Test that the current and upcoming months get partitions, moving rows out of the default partition."""
+        stray = self.bid_at(AuctionListingFactory(), datetime(2030, 5, 10, tzinfo=UTC))
+
+        call_command("manage_partitions", "--months-ahead=1")
+        call_command("manage_partitions", "--months-ahead=1")  # Idempotent
+
+        assert len(self.partitions()) >= 2
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{self.table}_default"')
+            assert cursor.fetchone()[0] == 1
+
+        ensure_partitions(connection, self.table, datetime(2030, 5, 1, tzinfo=UTC), 1)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{self.table}_p203005" WHERE id = %s', [stray.id])
+            assert cursor.fetchone()[0] == 1
+
+    def test_archives_only_partitions_of_closed_auctions(self):
+        """Test that old partitions are detached only once all their auctions are closed past the archive age."""
+        closed = AuctionListingFactory(
+            status=AuctionListing.Status.EXPIRED,
+            start_time=datetime(2020, 1, 1, tzinfo=UTC),
+            end_time=datetime(2020, 1, 20, tzinfo=UTC),
+        )
+        archived_bid = self.bid_at(closed, datetime(2020, 1, 10, tzinfo=UTC))
+        self.bid_at(AuctionListingFactory(), datetime(2020, 2, 10, tzinfo=UTC))  # Still ACTIVE
+
+        ensure_partitions(connection, self.table, datetime(2020, 1, 1, tzinfo=UTC), 2)
+
+        call_command("manage_partitions", "--archive", "--dry-run")
+        assert f"{self.table}_p202001" in self.partitions()
+
+        call_command("manage_partitions", "--archive", "--schema=archive")
+
+        assert f"{self.table}_p202001" not in self.partitions()
+        assert f"{self.table}_p202002" in self.partitions()
+        assert not BidTransaction.objects.filter(id=archived_bid.id).exists()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM archive."{self.table}_p202001"')
+            assert cursor.fetchone()[0] == 1
+
+    def test_archives_ledger_partitions_once_the_checkpoints_cover_them(self):
+        """Test that a partition goes once each wallet's rows are checkpointed, idle wallets included."""
+        table = WalletTransaction._meta.db_table
+        quiet, busy, late = (Wallet.objects.create(user=UserFactory()) for _ in range(3))
+        ensure_partitions(connection, table, datetime(2020, 1, 1, tzinfo=UTC), 2)
+        for wallet, when in (
+            (quiet, datetime(2020, 1, 10, tzinfo=UTC)),
+            (busy, datetime(2020, 1, 20, tzinfo=UTC)),
+            (busy, datetime(2020, 2, 10, tzinfo=UTC)),
+            (late, datetime(2020, 2, 20, tzinfo=UTC)),
+        ):
+            row = WalletTransaction.objects.create(
+                wallet=wallet, transaction_type=WalletTransaction.Type.DEPOSIT, amount="10.00"
+            )
+            WalletTransaction.objects.filter(id=row.id).update(created_at=when)
+
+        def archived():
+            call_command("manage_partitions", "--archive", "--schema=archive")
+            partitions = [name for name, _, _ in list_partitions(connection, table)]
+            return [month for month in ("202001", "202002") if f"{table}_p{month}" not in partitions]
+
+        create_checkpoints(datetime(2020, 1, 11, tzinfo=UTC))  # The quiet wallet's last checkpoint
+        create_checkpoints(datetime(2020, 2, 15, tzinfo=UTC))
+        assert archived() == ["202001"]  # The late wallet's row isn't checkpointed yet
+
+        create_checkpoints(datetime(2020, 3, 1, tzinfo=UTC))
+        assert archived() == ["202001", "202002"]
+        assert WalletCheckpoint.objects.filter(wallet=quiet).count() == 1
+
+
+@pytest.mark.django_db
+class TestGenerateDatasetCommand:
+    options = ("--users=60", "--auctions=40", "--bids-per-auction=8", "--months=2", "--now=2026-03-01T12:00:00+00:00")
+
+    def bids(self):
+        return BidTransaction.objects.order_by("id").values_list("id", "bidder_id", "amount", "created_at")
+
+    def test_refuses_without_debug(self, settings):
+        settings.DEBUG = False
+
+        with pytest.raises(CommandError):
+            call_command("generate_dataset", *self.options)
+        assert not AuctionListing.objects.exists()
+
+    def test_generates_consistent_data(self, capsys):
+        """Test that the generated counters and balances agree with the generated bids and ledger."""
+        call_command("generate_dataset", *self.options, "--force")
+
+        assert get_user_model().objects.count() == 60
+        assert AuctionListing.objects.count() == 40
+        assert BidTransaction.objects.exists()
+        assert AuctionListing.objects.filter(status=AuctionListing.Status.FINISHED).exists()
+
+        call_command("rebuild_bid_stats", "--dry-run")
+        assert "0 would be repaired" in capsys.readouterr().out
+
+        ledger = {
+            row["wallet_id"]: (row["balance_delta"], row["held_delta"])
+            for row in WalletTransaction.objects.values("wallet_id").annotate(**ledger_deltas())
+        }
+        wallets = {
+            wallet_id: (balance, held)
+            for wallet_id, balance, held in Wallet.objects.values_list("id", "balance", "held_balance")
+        }
+        assert wallets == ledger
+
+    def test_is_deterministic(self, settings):
+        """Test that the same seed and anchor give the same rows."""
+        settings.DEBUG = True
+        call_command("generate_dataset", *self.options)
+
+        dataset = SyntheticDataset(60, 40, 8, 2, 42, datetime(2026, 3, 1, 12, tzinfo=UTC))
+        expected = sorted(
+            (bid_id, bidder_id, Decimal(amount), at) for bid_id, at, _, bidder_id, _, amount in dataset.bid_rows()
+        )
+        assert list(self.bids()) == expected
+        assert get_user_model().objects.filter(id=stable_uuid(42, "user", 0)).exists()
+
+
+@pytest.mark.django_db
+class TestBidLoadCommand:
+    def test_prepares_funded_bidders_and_open_auctions(self, settings, capsys):
+        """Test the setup around the network run: funded, logged bidders with tokens, fresh open auctions."""
+        settings.DEBUG = True
+        result = LoadResult(accepted_ms=[5.0, 7.0], rejections=Counter(too_low=3), elapsed=1.0)
+
+        with patch("auctions.management.commands.bid_load.run_load", return_value=result) as run:
+            call_command("bid_load", "--bidders=3", "--auctions=2", "--duration=5")
+            call_command("bid_load", "--bidders=3", "--auctions=2", "--duration=5")  # Reuses the bidders
+
+        config, tokens, prices = run.call_args.args
+        assert config.protocol == "rest" and len(tokens) == 3
+        assert AuctionListing.objects.filter(id__in=prices, status=AuctionListing.Status.ACTIVE).count() == 2
+
+        wallets = Wallet.objects.filter(user__username__startswith="loadbidder")
+        assert [wallet.balance for wallet in wallets] == [2 * BIDDER_FUNDS] * 3
+        assert WalletTransaction.objects.filter(reference_id="bid_load").count() == 6
+
+        output = capsys.readouterr().out
+        assert "2 accepted / 5 attempts" in output
+        assert "deadlocks" in output
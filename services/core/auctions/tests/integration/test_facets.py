@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from auctions.models import AuctionListing, Product
+from auctions.tasks import check_and_close_expired_auctions
+from auctions.tests.factories import AuctionListingFactory, ProductFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def auction(category, condition, price, **kwargs):
+    product = ProductFactory(category=category, condition=condition, title=kwargs.pop("title", "Item"))
+    return AuctionListingFactory(product=product, current_price=price, **kwargs)
+
+
+@pytest.mark.django_db
+class TestAuctionFacetsAPIView:
+    @pytest.fixture
+    def catalogue(self):
+        auction(Product.Category.ELECTRONICS, Product.Condition.NEW, "40.00")
+        auction(Product.Category.ELECTRONICS, Product.Condition.USED_GOOD, "120.00", title="Camera")
+        auction(Product.Category.FASHION, Product.Condition.NEW, "60.00", title="Camera bag")
+        auction(Product.Category.ART, Product.Condition.USED_FAIR, "7000.00")
+        auction(Product.Category.ART, Product.Condition.NEW, "80.00", status=AuctionListing.Status.EXPIRED)
+        auction(Product.Category.ART, Product.Condition.NEW, "80.00", status=AuctionListing.Status.DRAFT)
+
+    def listed(self, api_client, **params):
+        return len(api_client.get(reverse("auction_list"), params).json())
+
+    def test_counts_each_facet_under_the_other_filters(self, api_client, catalogue):
+        """Test that every count is what the list shows when that value is picked, from one query."""
+        params = {"status": "ACTIVE", "category": "ELECTRONICS", "condition": "NEW", "min_price": "30"}
+
+        response = api_client.get(reverse("auction_facets"), params)
+
+        assert response.status_code == 200
+        assert 'desc="1 queries"' in response["Server-Timing"]
+        data = response.json()
+        assert data["total"] == self.listed(api_client, **params) == 1
+        for value in Product.Category.values:
+            assert data["category"][value] == self.listed(api_client, **{**params, "category": value})
+        for value in Product.Condition.values:
+            assert data["condition"][value] == self.listed(api_client, **{**params, "condition": value})
+        assert data["category"] == {**dict.fromkeys(Product.Category.values, 0), "ELECTRONICS": 1, "FASHION": 1}
+
+        # The histogram ignores the price filter itself: the 40.00 one still counts
+        priced = api_client.get(reverse("auction_facets"), {"category": "ELECTRONICS", "min_price": "100"})
+        histogram = priced.json()["price"]
+        assert [(bucket["min"], bucket["max"], bucket["count"]) for bucket in histogram] == [
+            ("0.00", "50.00", 1),
+            ("50.00", "100.00", 0),
+            ("100.00", "500.00", 1),
+            ("500.00", "1000.00", 0),
+            ("1000.00", "5000.00", 0),
+            ("5000.00", None, 0),
+        ]
+
+    def test_search_and_no_filters(self, api_client, catalogue):
+        """Test the facets of a search, and of everything the list shows (no DRAFTs)."""
+        searched = api_client.get(reverse("auction_facets"), {"search": "camera"}).json()
+        everything = api_client.get(reverse("auction_facets")).json()
+
+        assert searched["total"] == 2
+        assert searched["category"]["FASHION"] == 1
+        assert everything["total"] == 5
+        assert everything["price"][-1]["count"] == 1
+
+    def test_cached_by_normalized_filters_until_a_status_change(
+        self, api_client, catalogue, django_capture_on_commit_callbacks
+    ):
+        """Test that equivalent query strings share one cached result, dropped when an auction closes."""
+        url = reverse("auction_facets")
+        first = api_client.get(url, {"category": "ART", "min_price": "10.0", "condition": ""})
+        cached = api_client.get(url, {"min_price": "10", "category": "ART"})
+
+        assert 'desc="0 queries"' in cached["Server-Timing"]
+        assert cached.json() == first.json()
+        assert first.json()["total"] == 2
+
+        start = timezone.now() - timedelta(days=2)
+        AuctionListingFactory(
+            product=ProductFactory(category=Product.Category.ART),
+            start_time=start,
+            end_time=start + timedelta(days=1),
+        )
+        fresh = api_client.get(url, {"min_price": "10", "category": "ART"})  # Still the cached counts
+        with django_capture_on_commit_callbacks(execute=True):
+            check_and_close_expired_auctions()
+        closed = api_client.get(url, {"min_price": "10", "category": "ART"})
+
+        assert fresh.json()["total"] == 2
+        assert 'desc="1 queries"' in closed["Server-Timing"]
+        assert closed.json()["total"] == 3  # The closed one is EXPIRED, still listed
+
+    def test_invalid_filters(self, api_client):
+        """Test that filters the list would refuse are refused."""
+        response = api_client.get(reverse("auction_facets"), {"min_price": "cheap"})
+
+        assert response.status_code == 400
+        assert "min_price" in response.json()
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from users.tests.factories import UserFactory
+
+from auctions.models import AuctionListing
+from auctions.notifications import send_winner_notifications
+from auctions.tests.factories import AuctionListingFactory
+
+
+def finished_auction(**kwargs):
+    return AuctionListingFactory(
+        status=AuctionListing.Status.FINISHED, current_price="50.00", winner=UserFactory(), **kwargs
+    )
+
+
+@pytest.mark.django_db
+class TestWinnerNotifications:
+    def test_batch_sends_one_email_per_winner(self, mailoutbox):
+        """Test that a batch emails each winner once over a single connection."""
+        auctions = [finished_auction() for _ in range(3)]
+        no_winner = AuctionListingFactory(status=AuctionListing.Status.EXPIRED)
+        ids = [str(a.id) for a in auctions] + [str(no_winner.id)]
+
+        with patch("auctions.notifications.get_connection", wraps=mail.get_connection) as get_connection:
+            sent, failed = send_winner_notifications(ids)
+
+        get_connection.assert_called_once()
+        assert sorted(sent) == sorted(str(a.id) for a in auctions)
+        assert failed == []
+        assert sorted(m.to[0] for m in mailoutbox) == sorted(a.winner.email for a in auctions)
+        assert AuctionListing.objects.filter(winner_notified_at__isnull=False).count() == 3
+
+    def test_deduplicates_per_auction(self, mailoutbox):
+        """Test that a redelivered batch does not email the winner twice."""
+        auction = finished_auction()
+
+        send_winner_notifications([str(auction.id)])
+        sent, _ = send_winner_notifications([str(auction.id)])
+
+        assert sent == []
+        assert len(mailoutbox) == 1
+
+    def test_connection_failure_releases_claims(self, mailoutbox):
+        """Test that a failed batch is released for the retry."""
+        auction = finished_auction()
+
+        with patch("auctions.notifications.get_connection", side_effect=ConnectionRefusedError("smtp down")):
+            sent, failed = send_winner_notifications([str(auction.id)])
+
+        assert sent == []
+        assert failed == [str(auction.id)]
+        auction.refresh_from_db()
+        assert auction.winner_notified_at is None
+
+        # The retry goes through once SMTP is back
+        sent, failed = send_winner_notifications(failed)
+        assert sent == [str(auction.id)]
+        assert len(mailoutbox) == 1
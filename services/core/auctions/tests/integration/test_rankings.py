@@ -0,0 +1,156 @@
+import math
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+import redis
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from payments.models import Wallet
+from users.tests.factories import UserFactory
+
+from auctions import rankings
+from auctions.bidding import buy_now, place_bid
+from auctions.models import AuctionListing
+from auctions.tasks import activate_auction_task, close_auction_task, sweep_auction_lifecycle
+from auctions.tests.factories import AuctionListingFactory
+
+
+def open_auction(**kwargs):
+    auction = AuctionListingFactory(**kwargs)
+    rankings.open_auctions([(auction.id, auction.end_time)])
+    return auction
+
+
+def bid(auction, amount):
+    bidder = UserFactory()
+    Wallet.objects.create(user=bidder, balance=1000)
+    return place_bid(auction.id, bidder.id, Decimal(amount))
+
+
+@pytest.mark.django_db
+class TestRankingIndexes:
+    def test_lifecycle_keeps_the_ending_soon_index(self, realtime_valkey, django_capture_on_commit_callbacks):
+        """Test that activation adds an auction and closing or buying it removes it from both indexes."""
+        now = timezone.now()
+        draft = AuctionListingFactory(status=AuctionListing.Status.DRAFT, start_time=now - timedelta(seconds=1))
+        overdue = AuctionListingFactory(status=AuctionListing.Status.DRAFT, start_time=now - timedelta(minutes=10))
+        bought = open_auction()
+
+        with patch.object(activate_auction_task, "apply_async"):
+            activate_auction_task(str(draft.id))
+        with patch("auctions.tasks.check_and_close_expired_auctions.delay"):
+            sweep_auction_lifecycle()
+
+        members = realtime_valkey.zrange(rankings.ENDING_SOON_KEY, 0, -1, withscores=True)
+        assert dict(members) == {
+            str(auction.id).encode(): auction.end_time.timestamp() for auction in (draft, overdue, bought)
+        }
+
+        bid(bought, "20.00")
+        AuctionListing.objects.filter(id=draft.id).update(end_time=now)
+        with (
+            patch("auctions.tasks.enqueue_winner_notifications"),
+            patch("auctions.bidding.pay_buy_now"),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            close_auction_task(str(draft.id))
+            buy_now(bought.id, UserFactory().id)
+
+        assert realtime_valkey.zrange(rankings.ENDING_SOON_KEY, 0, -1) == [str(overdue.id).encode()]
+        assert realtime_valkey.zcard(rankings.HOT_KEY) == 0
+
+    def test_recent_bids_outrank_older_activity(self, realtime_valkey):
+        """Test that activity decays with HOT_HALF_LIFE, and closed auctions don't re-enter the index."""
+        now = timezone.now()
+        busy_yesterday, quiet, lively, closed = (open_auction() for _ in range(4))
+        rankings.close_auctions([closed.id])
+
+        for _ in range(5):
+            rankings.record_bid(busy_yesterday.id, now - timedelta(hours=6))  # 5 * 2^-6 of a bid now
+        rankings.record_bid(quiet.id, now - rankings.HOT_HALF_LIFE)
+        rankings.record_bid(lively.id, now)
+        rankings.record_bid(lively.id, now - rankings.HOT_HALF_LIFE)
+        rankings.record_bid(closed.id, now)
+
+        assert rankings.hot_ids(0, 10) == [str(lively.id), str(quiet.id), str(busy_yesterday.id)]
+        assert realtime_valkey.zscore(rankings.HOT_KEY, str(lively.id)) == pytest.approx(
+            rankings.bid_score(now) + math.log(1.5)
+        )
+
+    def test_rebuild_matches_the_incremental_indexes(self, realtime_valkey, django_capture_on_commit_callbacks):
+        """Test that a rebuild from Postgres gives the scores the bid paths maintain."""
+        auction, idle = open_auction(), open_auction()
+        AuctionListingFactory(status=AuctionListing.Status.FINISHED)
+        with django_capture_on_commit_callbacks(execute=True):
+            first, second = bid(auction, "20.00"), bid(auction, "30.00")
+        incremental = realtime_valkey.zrange(rankings.HOT_KEY, 0, -1, withscores=True)
+        realtime_valkey.flushall()
+
+        call_command("rebuild_auction_rankings")
+
+        assert realtime_valkey.zcard(rankings.ENDING_SOON_KEY) == 2
+        assert realtime_valkey.zscore(rankings.ENDING_SOON_KEY, str(idle.id)) == idle.end_time.timestamp()
+        [(member, score)] = realtime_valkey.zrange(rankings.HOT_KEY, 0, -1, withscores=True)
+        assert member == str(auction.id).encode()
+        assert score == pytest.approx(incremental[0][1])
+        assert score == pytest.approx(
+            rankings.combine_scores([rankings.bid_score(first.bid_at), rankings.bid_score(second.bid_at)])
+        )
+
+    def test_unreachable_valkey_does_not_fail_the_bid(self, realtime_valkey):
+        """Test that index writes are best effort."""
+        auction = open_auction()
+
+        with patch.object(realtime_valkey, "eval", side_effect=redis.ConnectionError("down")):
+            result = bid(auction, "20.00")
+
+        assert result.ok
+
+
+@pytest.mark.django_db
+class TestRankedAuctionListAPIView:
+    def test_ending_soon_pages_through_the_index(self, api_client):
+        """Test soonest-first pages, leaving out ended or no longer active auctions."""
+        now = timezone.now()
+        auctions = [open_auction(end_time=now + timedelta(hours=hours)) for hours in (3, 1, 2, 4)]
+        open_auction(start_time=now - timedelta(days=1), end_time=now - timedelta(minutes=1))  # Ended, not closed yet
+        AuctionListing.objects.filter(id=auctions[2].id).update(status=AuctionListing.Status.EXPIRED)  # Missed removal
+
+        first = api_client.get(reverse("auction_ending_soon"), {"limit": 2})
+        second = api_client.get(reverse("auction_ending_soon"), {"limit": 2, "offset": 2})
+
+        assert 'desc="1 queries"' in first["Server-Timing"]
+        assert [row["id"] for row in first.json()] == [str(auctions[1].id)]
+        assert [row["id"] for row in second.json()] == [str(auctions[0].id), str(auctions[3].id)]
+        assert first.json()[0] == api_client.get(reverse("auction_list")).json()[-2]  # Same rows as the list
+
+    def test_hot(self, api_client, django_capture_on_commit_callbacks):
+        """Test hottest-first order of the hydrated rows."""
+        cold, hot = open_auction(), open_auction()
+        with django_capture_on_commit_callbacks(execute=True):
+            bid(cold, "20.00")
+            bid(hot, "20.00")
+            bid(hot, "30.00")
+
+        response = api_client.get(reverse("auction_hot"))
+
+        assert response.status_code == 200
+        assert [row["id"] for row in response.json()] == [str(hot.id), str(cold.id)]
+        assert response.json()[0]["bid_count"] == 2
+
+    def test_falls_back_to_postgres(self, api_client, realtime_valkey):
+        """Test that the endpoints still answer, from Postgres, while Valkey is unreachable."""
+        now = timezone.now()
+        later = AuctionListingFactory(end_time=now + timedelta(hours=2), last_bid_at=now - timedelta(hours=1))
+        sooner = AuctionListingFactory(end_time=now + timedelta(hours=1), last_bid_at=now)
+        AuctionListingFactory()  # No bids
+
+        with patch.object(realtime_valkey, "zrange", side_effect=redis.ConnectionError("down")):
+            ending = api_client.get(reverse("auction_ending_soon"), {"limit": 2})
+            hot = api_client.get(reverse("auction_hot"))
+
+        assert [row["id"] for row in ending.json()] == [str(sooner.id), str(later.id)]
+        assert [row["id"] for row in hot.json()] == [str(sooner.id), str(later.id)]
@@ -0,0 +1,157 @@
+from datetime import timedelta
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from users.tests.factories import UserFactory
+
+from auctions.models import AuctionListing
+from auctions.tasks import (
+    LIFECYCLE_HORIZON,
+    activate_auction_task,
+    check_and_close_expired_auctions,
+    close_auction_task,
+    schedule_auction_lifecycle,
+    sweep_auction_lifecycle,
+)
+from auctions.tests.factories import AuctionListingFactory
+
+
+def expired_auction(**kwargs):
+    start = timezone.now() - timedelta(days=2)
+    return AuctionListingFactory(start_time=start, end_time=start + timedelta(days=1), **kwargs)
+
+
+@pytest.mark.django_db
+class TestCloseExpiredAuctions:
+    def test_closes_in_batches_and_notifies_after_commit(self, django_capture_on_commit_callbacks):
+        """Test FINISHED/EXPIRED decision per row and bulk notification once committed."""
+        sold = [expired_auction(current_price="50.00", winner=UserFactory()) for _ in range(3)]
+        unsold = [expired_auction() for _ in range(2)]
+        running = AuctionListingFactory()
+
+        with patch("auctions.tasks.enqueue_winner_notifications") as enqueue:
+            with django_capture_on_commit_callbacks(execute=True) as callbacks:
+                result = check_and_close_expired_auctions(batch_size=2)
+
+        assert result == "Closed 5 expired auctions."
+        assert len(callbacks) == 3  # one per chunk of 2
+
+        notified = {auction_id for call in enqueue.call_args_list for auction_id in call.args[0]}
+        assert notified == {auction.id for auction in sold}
+
+        for auction in sold:
+            auction.refresh_from_db()
+            assert auction.status == AuctionListing.Status.FINISHED
+            assert auction.version == 2  # created (1) + closed (2)
+        for auction in unsold:
+            auction.refresh_from_db()
+            assert auction.status == AuctionListing.Status.EXPIRED
+
+        running.refresh_from_db()
+        assert running.status == AuctionListing.Status.ACTIVE
+
+    def test_requeues_remaining_backlog(self):
+        """Test that a run stops after max_batches and hands the rest to another run."""
+        for _ in range(3):
+            expired_auction()
+
+        with (
+            patch("auctions.tasks.enqueue_winner_notifications"),
+            patch.object(check_and_close_expired_auctions, "delay") as delay,
+        ):
+            check_and_close_expired_auctions(batch_size=1, max_batches=2)
+
+        delay.assert_called_once_with(batch_size=1, max_batches=2)
+        assert AuctionListing.objects.filter(status=AuctionListing.Status.ACTIVE).count() == 1
+
+
+@pytest.mark.django_db
+class TestAuctionLifecycle:
+    def test_activate_at_start_time(self):
+        """Test that a draft opens once its start_time arrives, and not before."""
+        now = timezone.now()
+        due = AuctionListingFactory(status=AuctionListing.Status.DRAFT, start_time=now - timedelta(seconds=1))
+        early = AuctionListingFactory(status=AuctionListing.Status.DRAFT, start_time=now + timedelta(minutes=10))
+
+        with patch.object(activate_auction_task, "apply_async") as apply_async:
+            assert activate_auction_task(str(due.id)) == 1
+            assert activate_auction_task(str(early.id)) == 0
+
+        due.refresh_from_db()
+        early.refresh_from_db()
+        assert due.status == AuctionListing.Status.ACTIVE
+        assert early.status == AuctionListing.Status.DRAFT
+        # The early run re-registers the real deadline
+        apply_async.assert_called_once_with((str(early.id),), eta=early.start_time)
+
+    def test_close_at_end_time(self):
+        """Test that the exact-time close uses the batch closer decision."""
+        auction = expired_auction(current_price="50.00")
+
+        with patch("auctions.tasks.enqueue_winner_notifications"):
+            assert close_auction_task(str(auction.id)) == 1
+            assert close_auction_task(str(auction.id)) == 0  # Stale duplicate is a no-op
+
+        auction.refresh_from_db()
+        assert auction.status == AuctionListing.Status.FINISHED
+
+    def test_schedule_only_within_horizon(self):
+        """Test that far deadlines are left for the sweeper."""
+        now = timezone.now()
+        soon = AuctionListingFactory(
+            status=AuctionListing.Status.DRAFT,
+            start_time=now + timedelta(minutes=1),
+            end_time=now + timedelta(minutes=10),
+        )
+        later = AuctionListingFactory(status=AuctionListing.Status.DRAFT, start_time=now + timedelta(days=1))
+
+        with (
+            patch.object(activate_auction_task, "apply_async") as activate,
+            patch.object(close_auction_task, "apply_async") as close,
+        ):
+            schedule_auction_lifecycle(soon, now)
+            schedule_auction_lifecycle(later, now)
+
+        activate.assert_called_once_with((str(soon.id),), eta=soon.start_time)
+        close.assert_called_once_with((str(soon.id),), eta=soon.end_time)
+
+    def test_sweep_activates_overdue_and_schedules_upcoming(self):
+        """Test the safety-net sweep."""
+        now = timezone.now()
+        overdue = AuctionListingFactory(status=AuctionListing.Status.DRAFT, start_time=now - timedelta(hours=1))
+        upcoming = AuctionListingFactory(end_time=now + LIFECYCLE_HORIZON - timedelta(minutes=1))
+        AuctionListingFactory(end_time=now + timedelta(days=3))
+
+        with (
+            patch.object(check_and_close_expired_auctions, "delay") as close_expired,
+            patch("auctions.tasks.schedule_auction_lifecycle") as schedule,
+        ):
+            sweep_auction_lifecycle()
+
+        overdue.refresh_from_db()
+        assert overdue.status == AuctionListing.Status.ACTIVE
+        close_expired.assert_called_once()
+        assert [call.args[0].id for call in schedule.call_args_list] == [upcoming.id]
+
+    def test_create_registers_deadlines_on_commit(self, api_client, django_capture_on_commit_callbacks):
+        """Test that creating an auction schedules its lifecycle after commit."""
+        api_client.force_authenticate(user=UserFactory())
+        data = {
+            "title": "Clock",
+            "category": "HOME",
+            "condition": "NEW",
+            "start_time": (timezone.now() + timedelta(minutes=5)).isoformat(),
+            "end_time": (timezone.now() + timedelta(days=1)).isoformat(),
+            "starting_price": "10.00",
+        }
+
+        with patch("auctions.serializers.schedule_auction_lifecycle") as schedule:
+            with django_capture_on_commit_callbacks(execute=True):
+                response = api_client.post(reverse("auction_create"), data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert schedule.call_args.args[0].id == UUID(response.data["id"])
@@ -57,3 +57,35 @@ class TestAuctionListAPI:
         bids = response.data["bids"]
         assert len(bids) == 2
         assert float(bids[0]["amount"]) == 100.00  # Ordering is by amount desc in model
+
+
+@pytest.mark.django_db
+class TestAuctionConditionalGet:
+    def test_etag_not_modified(self, api_client):
+        """Test that a matching If-None-Match answers 304 without a body."""
+        auction = AuctionListingFactory(status=AuctionListing.Status.ACTIVE)
+        url = reverse("auction_detail", kwargs={"id": auction.id})
+
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response["ETag"]
+        assert response["Last-Modified"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_etag_changes_after_update(self, api_client):
+        """Test that saving the auction (e.g. a new bid) invalidates the ETag."""
+        auction = AuctionListingFactory(status=AuctionListing.Status.ACTIVE)
+        url = reverse("auction_detail", kwargs={"id": auction.id})
+        etag = api_client.get(url)["ETag"]
+
+        auction.current_price = "50.00"
+        auction.save()
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["current_price"] == "50.00"
@@ -0,0 +1,38 @@
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from users.tests.factories import UserFactory
+
+from auctions.events import publish_auction_finished
+
+
+@pytest.mark.django_db
+class TestAuctionEvents:
+    def test_publish_auction_finished(self):
+        winner = UserFactory(username="johndoe")
+        client = MagicMock()
+
+        with patch("auctions.events.get_realtime_client", return_value=client):
+            publish_auction_finished("abc", winner, Decimal("500.00"), datetime(2026, 1, 1, tzinfo=UTC))
+
+        channel, message = client.publish.call_args.args
+        assert channel == "auction:abc"
+        assert json.loads(message) == {
+            "type": "AUCTION_FINISHED",
+            "amount": "500.00",
+            "winner": {"id": str(winner.id), "username": "j***e"},
+            "timestamp": "2026-01-01T00:00:00+00:00",
+        }
+
+    def test_publish_is_best_effort(self):
+        client = MagicMock()
+        client.publish.side_effect = redis.ConnectionError("down")
+
+        with patch("auctions.events.get_realtime_client", return_value=client):
+            publish_auction_finished("abc", UserFactory(), Decimal("1.00"), datetime(2026, 1, 1, tzinfo=UTC))
+
+        client.publish.assert_called_once()
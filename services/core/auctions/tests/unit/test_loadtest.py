@@ -0,0 +1,96 @@
+import asyncio
+import random
+from collections import Counter
+from decimal import Decimal
+from unittest.mock import patch
+
+import httpx
+
+from auctions import loadtest
+from auctions.loadtest import LoadConfig, percentile, realtime_rejection, rest_rejection, run_load, skewed_picker
+
+
+def config(**overrides):
+    return LoadConfig(
+        **{
+            "protocol": "rest",
+            "duration": 0.2,
+            "skew": 1.0,
+            "step": Decimal("1.00"),
+            "think": 0,
+            "core_url": "http://core",
+            "realtime_url": "ws://realtime",
+        }
+        | overrides
+    )
+
+
+class TestHelpers:
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([7.0], 95) == 7.0
+        assert percentile([], 50) is None
+
+    def test_skewed_picker(self):
+        pick_uniform = skewed_picker(["a", "b"], 0, random.Random(1))
+        pick_skewed = skewed_picker(["a", "b", "c", "d"], 2, random.Random(1))
+        uniform = Counter(pick_uniform() for _ in range(2000))
+        skewed = Counter(pick_skewed() for _ in range(2000))
+
+        assert abs(uniform["a"] - uniform["b"]) < 200
+        assert skewed.most_common(1)[0][0] == "a"
+        assert skewed["a"] > 0.6 * 2000  # 1 / (1 + 1/4 + 1/9 + 1/16) of the picks
+
+    def test_rejection_reasons(self):
+        assert (
+            rest_rejection(httpx.Response(400, json={"error": "Bid must be higher than current price."})) == "too_low"
+        )
+        assert rest_rejection(httpx.Response(404, json={"detail": "Not found."})) == "http_404"
+        assert realtime_rejection("Bid amount must be higher than current price 12.00") == "too_low"
+        assert realtime_rejection("Insufficient funds") == "insufficient_funds"
+
+
+class TestRunLoad:
+    def test_accounts_for_every_attempt(self):
+        """Test that racing bidders' attempts end up accepted or rejected as too low, and the book keeps up."""
+        prices = {"a1": Decimal("10.00"), "a2": Decimal("10.00")}
+        server = dict(prices)
+
+        async def bid(self, auction_id, amount):
+            current = server[auction_id]
+            await asyncio.sleep(0.001)  # Others bid meanwhile
+            if amount <= max(current, server[auction_id]):
+                return "too_low"
+            server[auction_id] = amount
+            return None
+
+        with (
+            patch.object(loadtest.RestBidder, "open", return_value=None),
+            patch.object(loadtest.RestBidder, "close", return_value=None),
+            patch.object(loadtest.RestBidder, "bid", bid),
+        ):
+            result = asyncio.run(run_load(config(), ["t1", "t2", "t3"], prices))
+
+        summary = result.summary()
+        assert summary["accepted"] > 0
+        assert summary["attempts"] == summary["accepted"] + sum(summary["rejections"].values())
+        assert set(summary["rejections"]) <= {"too_low"}
+        assert summary["ack_ms"]["p50"] <= summary["ack_ms"]["p99"]
+        assert any(server[auction_id] > prices[auction_id] for auction_id in prices)
+
+    def test_server_errors_are_not_rejections(self):
+        async def bid(self, auction_id, amount):
+            raise loadtest.ServerError("http_503")
+
+        with (
+            patch.object(loadtest.RestBidder, "open", return_value=None),
+            patch.object(loadtest.RestBidder, "close", return_value=None),
+            patch.object(loadtest.RestBidder, "bid", bid),
+        ):
+            result = asyncio.run(run_load(config(), ["t1"], {"a1": Decimal("10.00")}))
+
+        assert result.errors["http_503"] > 0
+        assert not result.rejections and not result.accepted_ms
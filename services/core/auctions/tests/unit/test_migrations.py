@@ -0,0 +1,12 @@
+from pathlib import Path
+
+from auctions.bidding import PLACE_BID_SQL
+
+MIGRATION_SQL = Path(__file__).parents[2] / "migrations" / "sql"
+
+
+def test_place_bid_function_changes_ship_as_migrations():
+    """Test that the live auction_place_bid() is the one the latest migration installs."""
+    latest = max(MIGRATION_SQL.glob("*_place_bid_function.sql"))
+
+    assert latest.read_text() == PLACE_BID_SQL.read_text()
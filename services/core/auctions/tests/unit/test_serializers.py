@@ -1,7 +1,19 @@
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
 from users.models import User
+from users.tests.factories import UserFactory
 
-from auctions.serializers import MaskedUserSummarySerializer
+from auctions.models import AuctionListing, Product
+from auctions.serializers import (
+    AuctionListingRowSerializer,
+    AuctionListingSerializer,
+    MaskedUserSummarySerializer,
+    UserAuctionRowSerializer,
+    UserAuctionSerializer,
+)
+from auctions.tests.factories import AuctionListingFactory, BidTransactionFactory
+from auctions.views import AuctionListAPIView, UserBidListAPIView
 
 
 class TestMaskedUserSerializer(TestCase):
@@ -19,3 +31,48 @@ class TestMaskedUserSerializer(TestCase):
         user = User(id="123", username="")
         serializer = MaskedUserSummarySerializer(user)
         self.assertEqual(serializer.data["username"], "Anonymous")
+
+
+class TestRowSerializers(TestCase):
+    """The `.values()` serializers of the hot list endpoints must render exactly what their ModelSerializers do."""
+
+    def setUp(self):
+        self.bidder = UserFactory()
+        self.request = RequestFactory().get("/api/auctions/")
+        self.request.user = self.bidder
+
+        winning = AuctionListingFactory(
+            current_price="25.00", bid_count=1, unique_bidders=1, last_bid_at=timezone.now()
+        )
+        Product.objects.filter(id=winning.product_id).update(image="products/lot.jpg")
+        BidTransactionFactory(auction=winning, bidder=self.bidder, amount="25.00")
+
+        outbid = AuctionListingFactory(
+            current_price="1234567.89", status=AuctionListing.Status.FINISHED, product__description=None
+        )
+        BidTransactionFactory(auction=outbid, bidder=self.bidder, amount="15.00")
+        BidTransactionFactory(auction=outbid, amount="1234567.89")
+
+        AuctionListingFactory()  # Never bid on
+
+    def assert_same_output(self, queryset, serializer_class, row_serializer_class):
+        context = {"request": self.request}
+        expected = serializer_class(queryset, many=True, context=context).data
+        actual = row_serializer_class(queryset, many=True, context=context).data
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))  # Key order and types too
+
+    def test_auction_list(self):
+        queryset = AuctionListAPIView().get_queryset()
+
+        self.assertEqual(queryset.count(), 3)
+        self.assert_same_output(queryset, AuctionListingSerializer, AuctionListingRowSerializer)
+
+    def test_my_bids(self):
+        view = UserBidListAPIView()
+        view.request = self.request
+        queryset = view.get_queryset()
+
+        self.assertEqual(queryset.count(), 2)
+        self.assert_same_output(queryset, UserAuctionSerializer, UserAuctionRowSerializer)
@@ -3,16 +3,22 @@ from django.urls import path
 from .views import (
     AuctionCreateAPIView,
     AuctionDeleteAPIView,
+    AuctionFacetsAPIView,
     AuctionListAPIView,
     AuctionRetrieveAPIView,
     AuctionUpdateAPIView,
     BuyNowAPIView,
+    EndingSoonAuctionListAPIView,
+    HotAuctionListAPIView,
     PlaceBidAPIView,
     UserBidListAPIView,
 )
 
 urlpatterns = [
     path("", AuctionListAPIView.as_view(), name="auction_list"),  # /api/auctions/
+    path("facets/", AuctionFacetsAPIView.as_view(), name="auction_facets"),
+    path("ending-soon/", EndingSoonAuctionListAPIView.as_view(), name="auction_ending_soon"),
+    path("hot/", HotAuctionListAPIView.as_view(), name="auction_hot"),
     path("create/", AuctionCreateAPIView.as_view(), name="auction_create"),
     path("<uuid:id>/", AuctionRetrieveAPIView.as_view(), name="auction_detail"),  # /api/auctions/<id>/
     path("<uuid:id>/update/", AuctionUpdateAPIView.as_view(), name="auction_update"),
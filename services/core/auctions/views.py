@@ -1,20 +1,37 @@
+import logging
+from collections.abc import Callable
+
 import django_filters
+import redis
+from common.db import retry_on_conflict
+from common.views import AsyncReadMixin, ConditionalGetMixin
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import F, Max, Q
+from django.http import Http404
 from django.utils import timezone
+from django_filters import utils as filter_utils
 from django_filters.rest_framework import DjangoFilterBackend
-from payments.models import Wallet, WalletTransaction
+from payments.services import InsufficientFunds
 from rest_framework import filters, generics, permissions, status, views
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 
-from .models import AuctionListing, BidTransaction
+from . import facets, rankings
+from .bidding import buy_now, place_bid
+from .events import publish_auction_finished
+from .models import AuctionListing
 from .serializers import (
     AuctionCreateSerializer,
     AuctionDetailSerializer,
-    AuctionListingSerializer,
+    AuctionListingRowSerializer,
     BidCreateSerializer,
-    UserAuctionSerializer,
+    UserAuctionRowSerializer,
 )
+from .tasks import notify_winners_task, schedule_auction_lifecycle
+
+logger = logging.getLogger(__name__)
 
 
 class AuctionFilter(django_filters.FilterSet):
@@ -28,29 +45,146 @@ class AuctionFilter(django_filters.FilterSet):
         fields = ["status", "category", "condition", "min_price", "max_price"]
 
 
-class AuctionListAPIView(generics.ListAPIView):
-    serializer_class = AuctionListingSerializer
+class AuctionOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that keeps NULLs (e.g. never-bid auctions for `last_bid_at`) at the end in both directions.
+    """
+
+    nulls_last_fields = {"last_bid_at"}
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+
+        return queryset.order_by(*[self.get_order_expression(field) for field in ordering])
+
+    def get_order_expression(self, field):
+        name = field.lstrip("-")
+        if name not in self.nulls_last_fields:
+            return field
+        if field.startswith("-"):
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_last=True)
+
+
+class AuctionListAPIView(AsyncReadMixin, generics.ListAPIView):
+    # The hottest read: rows straight from `.values()`, same output as AuctionListingSerializer
+    serializer_class = AuctionListingRowSerializer
     permission_classes = [permissions.AllowAny]
     queryset = AuctionListing.objects.exclude(status="DRAFT").order_by("-created_at")
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, AuctionOrderingFilter]
     filterset_class = AuctionFilter
     search_fields = ["product__title", "product__description"]
-    ordering_fields = ["current_price", "end_time", "created_at"]
+    ordering_fields = ["current_price", "end_time", "created_at", "bid_count", "last_bid_at"]
+
 
+class AuctionFacetsAPIView(AsyncReadMixin, generics.ListAPIView):
+    """
+    Category, condition and price-histogram counts for the list's filters (same query string), see auctions.facets.
+    """
 
-class AuctionRetrieveAPIView(generics.RetrieveAPIView):
+    permission_classes = [permissions.AllowAny]
+    queryset = AuctionListAPIView.queryset
+    filter_backends = [filters.SearchFilter]
+    search_fields = AuctionListAPIView.search_fields
+
+    def list(self, request, *args, **kwargs):
+        filterset = AuctionFilter(request.query_params, queryset=self.get_queryset(), request=request)
+        if not filterset.is_valid():
+            raise filter_utils.translate_validation(filterset.errors)
+        cleaned = filterset.form.cleaned_data
+
+        key = facets.cache_key(cleaned, filters.SearchFilter().get_search_terms(request))
+        data = cache.get(key)
+        if data is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            if cleaned.get("status"):
+                queryset = queryset.filter(status=cleaned["status"])
+            data = facets.count_facets(queryset, cleaned)
+            cache.set(key, data, facets.FACETS_TTL)
+
+        return Response(data)
+
+
+class RankingPagination(LimitOffsetPagination):
+    # Only parses `?limit=&offset=`: the page is cut from the sorted set, not from the queryset.
+    default_limit: int = 20
+    max_limit = 100
+
+
+class RankedAuctionListAPIView(AsyncReadMixin, generics.ListAPIView):
+    """
+    A page (`?limit=&offset=`) of one of the auctions.rankings indexes, hydrated in one query.
+    While Valkey is unreachable, the page comes from the nearest Postgres ordering instead.
+    Subclasses set `ranked_ids` (the index's page reader) and that ordering's `fallback_filter` / `fallback_ordering`.
+    """
+
+    serializer_class = AuctionListingRowSerializer
+    permission_classes = [permissions.AllowAny]
     queryset = AuctionListing.objects.all()
+
+    ranked_ids: Callable[[int, int], list[str]]
+    fallback_filter = Q()
+    fallback_ordering: tuple[str, ...] = ()
+
+    def get_queryset(self):
+        paginator = RankingPagination()
+        limit = paginator.get_limit(self.request) or paginator.default_limit
+        offset = paginator.get_offset(self.request)
+
+        try:
+            auction_ids = self.ranked_ids(offset, limit)
+        except redis.RedisError as exc:
+            logger.warning(f"Ranking index unavailable, falling back to Postgres: {exc}")
+            fallback = (
+                super()
+                .get_queryset()
+                .filter(self.fallback_filter, status=AuctionListing.Status.ACTIVE, end_time__gt=timezone.now())
+            )
+            return fallback.order_by(*self.fallback_ordering)[offset : offset + limit]
+
+        return rankings.hydrate(super().get_queryset(), auction_ids)
+
+
+class EndingSoonAuctionListAPIView(RankedAuctionListAPIView):
+    ranked_ids = staticmethod(rankings.ending_soon_ids)
+    fallback_ordering = ("end_time",)
+
+
+class HotAuctionListAPIView(RankedAuctionListAPIView):
+    ranked_ids = staticmethod(rankings.hot_ids)
+    # Most recently bid on: the decayed activity's closest approximation from the denormalized stats.
+    fallback_filter = Q(last_bid_at__isnull=False)
+    fallback_ordering = ("-last_bid_at",)
+
+
+class AuctionRetrieveAPIView(AsyncReadMixin, ConditionalGetMixin, generics.RetrieveAPIView):
+    queryset = AuctionListing.objects.select_related("product__owner")
     serializer_class = AuctionDetailSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = "id"
 
+    def get_validators(self):
+        # Every bid saves the auction, so its version also covers the embedded bid history.
+        row = AuctionListing.objects.filter(id=self.kwargs["id"]).values_list("version", "updated_at").first()
+        if row is None:
+            return None
+        version, updated_at = row
+        return f"auction-{self.kwargs['id']}-v{version}", updated_at
+
 
 class UserBidListAPIView(generics.ListAPIView):
-    serializer_class = UserAuctionSerializer
+    serializer_class = UserAuctionRowSerializer  # Same output as UserAuctionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return AuctionListing.objects.filter(bids__bidder=self.request.user).distinct().order_by("-created_at")
+        # Filtering the joined bids to the user's own makes the MAX their highest bid, grouped per auction.
+        return (
+            AuctionListing.objects.filter(bids__bidder_id=self.request.user.pk)
+            .annotate(my_highest_bid=Max("bids__amount"))
+            .order_by("-created_at")
+        )
 
 
 class AuctionCreateAPIView(generics.CreateAPIView):
@@ -68,11 +202,14 @@ class AuctionUpdateAPIView(generics.UpdateAPIView):
 
     def perform_update(self, serializer):
         auction = self.get_object()
-        if auction.product.owner != self.request.user:
+        if auction.product.owner_id != self.request.user.pk:
             raise PermissionDenied("You do not own this auction.")
         if auction.status != AuctionListing.Status.DRAFT:
             raise ValidationError("You can only edit DRAFT auctions.")
-        serializer.save()
+        auction = serializer.save()
+
+        # Re-register the (possibly moved) deadlines; tasks for the old ones will find nothing to do.
+        transaction.on_commit(lambda: schedule_auction_lifecycle(auction))
 
 
 class AuctionDeleteAPIView(generics.DestroyAPIView):
@@ -81,7 +218,7 @@ class AuctionDeleteAPIView(generics.DestroyAPIView):
     lookup_field = "id"
 
     def perform_destroy(self, instance):
-        if instance.product.owner != self.request.user:
+        if instance.product.owner_id != self.request.user.pk:
             raise PermissionDenied("You do not own this auction.")
         if instance.status != AuctionListing.Status.DRAFT:
             raise ValidationError("You can only delete DRAFT auctions.")
@@ -91,69 +228,20 @@ class AuctionDeleteAPIView(generics.DestroyAPIView):
 class PlaceBidAPIView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @retry_on_conflict()
     def post(self, request, id):
-        auction = generics.get_object_or_404(AuctionListing, id=id)
         serializer = BidCreateSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        amount = serializer.validated_data["amount"]
-        user = request.user
-
-        if auction.status != AuctionListing.Status.ACTIVE:
-            return Response({"error": "Auction is not active."}, status=status.HTTP_400_BAD_REQUEST)
-
-        if auction.end_time < timezone.now():
-            return Response({"error": "Auction has ended."}, status=status.HTTP_400_BAD_REQUEST)
-
-        if user == auction.product.owner:
-            return Response({"error": "You cannot bid on your own auction."}, status=status.HTTP_400_BAD_REQUEST)
-
-        if amount <= auction.current_price:
-            return Response({"error": "Bid must be higher than current price."}, status=status.HTTP_400_BAD_REQUEST)
-
-        with transaction.atomic():
-            # 1. Check Wallet Balance
-            wallet = Wallet.objects.select_for_update().get(user=user)
-            # Assuming full amount hold for simplicity, or just check?
-            # Let's assume we hold the bid amount.
-            if wallet.balance < amount:
-                return Response({"error": "Insufficient funds."}, status=status.HTTP_400_BAD_REQUEST)
-
-            # 2. Release previous winner's hold (if any)
-            if auction.winner:
-                prev_winner_wallet = Wallet.objects.select_for_update().get(user=auction.winner)
-                prev_bid = auction.current_price
-                prev_winner_wallet.held_balance -= prev_bid
-                prev_winner_wallet.balance += prev_bid  # Refund back to balance
-                prev_winner_wallet.save()
-
-                WalletTransaction.objects.create(
-                    wallet=prev_winner_wallet,
-                    transaction_type=WalletTransaction.Type.BID_RELEASE,
-                    amount=prev_bid,
-                    reference_id=str(auction.id),
-                )
-
-            # 3. Hold funds for new bidder
-            wallet.balance -= amount
-            wallet.held_balance += amount
-            wallet.save()
-
-            WalletTransaction.objects.create(
-                wallet=wallet,
-                transaction_type=WalletTransaction.Type.BID_HOLD,
-                amount=amount,
-                reference_id=str(auction.id),
-            )
+        # Validation, holds/releases, the bid, ledger rows and stats: one call to the shared stored function
+        # (the realtime service places bids through it too).
+        result = place_bid(id, request.user.id, serializer.validated_data["amount"])
 
-            # 4. Create Bid
-            BidTransaction.objects.create(auction=auction, bidder=user, amount=amount)
-
-            # 5. Update Auction
-            auction.current_price = amount
-            auction.winner = user
-            auction.save()
+        if result.status == "not_found":
+            raise Http404
+        if not result.ok:
+            return Response({"error": result.error}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({"status": "Bid placed successfully."}, status=status.HTTP_201_CREATED)
 
@@ -161,63 +249,45 @@ class PlaceBidAPIView(views.APIView):
 class BuyNowAPIView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @retry_on_conflict()
     def post(self, request, id):
-        auction = generics.get_object_or_404(AuctionListing, id=id)
         user = request.user
 
-        if not auction.buy_now_price:
-            return Response({"error": "Buy Now not available."}, status=status.HTTP_400_BAD_REQUEST)
-
-        if auction.status != AuctionListing.Status.ACTIVE:
-            return Response({"error": "Auction is not active."}, status=status.HTTP_400_BAD_REQUEST)
-
-        if user == auction.product.owner:
-            return Response({"error": "You cannot buy your own item."}, status=status.HTTP_400_BAD_REQUEST)
-
-        price = auction.buy_now_price
-
-        with transaction.atomic():
-            # 1. Check/Deduct Funds
-            wallet = Wallet.objects.select_for_update().get(user=user)
-            if wallet.balance < price:
-                return Response({"error": "Insufficient funds."}, status=status.HTTP_400_BAD_REQUEST)
-
-            # 2. Refund previous highest bidder if exists
-            if auction.winner:
-                prev_winner_wallet = Wallet.objects.select_for_update().get(user=auction.winner)
-                prev_bid = auction.current_price
-                prev_winner_wallet.held_balance -= prev_bid
-                prev_winner_wallet.balance += prev_bid
-                prev_winner_wallet.save()
-                WalletTransaction.objects.create(
-                    wallet=prev_winner_wallet,
-                    transaction_type=WalletTransaction.Type.BID_RELEASE,
-                    amount=prev_bid,
-                    reference_id=str(auction.id),
-                )
-
-            # 3. Process Payment (Immediate Transfer logic could go here, but for now we hold -> close)
-            # Actually, Buy Now usually means immediate sold.
-            wallet.balance -= price
-            # We move it to held or directly subtract? Let's move to held and mark auction finished.
-            # The system will process "Finished" auctions to transfer money to seller.
-            wallet.held_balance += price
-            wallet.save()
-
-            WalletTransaction.objects.create(
-                wallet=wallet,
-                transaction_type=WalletTransaction.Type.PAYMENT,  # Or BID_HOLD then PAYMENT?
-                amount=price,
-                reference_id=str(auction.id),
-            )
+        try:
+            with transaction.atomic():
+                # One guarded UPDATE finishes the auction (bidders queue on its row lock only for this transaction),
+                # then the refund, payment and payout are applied set-based.
+                result = buy_now(id, user.id)
+                if result is not None:
+                    transaction.on_commit(lambda: self.announce(id, user, result))
+        except InsufficientFunds:
+            return Response({"error": "Insufficient funds."}, status=status.HTTP_400_BAD_REQUEST)
 
-            # 4. Update Auction
-            auction.winner = user
-            auction.current_price = price
-            auction.status = AuctionListing.Status.FINISHED
-            auction.end_time = timezone.now()  # End immediately
-            auction.save()
+        if result is None:
+            return self.refusal(id, user)
 
-            # TODO: Create delivery order etc.
+        # TODO: Create delivery order etc.
 
         return Response({"status": "Item purchased successfully."}, status=status.HTTP_200_OK)
+
+    def announce(self, id, user, result):
+        # Bidding is closed: tell connected clients at once, and email the winner.
+        publish_auction_finished(id, user, result.price, result.finished_at)
+        notify_winners_task.delay([str(id)])
+
+    def refusal(self, id, user):
+        """
+        Explain why the guarded transition matched nothing (one plain read, off the hot path).
+        """
+
+        auction = generics.get_object_or_404(AuctionListing.objects.select_related("product"), id=id)
+
+        if not auction.buy_now_price:
+            error = "Buy Now not available."
+        elif user.id == auction.product.owner_id:
+            error = "You cannot buy your own item."
+        elif auction.status != AuctionListing.Status.ACTIVE:
+            error = "Auction is not active."
+        else:
+            error = "Auction has ended."
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,62 @@
+"""
+Blocking work of async views, on one bounded thread pool per process.
+
+Served over ASGI, an async view waits for the network (Stripe) on the event loop without holding a thread. What
+still blocks (the ORM, serializers reading lazy relations, cache calls) is handed to `run_sync`, which runs it on
+`ASYNC_THREAD_POOL_SIZE` threads: a request waiting on the database holds one of them, and the number of database
+connections the process uses is bounded by the pool (each thread keeps one, or borrows one from DB_POOL).
+Each call is a request of its own to the database layer: stale connections are closed around it (as Django does
+around a request), and its queries are timed for the current request (common.timing).
+
+With ASYNC_THREAD_POOL_SIZE 0 the work runs thread-sensitively instead, Django's default: on the calling thread
+when there is one (WSGI, the test client), so tests see the data of their transaction.
+"""
+
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from common import timing
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.ASYNC_THREAD_POOL_SIZE, thread_name_prefix="sync-pool")
+        return _executor
+
+
+def run_sync(func):
+    """
+    `func` as a coroutine function running on the pool (see module docstring).
+    """
+
+    if not settings.ASYNC_THREAD_POOL_SIZE:
+        return sync_to_async(measured(func), thread_sensitive=True)
+
+    @functools.wraps(func)
+    def in_pool(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(measured(in_pool), thread_sensitive=False, executor=get_executor())
+
+
+def measured(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with timing.measure_thread():
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,73 @@
+import functools
+import logging
+import random
+import time
+
+from django.db import OperationalError, connection, connections
+
+logger = logging.getLogger(__name__)
+
+# serialization_failure, deadlock_detected: the transaction lost a race and is safe to run again.
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+
+def sqlstate(exc: Exception) -> str | None:
+    """
+    SQLSTATE of the driver error behind a Django database error (psycopg2 `pgcode`, psycopg 3 `sqlstate`).
+    """
+
+    cause = exc.__cause__
+    return getattr(cause, "pgcode", None) or getattr(cause, "sqlstate", None)
+
+
+def retry_on_conflict(attempts: int = 3, base_delay: float = 0.02):
+    """
+    Re-run the decorated function when its transaction fails with a serialization failure or deadlock,
+    sleeping with exponential backoff and full jitter between attempts.
+
+    Decorate the function that owns the whole `transaction.atomic()` block: inside an outer transaction
+    the failure has already aborted it, so the error is re-raised instead.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if attempt == attempts or connection.in_atomic_block or sqlstate(exc) not in RETRYABLE_SQLSTATES:
+                        raise
+                    logger.warning(f"{func.__qualname__} hit {sqlstate(exc)}, retrying ({attempt}/{attempts}).")
+                    time.sleep(random.uniform(0, base_delay * 2**attempt))
+
+        return wrapper
+
+    return decorator
+
+
+SERVER_CONNECTIONS_SQL = """
+    SELECT current_setting('max_connections')::int, count(*) FILTER (WHERE datname = current_database()), count(*)
+    FROM pg_stat_activity WHERE backend_type = 'client backend'
+"""
+
+
+def connection_stats(alias: str) -> dict:
+    """
+    Connection usage of this process for database `alias` (pool counters from psycopg_pool, if pooled),
+    next to the server's `max_connections` and how many client connections it holds right now.
+    """
+
+    wrapper = connections[alias]
+    pool = getattr(wrapper, "pool", None)  # PostgreSQL backend only
+    stats: dict = {"pooled": pool is not None}
+    if pool is not None:
+        stats["pool"] = pool.get_stats()
+    else:
+        stats["conn_max_age"] = wrapper.settings_dict["CONN_MAX_AGE"]
+
+    with wrapper.cursor() as cursor:
+        cursor.execute(SERVER_CONNECTIONS_SQL)
+        max_connections, database, total = cursor.fetchone()
+    stats["server"] = {"max_connections": max_connections, "database_connections": database, "connections": total}
+    return stats
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from auctions.models import AuctionListing, BidTransaction
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from payments.models import WalletCheckpoint, WalletTransaction
+
+from common.partitioning import archive_partition, ensure_partitions, is_partitioned, list_partitions
+
+Status = AuctionListing.Status
+
+# Per partitioned table: SQL telling whether a partition still holds rows that must stay live.
+# Bids stay while any of their auctions is open, or ended/settled within the archive age.
+# SYNC: Matches the auctions rebuild_bid_stats skips (auctions/management/commands/rebuild_bid_stats.py)
+BIDS_IN_USE = f"""
+    SELECT EXISTS (
+        SELECT 1 FROM "{{partition}}" b JOIN "{AuctionListing._meta.db_table}" a ON a.id = b.auction_id
+        WHERE a.status IN ('{Status.DRAFT}', '{Status.ACTIVE}')
+           OR a.end_time > %(cutoff)s
+           OR (a.status = '{Status.FINISHED}' AND (a.settled_at IS NULL OR a.settled_at > %(cutoff)s))
+    )
+"""
+# Ledger rows stay until each of their wallets has a checkpoint at or after its last row in the partition,
+# carrying its balances forward. Wallets idle since then are not re-checkpointed: their latest checkpoint covers them.
+LEDGER_IN_USE = f"""
+    SELECT EXISTS (
+        SELECT 1 FROM (SELECT wallet_id, max(created_at) AS last_at FROM "{{partition}}" GROUP BY wallet_id) w
+        WHERE NOT EXISTS (
+            SELECT 1 FROM "{WalletCheckpoint._meta.db_table}" c
+            WHERE c.wallet_id = w.wallet_id AND c.as_of >= w.last_at
+        )
+    )
+"""
+
+PARTITIONED_TABLES = {
+    BidTransaction._meta.db_table: BIDS_IN_USE,
+    WalletTransaction._meta.db_table: LEDGER_IN_USE,
+}
+
+
+class Command(BaseCommand):
+    help = "Creates the upcoming monthly partitions of the bid and ledger tables, optionally archiving old ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+        parser.add_argument("--archive", action="store_true", help="Detach partitions older than the archive age")
+        parser.add_argument("--archive-after-days", type=int, default=settings.PARTITION_ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--schema", default=settings.PARTITION_ARCHIVE_SCHEMA, help="Schema for archived data")
+        parser.add_argument("--dry-run", action="store_true", help="Report archivable partitions without detaching")
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+
+        for table, in_use_sql in PARTITIONED_TABLES.items():
+            if not is_partitioned(connection, table):
+                self.stderr.write(self.style.WARNING(f"{table} is not partitioned, skipped."))
+                continue
+
+            created = ensure_partitions(connection, table, today, options["months_ahead"] + 1)
+            self.stdout.write(f"{table}: {len(created)} partitions created.")
+
+            if options["archive"]:
+                self.archive(table, in_use_sql, options)
+
+    def archive(self, table, in_use_sql, options):
+        cutoff = timezone.now() - timedelta(days=options["archive_after_days"])
+
+        for name, _, upper in list_partitions(connection, table):
+            if upper > cutoff:
+                break  # Oldest first: every later partition is younger still.
+
+            with connection.cursor() as cursor:
+                cursor.execute(in_use_sql.format(partition=name), {"cutoff": cutoff})
+                if cursor.fetchone()[0]:
+                    self.stdout.write(f"{name}: still in use, kept.")
+                    continue
+
+            if options["dry_run"]:
+                self.stdout.write(f"{name}: would be archived.")
+            else:
+                archive_partition(connection, table, name, options["schema"])
+                self.stdout.write(self.style.SUCCESS(f"{name}: archived into {options['schema']}."))
@@ -0,0 +1,154 @@
+import logging
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from common import routers, timing
+from common.concurrency import run_sync
+
+logger = logging.getLogger("common.timing")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Scope the replica router to the request, and pin the user to the primary after a successful unsafe request.
+    Goes after AuthenticationMiddleware; JWT-authenticated users are identified by the authentication class.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = routers.begin_request(request.method)
+        try:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:  # Session (admin) users
+                routers.route_user(user.pk)
+
+            response = self.get_response(request)
+
+            user_id = self.pinned_user_id(request, response)
+            if user_id is not None:
+                routers.pin_to_primary(user_id)
+            return response
+        finally:
+            routers.end_request(token)
+
+    async def __acall__(self, request):
+        token = routers.begin_request(request.method)
+        try:
+            user = await request.auser() if hasattr(request, "auser") else None
+            if user is not None and user.is_authenticated:
+                await run_sync(routers.route_user)(user.pk)
+
+            response = await self.get_response(request)
+
+            user_id = self.pinned_user_id(request, response)
+            if user_id is not None:
+                await run_sync(routers.pin_to_primary)(user_id)
+            return response
+        finally:
+            routers.end_request(token)
+
+    def pinned_user_id(self, request, response):
+        """
+        The user to pin to the primary after this response, if any.
+        """
+
+        user_id = routers.routed_user_id()
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in routers.SAFE_METHODS
+            and response.status_code < 400
+            and user_id is not None
+        ):
+            return user_id
+        return None
+
+
+class RequestTimingMiddleware:
+    """
+    Measure each request (queries, DB time, serializer time, cache hits/misses; see common.timing),
+    answer with a `Server-Timing` header and log one structured line. Goes first, so `total` covers the stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        timing.instrument_serializers()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timings, token = timing.begin_request()
+        try:
+            with timing.measure_thread():
+                response = self.get_response(request)
+        finally:
+            timing.end_request(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        # The event loop runs no queries: work handed to the sync pool is measured there (common.concurrency),
+        # a sync view on the thread Django runs it on (see process_view).
+        timings, token = timing.begin_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            measuring = getattr(request, "_timing_measuring", None)
+            if measuring is not None:
+                await sync_to_async(measuring.close, thread_sensitive=True)()
+            timing.end_request(token)
+        return self.finish(request, response, timings)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Under ASGI, Django runs a sync view (and this hook) on the request's thread-sensitive thread:
+        measure that thread until the response is back in `__acall__`.
+        """
+
+        if iscoroutinefunction(self) and not iscoroutinefunction(view_func):
+            request._timing_measuring = ExitStack()
+            request._timing_measuring.enter_context(timing.measure_thread())
+        return None
+
+    def finish(self, request, response, timings):
+        total_ms = timings.elapsed_ms
+        if settings.REQUEST_TIMING_HEADER:
+            response["Server-Timing"] = timing.server_timing(timings, total_ms)
+        self.log(request, response, timings, total_ms)
+        return response
+
+    def log(self, request, response, timings, total_ms):
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 2),
+            "queries": timings.queries,
+            "db_ms": round(timings.db_ms, 2),
+            "serializer_ms": round(timings.serializer_ms, 2),
+            "cache_hits": timings.cache_hits,
+            "cache_misses": timings.cache_misses,
+        }
+        message = f"{request.method} {request.path} {response.status_code} {total_ms:.1f}ms"
+        if timings.samples:
+            fields["profile"] = dict(timings.samples.most_common(timing.PROFILE_TOP_STACKS))
+            fields["profile_samples"] = sum(timings.samples.values())
+            logger.warning(f"Slow request: {message}", extra=fields)
+        else:
+            logger.info(message, extra=fields)
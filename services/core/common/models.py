@@ -25,3 +25,22 @@ class TimestampMixin(models.Model):
 
     class Meta:
         abstract = True
+
+
+class VersionMixin(models.Model):
+    """
+    Mixin for a row version counter, bumped on every save (cheap change detection for ETags)
+    Bulk `.update()` calls must bump it themselves with `version=F("version") + 1`.
+    """
+
+    version: models.PositiveBigIntegerField = models.PositiveBigIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.version += 1
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
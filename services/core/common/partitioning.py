@@ -0,0 +1,180 @@
+"""
+Monthly range partitioning (on `created_at`) for the append-only log tables.
+
+Partitions are named `<table>_pYYYYMM` and cover [first of month, first of next month) in UTC. A `<table>_default`
+partition catches rows outside the created range, so a late `ensure_partitions` run never fails an insert.
+Postgres requires the partition key in every unique index, so the primary key of a partitioned table is
+`(id, created_at)`; the UUID4 ids stay unique in practice, Django keeps treating `id` as the primary key.
+"""
+
+import logging
+import re
+from datetime import UTC, date, datetime
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def month_start(day: date, offset: int = 0) -> datetime:
+    """
+    Midnight UTC on the first of the month `offset` months after the month of `day`.
+    """
+
+    months = day.year * 12 + day.month - 1 + offset
+    return datetime(months // 12, months % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y%m}"
+
+
+def is_partitioned(connection, table: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def list_partitions(connection, table: str) -> list[tuple[str, datetime, datetime]]:
+    """
+    `(name, lower, upper)` of the monthly partitions attached to `table`, oldest first (the default is left out).
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            lower = datetime(int(match[1]), int(match[2]), 1, tzinfo=UTC)
+            partitions.append((name, lower, month_start(lower, 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_partitions(connection, table: str, start: date, months: int) -> list[str]:
+    """
+    Create the monthly partitions of `table` for `months` months from the month of `start`, skipping existing ones.
+    Rows that already landed in the default partition for a new month are moved into it.
+    """
+
+    existing = {name for name, _, _ in list_partitions(connection, table)}
+    default = f"{table}_default"
+    created = []
+
+    for offset in range(months):
+        lower, upper = month_start(start, offset), month_start(start, offset + 1)
+        name = partition_name(table, lower)
+        if name in existing:
+            continue
+
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM "{default}" WHERE created_at >= %s AND created_at < %s)', [lower, upper]
+            )
+            stray = cursor.fetchone()[0]
+            if stray:
+                # A new partition can't be attached while the default holds rows in its range.
+                cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"')
+            cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)', [lower, upper])
+            if stray:
+                cursor.execute(
+                    f'WITH moved AS (DELETE FROM "{default}" WHERE created_at >= %s AND created_at < %s RETURNING *) '
+                    f'INSERT INTO "{name}" SELECT * FROM moved',
+                    [lower, upper],
+                )
+                cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT')
+        created.append(name)
+
+    if created:
+        logger.info(f"Created partitions {', '.join(created)}.")
+
+    return created
+
+
+def partition_by_month(connection, table: str, months_ahead: int = 3) -> bool:
+    """
+    Rebuild a plain `table` as a table partitioned by month on `created_at`, keeping its rows, index names,
+    check and foreign key constraints. Returns False if it already is partitioned.
+
+    Copies every row under an ACCESS EXCLUSIVE lock, so it belongs in a migration run during a maintenance window.
+    """
+
+    if is_partitioned(connection, table):
+        return False
+
+    legacy = f"{table}_unpartitioned"
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = to_regclass(%s) AND NOT x.indisprimary
+            """,
+            [table],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = to_regclass(%s) AND contype = 'f'
+            """,
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'p'", [table])
+        primary_key = cursor.fetchone()[0]
+        cursor.execute(f'SELECT min(created_at) FROM "{table}"')
+        oldest = cursor.fetchone()[0] or datetime.now(UTC)
+
+        # Free the index and constraint names for the new table, then move the old one aside.
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+        for name, _ in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT "{name}"')
+        cursor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT "{primary_key}"')
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            "PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+        now = datetime.now(UTC)
+        months = (now.year - oldest.year) * 12 + now.month - oldest.month + 1
+        ensure_partitions(connection, table, oldest, months + months_ahead)
+
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{primary_key}" PRIMARY KEY (id, created_at)')
+        for _, definition in indexes:
+            cursor.execute(definition)  # Still "ON <table>": the definitions were read before the rename.
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+        cursor.execute(f'DROP TABLE "{legacy}"')
+
+    logger.info(f"Partitioned {table} by month.")
+
+    return True
+
+
+def archive_partition(connection, table: str, name: str, schema: str) -> None:
+    """
+    Detach partition `name` from `table` and move it into `schema`. The rows stay queryable there
+    (and can be dumped or moved to cheaper storage), but no longer weigh on the live table or its indexes.
+    """
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+        cursor.execute(f'ALTER TABLE "{name}" SET SCHEMA "{schema}"')
+
+    logger.info(f"Archived partition {name} into schema {schema}.")
@@ -0,0 +1,46 @@
+"""
+JSON rendering and parsing on orjson, byte-for-byte compatible with DRF's JSONRenderer / JSONParser.
+
+orjson encodes the types DRF's serializers produce (str, int, float, bool, None, dict, list and subclasses
+such as ReturnDict, UUID) in C. Anything else goes through DRF's own encoder, datetimes included, so they keep
+DRF's "Z" suffix for UTC. Pretty-printing (`; indent=N`, the browsable API) falls back to DRF's renderer.
+"""
+
+import orjson
+from django.utils.http import parse_header_parameters
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import encoders
+
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_encoder = encoders.JSONEncoder()
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        # As DRF does: escape U+2028 and U+2029 so the output stays a strict JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        _, params = parse_header_parameters(media_type or "")
+        if params.get("charset", "utf-8").lower() not in ("utf-8", "utf8"):  # orjson reads UTF-8 only
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
@@ -0,0 +1,135 @@
+"""
+Read-replica routing for request traffic.
+
+Reads made while serving a safe request (GET, HEAD, OPTIONS) go to a replica, everything else to the primary:
+writes, reads inside unsafe requests (they read to decide what to write), and anything outside a request
+(Celery tasks, management commands). A user who just made a successful unsafe request is pinned to the primary
+for `DATABASE_REPLICA_PIN_SECONDS` so they read their own writes (their new balance, their bid) even if a replica
+lags; pins live in the cache, which replicas require to be shared (CACHE_URL). Replicas lagging more than
+`DATABASE_REPLICA_MAX_LAG_SECONDS`, or unreachable, are skipped until rechecked.
+"""
+
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# 0 while the replica has replayed everything it received (an idle replica's replay timestamp only gets older),
+# else the age of the last replayed transaction. NULL on a server that isn't in recovery, i.e. no lag.
+REPLICA_LAG_SQL = """
+    SELECT COALESCE(CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END, 0)
+"""
+
+
+@dataclass
+class RoutingState:
+    use_replica: bool
+    user_id: str | None = None
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("db_routing_state", default=None)
+
+# alias -> (checked at (monotonic), usable), per process
+_replica_health: dict[str, tuple[float, bool]] = {}
+
+
+def pin_key(user_id) -> str:
+    return f"db:pin:{user_id}"
+
+
+def begin_request(method: str):
+    return _state.set(RoutingState(use_replica=method in SAFE_METHODS))
+
+
+def end_request(token) -> None:
+    _state.reset(token)
+
+
+def routed_user_id() -> str | None:
+    state = _state.get()
+    return state.user_id if state is not None else None
+
+
+def route_user(user_id) -> None:
+    """
+    Tell the router who the request is for, as soon as it is known (before the user row is read):
+    a user inside their pin window reads from the primary.
+    """
+
+    state = _state.get()
+    if state is None:
+        return
+    state.user_id = str(user_id)
+    if state.use_replica and settings.DATABASE_REPLICAS and cache.get(pin_key(state.user_id)):
+        state.use_replica = False
+
+
+def pin_to_primary(user_id) -> None:
+    cache.set(pin_key(user_id), 1, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def replica_lag(alias: str) -> float:
+    with connections[alias].cursor() as cursor:
+        cursor.execute(REPLICA_LAG_SQL)
+        return float(cursor.fetchone()[0])
+
+
+def is_usable(alias: str) -> bool:
+    """
+    Whether the replica is reachable and close enough behind the primary, rechecked every
+    `DATABASE_REPLICA_CHECK_SECONDS` so a lagging replica is dropped (and taken back) within seconds.
+    """
+
+    now = time.monotonic()
+    checked_at, usable = _replica_health.get(alias, (None, False))
+    if checked_at is not None and now - checked_at < settings.DATABASE_REPLICA_CHECK_SECONDS:
+        return usable
+
+    try:
+        lag = replica_lag(alias)
+    except DatabaseError as exc:
+        logger.warning(f"Replica {alias} is unreachable, reading from the primary: {exc}")
+        usable = False
+    else:
+        usable = lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+        if not usable:
+            logger.warning(f"Replica {alias} lags {lag:.1f}s behind, reading from the primary.")
+
+    _replica_health[alias] = (now, usable)
+    return usable
+
+
+class ReplicaRouter:
+    """
+    Database router sending the reads of safe requests to a healthy replica (see module docstring).
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica:
+            return DEFAULT_DB_ALIAS
+
+        replicas = [alias for alias in settings.DATABASE_REPLICAS if is_usable(alias)]
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows, so objects read from any of them may be related.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
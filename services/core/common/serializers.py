@@ -0,0 +1,63 @@
+"""
+Read-only serializers building their output from `.values()` rows, for hot list endpoints.
+
+A ModelSerializer instantiates a model per row and runs every field's `get_attribute` / `to_representation`,
+nested serializers included. A `RowSerializer` selects its `columns` with `.values()` and maps each row dict
+to the output in one plain function. Each one mirrors a ModelSerializer and must produce the same output:
+tests compare the two on the same rows.
+"""
+
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import serializers
+
+
+def decimal_string(value) -> str | None:
+    """
+    A DecimalField's output; numeric columns come back at their scale, so there is nothing to quantize.
+    """
+
+    return None if value is None else f"{value:f}"
+
+
+def datetime_string(value) -> str | None:
+    """
+    A DateTimeField's output: ISO 8601 in the current time zone, "Z" for UTC.
+    """
+
+    if value is None:
+        return None
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+
+def file_url(storage, name, request) -> str | None:
+    """
+    A FileField's output (with UPLOADED_FILES_USE_URL): the file's URL, absolute if there is a request.
+    """
+
+    if not name:
+        return None
+    url = storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+class RowListSerializer(serializers.ListSerializer):
+    child: "RowSerializer"
+
+    def to_representation(self, data):
+        if isinstance(data, QuerySet):
+            data = data.values(*self.child.columns)
+        return [self.child.to_representation(row) for row in data]
+
+
+class RowSerializer(serializers.BaseSerializer):
+    """
+    Subclasses list the `.values()` `columns` they read and implement `to_representation(row)`.
+    Read only: `many=True` is the intended use, on a queryset the serializer narrows itself.
+    """
+
+    columns: tuple[str, ...] = ()
+
+    class Meta:
+        list_serializer_class = RowListSerializer
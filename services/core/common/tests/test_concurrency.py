@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from auctions.tests.factories import AuctionListingFactory
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.serializers import MyTokenObtainPairSerializer
+from users.tests.factories import UserFactory
+
+from common import concurrency, timing
+
+
+@pytest.fixture
+def sync_pool(settings):
+    settings.ASYNC_THREAD_POOL_SIZE = 2
+    concurrency._executor = None
+    yield
+    concurrency.get_executor().shutdown()
+    concurrency._executor = None
+
+
+class TestRunSync:
+    def test_runs_on_the_bounded_pool_with_the_callers_context(self, sync_pool):
+        running = []
+        peak = []
+
+        def work():
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.05)
+            running.pop()
+            return threading.current_thread().name, timing._current.get()
+
+        async def serve():
+            timings, token = timing.begin_request()
+            try:
+                return timings, await asyncio.gather(*(concurrency.run_sync(work)() for _ in range(6)))
+            finally:
+                timing.end_request(token)
+
+        timings, results = asyncio.run(serve())
+
+        assert max(peak) == 2
+        assert all(name.startswith("sync-pool") for name, _ in results)
+        assert all(seen is timings for _, seen in results)
+
+    def test_without_a_pool_runs_on_the_calling_thread(self):
+        async def serve():
+            return await concurrency.run_sync(threading.get_ident)()
+
+        assert async_to_sync(serve)() == threading.get_ident()
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    """The async views served through Django's async request path (as under ASGI), against their sync output."""
+
+    def test_auction_list(self):
+        AuctionListingFactory.create_batch(3)
+        url = reverse("auction_list")
+
+        response = async_to_sync(AsyncClient().get)(url)
+
+        assert response.status_code == 200
+        assert response.json() == APIClient().get(url).json()
+        assert 'desc="1 queries"' in response["Server-Timing"]
+
+    def test_wallet_is_authenticated(self):
+        user = UserFactory()
+        token = MyTokenObtainPairSerializer.get_token(user).access_token
+        url = reverse("wallet-detail")
+
+        anonymous = async_to_sync(AsyncClient().get)(url)
+        response = async_to_sync(AsyncClient().get)(url, headers={"Authorization": f"Bearer {token}"})
+
+        assert anonymous.status_code == 401
+        assert response.status_code == 200
+        assert response.json()["balance"] == "0.00"
+
+    def test_sync_view_queries_are_measured(self):
+        user = UserFactory()
+        AuctionListingFactory()
+        token = MyTokenObtainPairSerializer.get_token(user).access_token
+
+        response = async_to_sync(AsyncClient().get)(reverse("user_bids"), headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert 'desc="1 queries"' in response["Server-Timing"]
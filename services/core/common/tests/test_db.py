@@ -0,0 +1,92 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from django.db import OperationalError, connections
+from django.urls import reverse
+from rest_framework import status
+from users.tests.factories import UserFactory
+
+from common.db import connection_stats, retry_on_conflict
+
+
+class DriverError(Exception):
+    def __init__(self, pgcode):
+        self.pgcode = pgcode
+
+
+def db_error(pgcode):
+    exc = OperationalError("boom")
+    exc.__cause__ = DriverError(pgcode)
+    return exc
+
+
+@patch("common.db.time.sleep")
+class TestRetryOnConflict:
+    def test_retries_deadlocks_and_serialization_failures(self, sleep):
+        """Test that 40P01/40001 are retried with a backoff sleep until the call succeeds."""
+        calls = Mock(side_effect=[db_error("40P01"), db_error("40001"), "ok"])
+
+        @retry_on_conflict(attempts=3)
+        def place_bid():
+            return calls()
+
+        assert place_bid() == "ok"
+        assert calls.call_count == 3
+        assert sleep.call_count == 2
+
+    def test_gives_up_after_attempts(self, sleep):
+        """Test that the last failure is raised once the attempts are used up."""
+        calls = Mock(side_effect=db_error("40P01"))
+
+        @retry_on_conflict(attempts=2)
+        def place_bid():
+            return calls()
+
+        with pytest.raises(OperationalError):
+            place_bid()
+        assert calls.call_count == 2
+
+    def test_other_errors_are_not_retried(self, sleep):
+        """Test that unrelated database errors propagate immediately."""
+        calls = Mock(side_effect=db_error("57014"))
+
+        @retry_on_conflict()
+        def place_bid():
+            return calls()
+
+        with pytest.raises(OperationalError):
+            place_bid()
+        assert calls.call_count == 1
+        sleep.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestConnectionStats:
+    def test_server_connections(self):
+        stats = connection_stats("default")
+
+        assert stats["pooled"] is (getattr(connections["default"], "pool", None) is not None)
+        assert stats["server"]["max_connections"] > 0
+        assert stats["server"]["database_connections"] >= 1  # This one
+
+    def test_pool_counters(self):
+        pool = Mock(get_stats=Mock(return_value={"pool_size": 4, "pool_available": 3, "requests_waiting": 0}))
+        wrapper = Mock(pool=pool, cursor=connections["default"].cursor)
+
+        with patch("common.db.connections") as handler:
+            handler.__getitem__ = Mock(return_value=wrapper)
+            stats = connection_stats("default")
+
+        assert stats["pooled"] is True
+        assert stats["pool"]["pool_size"] == 4
+        assert "conn_max_age" not in stats
+
+    def test_endpoint_is_admin_only(self, api_client):
+        url = reverse("db_connections")
+        api_client.force_authenticate(user=UserFactory())
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        api_client.force_authenticate(user=UserFactory(is_staff=True))
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["default"]["server"]["max_connections"] > 0
@@ -0,0 +1,63 @@
+import io
+import uuid
+from datetime import UTC, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import Serializer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from common.renderers import ORJSONParser, ORJSONRenderer
+
+DATA = ReturnDict(
+    {
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "price": "12.50",
+        "raw_price": Decimal("12.50"),
+        "created_at": datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC),
+        "local_time": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=7))),
+        "label": gettext_lazy("Electronics"),
+        "text": "ไทย \u2028 line \u2029",
+        "counts": {1: 2},
+        "items": [None, True, 1.5, ("a", "b")],
+    },
+    serializer=Serializer(),
+)
+
+
+class TestORJSONRenderer:
+    def test_renders_what_drf_renders(self):
+        assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_pretty_printing_falls_back_to_drf(self):
+        rendered = ORJSONRenderer().render(DATA, "application/json; indent=4")
+
+        assert rendered == JSONRenderer().render(DATA, "application/json; indent=4")
+        assert b'\n    "id"' in rendered
+
+    def test_no_data_renders_empty(self):
+        assert ORJSONRenderer().render(None) == b""
+
+
+class TestORJSONParser:
+    def test_parses_what_drf_parses(self):
+        body = '{"amount": "12.50", "n": 1.5, "tags": ["ไทย"], "ok": null}'.encode()
+
+        parsed = ORJSONParser().parse(io.BytesIO(body), "application/json")
+
+        assert parsed == JSONParser().parse(io.BytesIO(body), "application/json")
+
+    def test_other_charsets_fall_back_to_drf(self):
+        body = '{"title": "ไทย"}'.encode("utf-16")
+
+        assert ORJSONParser().parse(io.BytesIO(body), "application/json; charset=utf-16", {"encoding": "utf-16"}) == {
+            "title": "ไทย"
+        }
+
+    def test_invalid_json_is_a_parse_error(self):
+        with pytest.raises(ParseError, match="JSON parse error"):
+            ORJSONParser().parse(io.BytesIO(b'{"amount": '), "application/json")
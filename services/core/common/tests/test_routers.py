@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory
+from payments.models import Wallet
+
+from common import routers
+from common.middleware import ReplicaRoutingMiddleware
+
+router = routers.ReplicaRouter()
+replica_lag = routers.replica_lag  # Unpatched
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    routers._replica_health.clear()
+    cache.clear()
+    with patch("common.routers.replica_lag", return_value=0.0) as lag:
+        yield lag
+
+
+def serve(method, user_id=None, status=200):
+    """
+    Run a request through the middleware; the view reports where a read would go.
+    """
+
+    def view(request):
+        if user_id is not None:
+            routers.route_user(user_id)  # What the JWT authentication does
+        return HttpResponse(router.db_for_read(Wallet), status=status)
+
+    request = getattr(RequestFactory(), method.lower())("/")
+    return ReplicaRoutingMiddleware(view)(request).content.decode()
+
+
+class TestReplicaRouter:
+    def test_safe_requests_read_from_replica(self):
+        assert serve("GET") == "replica_1"
+        assert serve("GET", user_id="u1") == "replica_1"
+
+    def test_unsafe_requests_and_background_work_use_primary(self):
+        assert serve("POST", user_id="u1") == "default"
+        assert router.db_for_read(Wallet) == "default"  # No request: Celery task, management command
+        assert router.db_for_write(Wallet) == "default"
+
+    def test_writer_is_pinned_to_primary(self):
+        """Test that a user reads from the primary for a while after a successful write, other users don't."""
+        serve("POST", user_id="u1")
+
+        assert serve("GET", user_id="u1") == "default"
+        assert serve("GET", user_id="u2") == "replica_1"
+
+        cache.delete(routers.pin_key("u1"))  # Pin window over
+        assert serve("GET", user_id="u1") == "replica_1"
+
+    def test_failed_write_does_not_pin(self):
+        serve("POST", user_id="u1", status=400)
+
+        assert serve("GET", user_id="u1") == "replica_1"
+
+    def test_lagging_replica_is_skipped(self, replicas, settings):
+        replicas.return_value = settings.DATABASE_REPLICA_MAX_LAG_SECONDS + 1
+
+        assert serve("GET") == "default"
+        assert serve("GET") == "default"
+        assert replicas.call_count == 1  # Lag is rechecked only every DATABASE_REPLICA_CHECK_SECONDS
+
+    def test_unreachable_replica_is_skipped(self, replicas):
+        replicas.side_effect = OperationalError("connection refused")
+
+        assert serve("GET") == "default"
+
+
+@pytest.mark.django_db
+def test_replica_lag_query():
+    """Test the lag query against a server that isn't replicating (the test primary): no lag."""
+    assert replica_lag("default") == 0
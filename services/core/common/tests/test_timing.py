@@ -0,0 +1,77 @@
+import logging
+import time
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework import serializers
+from users.models import User
+
+from common.middleware import RequestTimingMiddleware
+
+
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ["id", "username"]
+
+
+def serve(view):
+    return RequestTimingMiddleware(view)(RequestFactory().get("/things/"))
+
+
+def timing_record(caplog):
+    return next(record for record in caplog.records if record.name == "common.timing")
+
+
+@pytest.mark.django_db
+class TestRequestTimingMiddleware:
+    def test_records_queries_serializers_and_cache(self, caplog):
+        cache.set("present", 1)
+
+        def view(request):
+            users = list(User.objects.all())
+            User.objects.count()
+            assert len(UserSerializer(users, many=True).data) == len(users)
+            cache.get("present")
+            cache.get("absent")
+            cache.get_many(["present", "absent"])
+            return HttpResponse("ok")
+
+        with caplog.at_level(logging.INFO, logger="common.timing"):
+            response = serve(view)
+
+        header = response["Server-Timing"]
+        assert 'desc="2 queries"' in header
+        assert 'cache;desc="2 hits, 2 misses"' in header
+        assert "serializer;dur=" in header and "total;dur=" in header
+
+        record = timing_record(caplog)
+        assert record.levelno == logging.INFO
+        assert (record.method, record.path, record.status) == ("GET", "/things/", 200)
+        assert record.queries == 2 and record.cache_hits == 2 and record.cache_misses == 2
+        assert record.db_ms >= 0 and record.serializer_ms > 0
+
+    def test_header_can_be_turned_off(self, settings):
+        settings.REQUEST_TIMING_HEADER = False
+
+        assert not serve(lambda request: HttpResponse("ok")).has_header("Server-Timing")
+
+    def test_outliers_are_profiled(self, settings, caplog):
+        settings.REQUEST_PROFILE_THRESHOLD_MS = 20
+        settings.REQUEST_PROFILE_INTERVAL_MS = 2
+
+        def slow_view(request):
+            time.sleep(0.15)
+            return HttpResponse("ok")
+
+        with caplog.at_level(logging.INFO, logger="common.timing"):
+            serve(lambda request: HttpResponse("ok"))
+            serve(slow_view)
+
+        fast, slow = [record for record in caplog.records if record.name == "common.timing"]
+        assert not hasattr(fast, "profile")
+        assert slow.levelno == logging.WARNING
+        assert slow.profile_samples > 0
+        assert any("slow_view" in stack for stack in slow.profile)
@@ -0,0 +1,29 @@
+from rest_framework import permissions, views
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from common.views import ConditionalGetMixin
+
+
+class HelloAPIView(views.APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return Response({"hello": "world"})
+
+
+class PlainHelloAPIView(ConditionalGetMixin, HelloAPIView):
+    pass
+
+
+class TestConditionalGetMixin:
+    def test_without_validators_responds_plainly(self):
+        """Test that a view without validators is served as is, without ETag / Last-Modified."""
+        request = APIRequestFactory().get("/", HTTP_IF_NONE_MATCH='"anything"')
+
+        response = PlainHelloAPIView.as_view()(request)
+
+        assert response.status_code == 200
+        assert response.data == {"hello": "world"}
+        assert "ETag" not in response
+        assert "Last-Modified" not in response
@@ -0,0 +1,261 @@
+"""
+Per-request timing: where a request spends its time, cheap enough to leave on in production.
+
+`RequestTimingMiddleware` opens a `RequestTimings` for each request. While it is open it collects:
+- queries and their total time, from a `connection.execute_wrapper` on every database alias;
+- serializer time, from DRF's `Serializer.data` / `ListSerializer.data` (outermost call only, so nested
+  serializers aren't counted twice);
+- cache hits and misses, from the instrumented cache backends below (settings.CACHES uses them).
+
+The result goes out as a `Server-Timing` header and one structured log line per request.
+
+Requests running longer than `REQUEST_PROFILE_THRESHOLD_MS` are also profiled by sampling: one daemon thread per
+process wakes every `REQUEST_PROFILE_INTERVAL_MS` and records the Python stack of each request that is past the
+threshold (for async requests, of the pool threads working for them, see common.concurrency). Requests under the
+threshold are never sampled, so normal traffic only pays for a dict lookup, and the stacks of an outlier show where
+its excess time went.
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOP_STACKS = 5
+PROFILE_STACK_DEPTH = 12  # Innermost frames kept per sample
+
+_MISSING = object()
+
+
+@dataclass
+class RequestTimings:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_ms: float = 0.0
+    serializer_ms: float = 0.0
+    serializer_depth: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    samples: Counter = field(default_factory=Counter)  # Collapsed stack -> samples, outliers only
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+_measuring = threading.local()  # The timings a thread's queries are counted for
+
+
+def begin_request() -> tuple:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def measure_thread():
+    """
+    Count the queries this thread runs for the current request, and let the sampler profile the thread meanwhile.
+    The middleware measures the request's own thread; work handed to other threads is measured there.
+    """
+
+    timings = _current.get()
+    if timings is None or getattr(_measuring, "timings", None) is timings:  # Already measured on this thread
+        yield
+        return
+    sampler = get_sampler()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(record_query))
+        if sampler is not None:
+            sampler.watch(timings)
+            stack.callback(sampler.unwatch)
+        _measuring.timings = timings
+        stack.callback(setattr, _measuring, "timings", None)
+        yield
+
+
+def server_timing(timings: RequestTimings, total_ms: float) -> str:
+    return ", ".join(
+        [
+            f'db;dur={timings.db_ms:.1f};desc="{timings.queries} queries"',
+            f"serializer;dur={timings.serializer_ms:.1f}",
+            f'cache;desc="{timings.cache_hits} hits, {timings.cache_misses} misses"',
+            f"total;dur={total_ms:.1f}",
+        ]
+    )
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    `connection.execute_wrapper` counting the query and its time for the current request.
+    """
+
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_ms += (time.perf_counter() - started) * 1000
+
+
+def record_cache(hits: int, misses: int) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.cache_hits += hits
+        timings.cache_misses += misses
+
+
+# Serializers
+
+
+def _timed_data(fget) -> property:
+    def data(self):
+        timings = _current.get()
+        if timings is None:
+            return fget(self)
+        timings.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            timings.serializer_depth -= 1
+            if timings.serializer_depth == 0:
+                timings.serializer_ms += (time.perf_counter() - started) * 1000
+
+    data.timed = True  # type: ignore[attr-defined]
+    return property(data)
+
+
+def instrument_serializers() -> None:
+    """
+    Time DRF's `.data` properties (idempotent). Called when the middleware is set up.
+    """
+
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__["data"]
+        if not getattr(prop.fget, "timed", False):
+            cls.data = _timed_data(prop.fget)  # type: ignore[method-assign, assignment]
+
+
+# Cache backends counting hits and misses (only `get` and `get_many`, the read paths)
+
+
+class TimedCacheMixin(BaseCache):
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            record_cache(0, 1)
+            return default
+        record_cache(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        timings = _current.get()
+        if timings is None:
+            return super().get_many(keys, version=version)
+        keys = list(keys)
+        counted = (timings.cache_hits, timings.cache_misses)
+        values = super().get_many(keys, version=version)
+        # Some backends get() key by key: count the batch, not its parts
+        timings.cache_hits, timings.cache_misses = counted
+        record_cache(len(values), len(keys) - len(values))
+        return values
+
+
+class TimedRedisCache(TimedCacheMixin, RedisCache):
+    pass
+
+
+class TimedLocMemCache(TimedCacheMixin, LocMemCache):
+    pass
+
+
+# Sampling profiler for outliers
+
+
+class OutlierSampler(threading.Thread):
+    """
+    Samples the stacks of requests running past the threshold (see module docstring).
+    """
+
+    def __init__(self):
+        super().__init__(name="request-profiler", daemon=True)
+        self.requests: dict[int, RequestTimings] = {}  # Thread id -> timings of the request it serves
+        self.stopped = threading.Event()
+
+    def watch(self, timings: RequestTimings) -> None:
+        self.requests[threading.get_ident()] = timings
+
+    def unwatch(self) -> None:
+        self.requests.pop(threading.get_ident(), None)
+
+    def run(self) -> None:
+        while not self.stopped.wait(settings.REQUEST_PROFILE_INTERVAL_MS / 1000):
+            threshold = settings.REQUEST_PROFILE_THRESHOLD_MS / 1000
+            now = time.perf_counter()
+            outliers = [
+                (thread_id, timings)
+                for thread_id, timings in self.requests.copy().items()
+                if now - timings.started > threshold
+            ]
+            if not outliers:
+                continue
+            frames = sys._current_frames()
+            for thread_id, timings in outliers:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    timings.samples[collapse(frame)] += 1
+
+
+def collapse(frame) -> str:
+    """
+    The stack as "module:function:line" entries, outermost first, innermost `PROFILE_STACK_DEPTH` frames only.
+    """
+
+    entries: list[str] = []
+    while frame is not None and len(entries) < PROFILE_STACK_DEPTH:
+        code = frame.f_code
+        entries.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(entries))
+
+
+_sampler: OutlierSampler | None = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> OutlierSampler | None:
+    """
+    The process's sampler, started on first use; None when profiling is off (threshold 0).
+    """
+
+    global _sampler
+    if not settings.REQUEST_PROFILE_THRESHOLD_MS:
+        return None
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = OutlierSampler()
+            _sampler.start()
+        return _sampler
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import DatabaseConnectionsAPIView
+
+urlpatterns = [
+    path("db/connections/", DatabaseConnectionsAPIView.as_view(), name="db_connections"),
+]
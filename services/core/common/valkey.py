@@ -0,0 +1,14 @@
+import redis
+
+_clients: dict[str, redis.Redis] = {}
+
+
+def get_client(url: str) -> redis.Redis:
+    """
+    Client for the Valkey database at `url`, created on first use and shared by the process.
+    Short timeouts: callers are on the request path and decide themselves what a failure means.
+    """
+
+    if url not in _clients:
+        _clients[url] = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    return _clients[url]
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+from asgiref.sync import iscoroutinefunction
+from django.db import connections
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import permissions, views
+from rest_framework.response import Response
+
+from .concurrency import run_sync
+from .db import connection_stats
+
+
+class AsyncAPIViewMixin(views.APIView):
+    """
+    Serve a DRF view natively under ASGI: it is a coroutine, its async handlers run on the event loop, and the
+    blocking parts of DRF's request cycle (authentication, permissions, throttling, sync handlers such as OPTIONS)
+    run on the bounded sync pool (common.concurrency). Subclasses define async handlers.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        # As APIView.dispatch, awaiting what blocks
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await run_sync(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await run_sync(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncReadMixin(AsyncAPIViewMixin):
+    """
+    Async GET for a sync read view: its whole `get` (lookups, queries, serialization) is one call on the sync pool,
+    so the request holds a pool thread only while it works with the database.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await run_sync(super().get)(request, *args, **kwargs)  # type: ignore[misc]
+
+
+class ConditionalGetMixin:
+    """
+    Mixin for read views that answers `304 Not Modified` when the client's copy is still current.
+    Subclasses override `get_validators()` with a single cheap lookup (no related rows, no serialization).
+    """
+
+    def get_validators(self) -> tuple[str, datetime] | None:
+        """
+        Return `(etag, last_modified)` for the requested resource, or None to skip the conditional check.
+        By default there are no validators: plain responses, without ETag / Last-Modified.
+        """
+
+        return None
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)  # type: ignore[misc]
+
+        etag = quote_etag(validators[0])
+        last_modified = int(validators[1].timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)  # type: ignore[misc]
+
+        if 200 <= response.status_code < 400:
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class DatabaseConnectionsAPIView(views.APIView):
+    """
+    Connection pool metrics of the serving process, one entry per database, for sizing pools against
+    the server's `max_connections` (processes x pool max_size must stay well below it).
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({alias: connection_stats(alias) for alias in connections})
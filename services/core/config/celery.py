@@ -16,9 +16,22 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
 # Schedule tasks to run at regular intervals.
+# Auction start/end run as exact-time ETA tasks; this sweep only catches misses (see auctions.tasks).
 app.conf.beat_schedule = {
-    "close-auctions-every-minute": {
-        "task": "auctions.tasks.check_and_close_expired_auctions",
+    "sweep-auction-lifecycle-every-5-minutes": {
+        "task": "auctions.tasks.sweep_auction_lifecycle",
+        "schedule": crontab(minute="*/5"),
+    },
+    "settle-finished-auctions-every-minute": {
+        "task": "payments.tasks.settle_finished_auctions",
         "schedule": crontab(minute="*"),
-    }
+    },
+    "process-stripe-events-every-minute": {
+        "task": "payments.tasks.process_stripe_events",
+        "schedule": crontab(minute="*"),
+    },
+    "create-wallet-checkpoints-daily": {
+        "task": "payments.tasks.create_wallet_checkpoints",
+        "schedule": crontab(hour=0, minute=15),
+    },
 }
@@ -16,6 +16,7 @@ import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -71,7 +72,6 @@ INSTALLED_APPS = [
     # 3rd Party Apps
     "rest_framework",
     "rest_framework_simplejwt",
-    "rest_framework_simplejwt.token_blacklist",
     "django_filters",
 
     # Local Apps
@@ -82,11 +82,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'common.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'common.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -110,10 +112,22 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Served over ASGI (the image's default command), async views hand their blocking work (ORM, serialization) to a
+# bounded thread pool per process (common.concurrency); each thread holds at most one database connection, so keep
+# it at or under DB_POOL_MAX_SIZE. 0 runs that work thread-sensitively instead, Django's default.
+ASYNC_THREAD_POOL_SIZE = config('ASYNC_THREAD_POOL_SIZE', default=10, cast=int)
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Connections are reused, never opened per request: with DB_POOL each process keeps a psycopg pool (bounded by
+# DB_POOL_MAX_SIZE, connections recycled after DB_POOL_MAX_LIFETIME seconds), otherwise each thread keeps one
+# persistent connection for DB_CONN_MAX_AGE seconds. Either way a connection is checked before it is reused.
+# Behind a transaction-level pooler (PgBouncer pool_mode=transaction) set DB_TRANSACTION_POOLER: server-side cursors
+# would outlive the transaction; prepared statements are already off (Django's default with psycopg 3).
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -122,9 +136,66 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default='postgres'),
         'HOST': config('DB_HOST', default='db'),
         'PORT': config('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_TRANSACTION_POOLER', default=False, cast=bool),
+        'OPTIONS': {
+            'pool': {
+                'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+                'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+                'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+                'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+                'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),  # Wait for a free connection
+            },
+        } if DB_POOL else {},
     }
 }
 
+# Read replicas (streaming replicas of the primary): "host" or "host:port" entries, same credentials as the primary.
+# Reads of safe requests go to them through common.routers.ReplicaRouter; tests mirror them onto the primary.
+DB_REPLICA_HOSTS: list[str] = config('DB_REPLICA_HOSTS', default='', cast=Csv())  # type: ignore
+
+for index, replica in enumerate(DB_REPLICA_HOSTS, start=1):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['common.routers.ReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)  # Read-your-writes window
+DATABASE_REPLICA_MAX_LAG_SECONDS = config('DB_REPLICA_MAX_LAG_SECONDS', default=2, cast=float)
+DATABASE_REPLICA_CHECK_SECONDS = config('DB_REPLICA_CHECK_SECONDS', default=5, cast=float)
+
+
+# Cache (shared by every process through Valkey when CACHE_URL is set, else per process)
+
+CACHE_URL = config('CACHE_URL', default='')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'common.timing.TimedRedisCache',
+        'LOCATION': CACHE_URL,
+    } if CACHE_URL else {
+        'BACKEND': 'common.timing.TimedLocMemCache',
+    }
+}
+
+# Read-your-writes pins (common.routers) live in this cache: a per-process one would miss the pin whenever the
+# user's next read lands on another worker, serving them stale replica data.
+if DB_REPLICA_HOSTS and not CACHE_URL:
+    raise ImproperlyConfigured('DB_REPLICA_HOSTS requires CACHE_URL, a cache shared by every process.')
+
+# Per-request timing (common.timing): Server-Timing header, one log line per request,
+# and stack sampling of requests running longer than the threshold (0 turns the profiler off).
+REQUEST_TIMING_HEADER = config('REQUEST_TIMING_HEADER', default=True, cast=bool)
+REQUEST_PROFILE_THRESHOLD_MS = config('REQUEST_PROFILE_THRESHOLD_MS', default=1000, cast=float)
+REQUEST_PROFILE_INTERVAL_MS = config('REQUEST_PROFILE_INTERVAL_MS', default=10, cast=float)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -146,6 +217,18 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = 'users.User'
 
+AUTHENTICATION_BACKENDS = ['users.backends.PooledModelBackend']
+
+# Password hashing runs on a bounded per-process pool, see users.hashing
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=2, cast=int)
+PASSWORD_HASH_CONCURRENCY = {  # Requests admitted (hashing or queued) per endpoint and process
+    'login': config('PASSWORD_HASH_LOGIN_CONCURRENCY', default=8, cast=int),
+    'register': config('PASSWORD_HASH_REGISTER_CONCURRENCY', default=4, cast=int),
+    'change_password': config('PASSWORD_HASH_CHANGE_CONCURRENCY', default=2, cast=int),
+}
+PASSWORD_HASH_ADMIT_TIMEOUT = config('PASSWORD_HASH_ADMIT_TIMEOUT', default=2, cast=float)
+PASSWORD_REHASH_RATE = config('PASSWORD_REHASH_RATE', default=0.1, cast=float)  # Share of logins upgrading old hashes
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
@@ -240,6 +323,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+
+    # Same JSON as DRF's renderer and parser, encoded and decoded by orjson
+    'DEFAULT_RENDERER_CLASSES': (
+        'common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'common.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -261,8 +355,12 @@ SIMPLE_JWT = {
 
 
     'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.MyTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.TokenRefreshSerializer',
 }
 
+# Revoked refresh tokens (rotation, logout), one expiring key each, see users.tokens.RefreshToken
+TOKEN_BLACKLIST_URL = config('TOKEN_BLACKLIST_URL', default='redis://valkey:6379/2')
+
 
 # Cookie Auth Settings
 AUTH_COOKIE = 'access_token'
@@ -283,6 +381,36 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Slow outbound I/O (SMTP) gets its own queue/worker so it never delays auction lifecycle tasks.
+CELERY_TASK_ROUTES = {
+    'auctions.tasks.notify_winner_task': {'queue': 'notifications'},
+    'auctions.tasks.notify_winners_task': {'queue': 'notifications'},
+}
+
+
+# Realtime service's pub/sub (core publishes auction events it forwards to WebSocket clients)
+
+VALKEY_REALTIME_URL = config('VALKEY_REALTIME_URL', default='redis://valkey:6379/0')
+
+
+# Partitioning of the append-only logs (bids, wallet ledger), see `manage.py manage_partitions`
+
+PARTITION_MONTHS_AHEAD = config('PARTITION_MONTHS_AHEAD', default=3, cast=int)
+PARTITION_ARCHIVE_AFTER_DAYS = config('PARTITION_ARCHIVE_AFTER_DAYS', default=365, cast=int)
+PARTITION_ARCHIVE_SCHEMA = config('PARTITION_ARCHIVE_SCHEMA', default='archive')
+
+
+# Email Config (point EMAIL_HOST/EMAIL_PORT at a local SMTP stand-in such as mailpit in development)
+
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='no-reply@auction.local')
+
 
 # Stripe Settings
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY', default=None)
@@ -23,4 +23,5 @@ urlpatterns = [
     path("api/auth/", include("users.urls")),
     path("api/payments/", include("payments.urls")),
     path("api/auctions/", include("auctions.urls")),
+    path("api/ops/", include("common.urls")),
 ]
@@ -1,7 +1,53 @@
+from unittest.mock import patch
+
+import fakeredis
 import pytest
+from auctions.bidding import install_place_bid_function
+from auctions.models import BidTransaction
+from common.partitioning import partition_by_month
+from django.conf import settings
+from django.db import connection
+from payments.models import WalletTransaction
 from rest_framework.test import APIClient
 
 
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    # Tests build the schema from the models (--nomigrations), so apply the migrations' raw SQL work here.
+    with django_db_blocker.unblock():
+        for model in (BidTransaction, WalletTransaction):
+            partition_by_month(connection, model._meta.db_table)
+        install_place_bid_function(connection)
+
+
+@pytest.fixture(autouse=True)
+def async_views_on_test_thread(settings):
+    # Test data lives in the test's transaction, seen only on the test thread's connection (not the sync pool's).
+    settings.ASYNC_THREAD_POOL_SIZE = 0
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def token_blacklist():
+    """
+    In-memory Valkey standing in for the token blacklist (fresh per test).
+    """
+
+    client = fakeredis.FakeRedis()
+    with patch.dict("common.valkey._clients", {settings.TOKEN_BLACKLIST_URL: client}):
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def realtime_valkey():
+    """
+    In-memory Valkey standing in for the realtime service's (pub/sub, ranking indexes), fresh per test.
+    """
+
+    client = fakeredis.FakeRedis()
+    with patch.dict("common.valkey._clients", {settings.VALKEY_REALTIME_URL: client}):
+        yield client
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Wallet, WalletTransaction, WithdrawalRequest
+from .models import StripeEvent, Wallet, WalletCheckpoint, WalletTransaction, WithdrawalRequest
 
 
 class WalletTransactionInline(admin.TabularInline):
@@ -26,6 +26,14 @@ class WalletTransactionAdmin(admin.ModelAdmin):
     date_hierarchy = "created_at"
 
 
+@admin.register(WalletCheckpoint)
+class WalletCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("wallet", "as_of", "balance", "held_balance")
+    readonly_fields = ("wallet", "as_of", "balance", "held_balance", "created_at")
+    search_fields = ("wallet__user__username",)
+    date_hierarchy = "as_of"
+
+
 @admin.register(WithdrawalRequest)
 class WithdrawalRequestAdmin(admin.ModelAdmin):
     list_display = ("user", "amount", "status", "created_at")
@@ -33,3 +41,12 @@ class WithdrawalRequestAdmin(admin.ModelAdmin):
     search_fields = ("user__username", "user__email", "bank_details")
     readonly_fields = ("created_at", "updated_at")
     date_hierarchy = "created_at"
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = ("event_id", "event_type", "session_id", "status", "created_at", "processed_at")
+    list_filter = ("status", "event_type")
+    readonly_fields = ("event_id", "event_type", "session_id", "payload", "processed_at", "error", "created_at")
+    search_fields = ("event_id", "session_id")
+    date_hierarchy = "created_at"
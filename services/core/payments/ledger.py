@@ -0,0 +1,128 @@
+import logging
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Wallet, WalletCheckpoint, WalletTransaction
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_BATCH_SIZE = 1000
+
+# Lower bound for wallets that have no checkpoint yet
+LEDGER_EPOCH = datetime(2000, 1, 1, tzinfo=UTC)
+
+ZERO = Decimal("0.00")
+
+
+def _signed_sum(position: int) -> Coalesce:
+    """
+    SUM of the ledger amounts signed by their effect on balance (position 0) or held_balance (position 1).
+    """
+
+    money: DecimalField = DecimalField(max_digits=14, decimal_places=2)
+    whens = []
+    for transaction_type, effects in WalletTransaction.BALANCE_EFFECTS.items():
+        if effects[position] > 0:
+            whens.append(When(transaction_type=transaction_type, then=F("amount")))
+        elif effects[position] < 0:
+            whens.append(When(transaction_type=transaction_type, then=-F("amount")))
+    return Coalesce(Sum(Case(*whens, default=Value(ZERO), output_field=money)), Value(ZERO), output_field=money)
+
+
+def ledger_deltas() -> dict:
+    """
+    Aggregates for the net change of `balance` and `held_balance` over a set of wallet transactions.
+    """
+
+    return {"balance_delta": _signed_sum(0), "held_delta": _signed_sum(1)}
+
+
+def balances_as_of(wallet_id, moment: datetime) -> tuple[Decimal, Decimal]:
+    """
+    `(balance, held_balance)` after every transaction created before `moment`.
+    Starts from the nearest earlier checkpoint, so only the rows since that checkpoint are summed.
+    """
+
+    checkpoint = (
+        WalletCheckpoint.objects.filter(wallet_id=wallet_id, as_of__lt=moment)
+        .order_by("-as_of")
+        .values_list("as_of", "balance", "held_balance")
+        .first()
+    )
+    since, balance, held = checkpoint or (LEDGER_EPOCH, ZERO, ZERO)
+
+    deltas = WalletTransaction.objects.filter(
+        wallet_id=wallet_id, created_at__gt=since, created_at__lt=moment
+    ).aggregate(**ledger_deltas())
+
+    return balance + deltas["balance_delta"], held + deltas["held_delta"]
+
+
+def checkpoint_batch(as_of: datetime, wallet_ids) -> int:
+    """
+    Write a checkpoint at `as_of` for every wallet in `wallet_ids` with ledger activity since its last checkpoint.
+    Wallets without activity keep using their previous checkpoint. Re-running for the same `as_of` is a no-op.
+    """
+
+    previous = WalletCheckpoint.objects.filter(wallet_id=OuterRef("wallet_id"), as_of__lte=as_of).order_by("-as_of")
+    activity = (
+        WalletTransaction.objects.filter(wallet_id__in=wallet_ids, created_at__lte=as_of)
+        .annotate(since=Coalesce(Subquery(previous.values("as_of")[:1]), Value(LEDGER_EPOCH)))
+        .filter(created_at__gt=F("since"))
+        .order_by()
+        .values("wallet_id")
+        .annotate(**ledger_deltas())
+    )
+    deltas = {row["wallet_id"]: (row["balance_delta"], row["held_delta"]) for row in activity}
+    if not deltas:
+        return 0
+
+    # Latest checkpoint per wallet (DISTINCT ON wallet_id)
+    bases = {
+        wallet_id: (balance, held)
+        for wallet_id, balance, held in WalletCheckpoint.objects.filter(wallet_id__in=list(deltas), as_of__lte=as_of)
+        .order_by("wallet_id", "-as_of")
+        .distinct("wallet_id")
+        .values_list("wallet_id", "balance", "held_balance")
+    }
+
+    checkpoints = []
+    for wallet_id, (balance_delta, held_delta) in deltas.items():
+        balance, held = bases.get(wallet_id, (ZERO, ZERO))
+        checkpoints.append(
+            WalletCheckpoint(
+                wallet_id=wallet_id,
+                as_of=as_of,
+                balance=balance + balance_delta,
+                held_balance=held + held_delta,
+            )
+        )
+    WalletCheckpoint.objects.bulk_create(checkpoints, ignore_conflicts=True)
+
+    return len(checkpoints)
+
+
+def create_checkpoints(as_of: datetime, batch_size: int = CHECKPOINT_BATCH_SIZE) -> int:
+    """
+    Checkpoint all wallets at `as_of`, walking the wallets in id order one batch at a time.
+    """
+
+    count = 0
+    last_id = None
+    while True:
+        wallets = Wallet.objects.order_by("id")
+        if last_id is not None:
+            wallets = wallets.filter(id__gt=last_id)
+        wallet_ids = list(wallets.values_list("id", flat=True)[:batch_size])
+        if not wallet_ids:
+            break
+
+        count += checkpoint_batch(as_of, wallet_ids)
+        last_id = wallet_ids[-1]
+
+    logger.info(f"Created {count} wallet checkpoints as of {as_of}.")
+
+    return count
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_wallet_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='wallettransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('DEPOSIT', 'Deposit'), ('WITHDRAW', 'Withdraw'), ('BID_HOLD', 'Bid Hold'), ('BID_RELEASE', 'Bid Release'), ('PAYMENT', 'Payment'), ('SALE', 'Sale Proceeds'), ('REFUND', 'Refund')], db_index=True, max_length=20, verbose_name='Transaction Type'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:55
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_alter_wallettransaction_transaction_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('as_of', models.DateTimeField(verbose_name='As Of')),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('held_balance', models.DecimalField(decimal_places=2, max_digits=14)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['wallet', '-created_at', '-id'], name='wallet_tx_wallet_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='walletcheckpoint',
+            name='wallet',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='checkpoints', to='payments.wallet'),
+        ),
+        migrations.AddConstraint(
+            model_name='walletcheckpoint',
+            constraint=models.UniqueConstraint(fields=('wallet', 'as_of'), name='unique_wallet_checkpoint_as_of'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:00
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_partition_wallettransaction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StripeEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event_id', models.CharField(max_length=255, unique=True, verbose_name='Event ID')),
+                ('event_type', models.CharField(max_length=100, verbose_name='Event Type')),
+                ('session_id', models.CharField(blank=True, help_text='Checkout Session ID (for checkout events)', max_length=255, null=True)),
+                ('payload', models.JSONField(verbose_name='Payload')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSED', 'Processed'), ('IGNORED', 'Ignored'), ('FAILED', 'Failed')], default='PENDING', max_length=20, verbose_name='Status')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='Processed At')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Error')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'PENDING')), fields=['created_at'], name='stripe_event_pending_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('event_type', 'checkout.session.completed')), fields=('session_id',), name='unique_stripe_checkout_session')],
+            },
+        ),
+    ]
@@ -1,13 +1,13 @@
 from typing import Any
 
-from common.models import TimestampMixin, UUIDMixin
+from common.models import TimestampMixin, UUIDMixin, VersionMixin
 from django.conf import settings
 from django.db import models
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 
-class Wallet(UUIDMixin, TimestampMixin):
+class Wallet(UUIDMixin, TimestampMixin, VersionMixin):
     """
     User Wallet
     Logic: Total Money = balance + held_balance
@@ -55,6 +55,7 @@ class WalletTransaction(UUIDMixin, TimestampMixin):
         BID_HOLD = "BID_HOLD", _("Bid Hold")  # Lock in funds when bidding.
         BID_RELEASE = "BID_RELEASE", _("Bid Release")  # Release funds when bidding is released.
         PAYMENT = "PAYMENT", _("Payment")  # Payment when winning the auction.
+        SALE = "SALE", _("Sale Proceeds")  # Seller's payout when the auction is settled.
         REFUND = "REFUND", _("Refund")
 
     wallet: Any = models.ForeignKey(
@@ -77,10 +78,51 @@ class WalletTransaction(UUIDMixin, TimestampMixin):
         max_length=100, blank=True, null=True, db_index=True, help_text="e.g. Auction ID or Stripe Charge ID"
     )
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of a wallet's ledger (newest first) and period sums for statements
+            models.Index(fields=["wallet", "-created_at", "-id"], name="wallet_tx_wallet_created_idx"),
+        ]
+
+    # How each type moves money: (sign on balance, sign on held_balance)
+    BALANCE_EFFECTS = {
+        Type.DEPOSIT: (1, 0),
+        Type.WITHDRAW: (-1, 1),  # Held until the withdrawal request is processed.
+        Type.BID_HOLD: (-1, 1),
+        Type.BID_RELEASE: (1, -1),
+        Type.PAYMENT: (0, -1),
+        Type.SALE: (1, 0),
+        Type.REFUND: (1, 0),
+    }
+
     def __str__(self):
         return f"{self.transaction_type}: {self.amount} ({self.wallet.user})"
 
 
+class WalletCheckpoint(UUIDMixin, TimestampMixin):
+    """
+    Wallet balances as of a point in time (every transaction with created_at <= as_of applied).
+    Statements start from the nearest checkpoint instead of summing the whole history.
+    """
+
+    wallet: Any = models.ForeignKey(
+        Wallet,
+        on_delete=models.PROTECT,
+        related_name="checkpoints",
+    )
+    as_of: models.DateTimeField = models.DateTimeField(verbose_name="As Of")
+    balance: models.DecimalField = models.DecimalField(max_digits=14, decimal_places=2)
+    held_balance: models.DecimalField = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["wallet", "as_of"], name="unique_wallet_checkpoint_as_of"),
+        ]
+
+    def __str__(self):
+        return f"Checkpoint of {self.wallet_id} at {self.as_of} (Avail: {self.balance}, Held: {self.held_balance})"
+
+
 class WithdrawalRequest(UUIDMixin, TimestampMixin):
     """
     Manual Withdrawal Requests
@@ -120,3 +162,50 @@ class WithdrawalRequest(UUIDMixin, TimestampMixin):
 
     def __str__(self):
         return f"Withdrawal: {self.amount} - {self.user} ({self.status})"
+
+
+class StripeEvent(UUIDMixin, TimestampMixin):
+    """
+    Inbox of verified Stripe webhook events. The webhook only stores them; a worker applies them.
+    The unique event id drops Stripe's redeliveries, the unique session id makes a checkout credit at most once.
+    """
+
+    CHECKOUT_COMPLETED = "checkout.session.completed"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", _("Pending")
+        PROCESSED = "PROCESSED", _("Processed")
+        IGNORED = "IGNORED", _("Ignored")  # Event types we don't act on.
+        FAILED = "FAILED", _("Failed")  # Malformed or unknown user; needs a look.
+
+    event_id: models.CharField = models.CharField(max_length=255, unique=True, verbose_name=_("Event ID"))
+    event_type: models.CharField = models.CharField(max_length=100, verbose_name=_("Event Type"))
+    session_id: models.CharField = models.CharField(
+        max_length=255, blank=True, null=True, help_text="Checkout Session ID (for checkout events)"
+    )
+    payload: models.JSONField = models.JSONField(verbose_name=_("Payload"))
+    status: models.CharField = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("Status"),
+    )
+    processed_at: models.DateTimeField = models.DateTimeField(null=True, blank=True, verbose_name=_("Processed At"))
+    error: models.TextField = models.TextField(blank=True, default="", verbose_name=_("Error"))
+
+    class Meta:
+        constraints = [
+            # One credit per Checkout Session, whatever event ids Stripe sends for it
+            models.UniqueConstraint(
+                fields=["session_id"],
+                condition=Q(event_type="checkout.session.completed"),
+                name="unique_stripe_checkout_session",
+            ),
+        ]
+        indexes = [
+            # The worker's queue
+            models.Index(fields=["created_at"], condition=Q(status="PENDING"), name="stripe_event_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} ({self.status})"
@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class WalletTransactionCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the (wallet, -created_at, -id) index: each page is a bounded index range scan,
+    no matter how deep into the history it is.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-created_at", "-id")
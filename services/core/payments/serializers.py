@@ -43,3 +43,31 @@ class WithdrawSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Amount must be positive.")
 
         return value
+
+
+class StatementPeriodSerializer(serializers.Serializer):
+    """
+    Query params of a wallet statement: the half-open period [start, end)
+    """
+
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs["start"] >= attrs["end"]:
+            raise serializers.ValidationError({"end": "End must be after start."})
+
+        return attrs
+
+
+class StatementSummarySerializer(serializers.Serializer):
+    """
+    Read-only balances at the start and end of a statement period
+    """
+
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    opening_balance = serializers.DecimalField(max_digits=14, decimal_places=2)
+    opening_held_balance = serializers.DecimalField(max_digits=14, decimal_places=2)
+    closing_balance = serializers.DecimalField(max_digits=14, decimal_places=2)
+    closing_held_balance = serializers.DecimalField(max_digits=14, decimal_places=2)
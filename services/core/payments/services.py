@@ -0,0 +1,158 @@
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.db import IntegrityError, connection
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+
+from .models import Wallet, WalletTransaction
+
+# Lock order: a transaction touching several wallets locks them in user id order (one wallet per user, so that
+# is wallet order too). Every path follows it (bids in auction_place_bid(), buy-now, settlement, deposits), so two
+# transactions swapping roles over the same wallets queue up instead of deadlocking.
+
+
+class InsufficientFunds(Exception):
+    """
+    The wallet is missing or doesn't hold the amount to move. Raise it out of the transaction to roll back.
+    """
+
+
+class WalletBalances(NamedTuple):
+    wallet_id: uuid.UUID
+    balance: Decimal
+    held_balance: Decimal
+
+
+# One guarded statement instead of SELECT ... FOR UPDATE + save(): the row lock is held only for the UPDATE itself,
+# the check can't go stale, and only the money columns (plus version/updated_at for ETags) are written.
+MOVE_FUNDS_SQL = """
+    UPDATE "{table}"
+    SET {source} = {source} - %(amount)s, {target} = {target} + %(amount)s,
+        version = version + 1, updated_at = %(now)s
+    WHERE user_id = %(user_id)s AND {source} >= %(amount)s
+    RETURNING id, balance, held_balance
+"""
+
+
+def move_funds(user_id, amount: Decimal, source: str, target: str) -> WalletBalances:
+    """
+    Move `amount` from one wallet column to the other if the source covers it, returning the new balances.
+    """
+
+    sql = MOVE_FUNDS_SQL.format(table=Wallet._meta.db_table, source=source, target=target)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"amount": amount, "now": timezone.now(), "user_id": user_id})
+        row = cursor.fetchone()
+
+    if row is None:
+        raise InsufficientFunds(f"Wallet of user {user_id} can't move {amount} out of {source}.")
+    return WalletBalances(*row)
+
+
+def hold_funds(
+    user_id, amount: Decimal, reference_id: str, transaction_type=WalletTransaction.Type.BID_HOLD
+) -> WalletBalances:
+    """
+    Hold `amount` of the user's available balance (bid, withdrawal request) and log it.
+    """
+
+    balances = move_funds(user_id, amount, "balance", "held_balance")
+    WalletTransaction.objects.create(
+        wallet_id=balances.wallet_id, transaction_type=transaction_type, amount=amount, reference_id=reference_id
+    )
+    return balances
+
+
+def release_funds(user_id, amount: Decimal, reference_id: str) -> WalletBalances:
+    """
+    Return a held `amount` to the user's available balance (outbid, cancelled) and log it.
+    """
+
+    balances = move_funds(user_id, amount, "held_balance", "balance")
+    WalletTransaction.objects.create(
+        wallet_id=balances.wallet_id,
+        transaction_type=WalletTransaction.Type.BID_RELEASE,
+        amount=amount,
+        reference_id=reference_id,
+    )
+    return balances
+
+
+def apply_wallet_deltas(deltas: dict, field: str, now) -> int:
+    """
+    Add a per-user amount to `field` (negative to subtract) for many wallets in one UPDATE.
+    The wallet CHECK constraints reject any result below zero, aborting the whole batch.
+    """
+
+    if not deltas:
+        return 0
+
+    delta = Case(
+        *[When(user_id=user_id, then=Value(amount)) for user_id, amount in deltas.items()],
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+    return Wallet.objects.filter(user_id__in=list(deltas)).update(
+        **{field: F(field) + delta},
+        version=F("version") + 1,
+        updated_at=now,
+    )
+
+
+def pay_buy_now(reference_id: str, buyer_id, seller_id, price: Decimal, previous_winner_id, previous_price: Decimal):
+    """
+    Money side of a buy-now, set-based: refund the previous top bidder's hold, take the price from the buyer's
+    available balance and credit the seller, with one UPDATE per wallet column and one ledger INSERT.
+    The buyer's payment is logged as BID_HOLD + PAYMENT so the ledger reads like a settled winning bid.
+    Call inside the transaction that finished the auction; raises InsufficientFunds (roll it back) if the buyer
+    can't pay.
+    """
+
+    now = timezone.now()
+    balance: dict = defaultdict(Decimal)
+    held: dict = defaultdict(Decimal)
+    ledger = []
+
+    if previous_winner_id is not None:
+        balance[previous_winner_id] += previous_price
+        held[previous_winner_id] -= previous_price
+        ledger.append((previous_winner_id, WalletTransaction.Type.BID_RELEASE, previous_price))
+    balance[buyer_id] -= price
+    balance[seller_id] += price
+    ledger += [
+        (buyer_id, WalletTransaction.Type.BID_HOLD, price),
+        (buyer_id, WalletTransaction.Type.PAYMENT, price),
+        (seller_id, WalletTransaction.Type.SALE, price),
+    ]
+
+    # Sellers who never opened their wallet get one now
+    Wallet.objects.bulk_create([Wallet(user_id=seller_id)], ignore_conflicts=True)
+    # Canonical wallet lock order (see top of module) before the multi-row UPDATEs lock them in scan order.
+    wallet_ids = dict(
+        Wallet.objects.select_for_update()
+        .filter(user_id__in=list(balance))
+        .order_by("user_id")
+        .values_list("user_id", "id")
+    )
+    if buyer_id not in wallet_ids:
+        raise InsufficientFunds(f"User {buyer_id} has no wallet.")
+
+    try:
+        apply_wallet_deltas(balance, "balance", now)
+        apply_wallet_deltas({user_id: delta for user_id, delta in held.items() if delta}, "held_balance", now)
+    except IntegrityError as exc:  # The balance CHECK constraint: the buyer can't cover the price.
+        raise InsufficientFunds(f"Wallet of user {buyer_id} can't pay {price}.") from exc
+
+    WalletTransaction.objects.bulk_create(
+        [
+            WalletTransaction(
+                wallet_id=wallet_ids[user_id],
+                transaction_type=transaction_type,
+                amount=amount,
+                reference_id=reference_id,
+            )
+            for user_id, transaction_type, amount in ledger
+        ]
+    )
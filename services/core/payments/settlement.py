@@ -0,0 +1,125 @@
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from auctions.models import AuctionListing
+from common.db import retry_on_conflict
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Wallet, WalletTransaction
+from .services import apply_wallet_deltas
+
+logger = logging.getLogger(__name__)
+
+SETTLE_BATCH_SIZE = 500
+
+# The settlement work queue: FINISHED auctions not settled yet, nor set aside after failing alone
+UNSETTLED = Q(status=AuctionListing.Status.FINISHED, settled_at__isnull=True, settlement_failed_at__isnull=True)
+
+
+def settle_batch(batch_size: int = SETTLE_BATCH_SIZE) -> int:
+    """
+    Settle up to `batch_size` FINISHED auctions in one transaction and return how many were settled:
+    the winners' holds are debited (PAYMENT), the sellers credited (SALE), and the auctions stamped settled_at.
+
+    The auction rows are claimed with SKIP LOCKED and stamped in the same transaction as the money movement,
+    so parallel workers never settle the same auction twice and a failed batch leaves no partial payout.
+
+    A batch rejected by the wallet constraints (a winner's hold can't cover the price) is settled again one
+    auction at a time: each one that still fails is logged and stamped settlement_failed_at, and no longer
+    claimed, so it can't hold back the auctions queued after it.
+    """
+
+    try:
+        return _settle(batch_size)
+    except IntegrityError as exc:
+        logger.warning(f"Settlement batch rolled back ({exc}), settling it one auction at a time.")
+
+    auction_ids = list(
+        AuctionListing.objects.filter(UNSETTLED).order_by("end_time").values_list("id", flat=True)[:batch_size]
+    )
+    settled = 0
+    for auction_id in auction_ids:
+        try:
+            settled += _settle(1, auction_id)
+        except IntegrityError as exc:
+            now = timezone.now()
+            AuctionListing.objects.filter(id=auction_id, settled_at__isnull=True).update(
+                settlement_failed_at=now,
+                version=F("version") + 1,
+                updated_at=now,
+            )
+            logger.error(f"Could not settle Auction {auction_id}, set aside: {exc}")
+
+    return settled
+
+
+@retry_on_conflict()
+def _settle(batch_size: int, auction_id=None) -> int:
+    """
+    Claim and settle up to `batch_size` auctions (only `auction_id`, if given) in one transaction.
+    """
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        claimed = AuctionListing.objects.select_for_update(skip_locked=True, of=("self",)).filter(UNSETTLED)
+        if auction_id is not None:
+            claimed = claimed.filter(id=auction_id)
+        claimed = claimed.order_by("end_time").values_list("id", "winner_id", "product__owner_id", "current_price")
+        rows = list(claimed[:batch_size])
+        if not rows:
+            return 0
+
+        sales = [row for row in rows if row[1] is not None]  # A FINISHED auction without winner has nothing to pay.
+        debits: dict = defaultdict(Decimal)
+        credits: dict = defaultdict(Decimal)
+        for _, winner_id, seller_id, price in sales:
+            debits[winner_id] -= price
+            credits[seller_id] += price
+
+        # Sellers who never opened their wallet get one now
+        Wallet.objects.bulk_create([Wallet(user_id=seller_id) for seller_id in credits], ignore_conflicts=True)
+
+        # Lock every touched wallet up front, in user id order (the canonical wallet lock order, see
+        # payments.services), so concurrent batches and bids can't deadlock on them.
+        wallet_ids = dict(
+            Wallet.objects.select_for_update()
+            .filter(user_id__in=[*debits, *credits])
+            .order_by("user_id")
+            .values_list("user_id", "id")
+        )
+        apply_wallet_deltas(debits, "held_balance", now)
+        apply_wallet_deltas(credits, "balance", now)
+
+        ledger = []
+        for auction_id, winner_id, seller_id, price in sales:
+            ledger.append(
+                WalletTransaction(
+                    wallet_id=wallet_ids[winner_id],
+                    transaction_type=WalletTransaction.Type.PAYMENT,
+                    amount=price,
+                    reference_id=str(auction_id),
+                )
+            )
+            ledger.append(
+                WalletTransaction(
+                    wallet_id=wallet_ids[seller_id],
+                    transaction_type=WalletTransaction.Type.SALE,
+                    amount=price,
+                    reference_id=str(auction_id),
+                )
+            )
+        WalletTransaction.objects.bulk_create(ledger)
+
+        AuctionListing.objects.filter(id__in=[row[0] for row in rows]).update(
+            settled_at=now,
+            version=F("version") + 1,
+            updated_at=now,
+        )
+
+    logger.info(f"Settled {len(rows)} auctions ({len(sales)} sales).")
+
+    return len(rows)
@@ -7,43 +7,52 @@ stripe.api_key = settings.STRIPE_SECRET_KEY
 logger = logging.getLogger(__name__)
 
 
-def create_checkout_session(user, amount, currency="usd"):
+def checkout_session_params(user, amount, currency="usd"):
     """
-    Creates a Stripe Checkout Session for a one-time payment.
+    Parameters of a Stripe Checkout Session for a one-time payment.
     The 'amount' is expected to be a Decimal or float.
     Stripe expects amounts in cents (integers).
     """
 
-    try:
-        # Convert amount to cents
-        amount_in_cents = int(amount * 100)
+    # Convert amount to cents
+    amount_in_cents = int(amount * 100)
 
-        # Build success/cancel URLs
-        base_url = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "http://localhost:8000"
-        if not base_url.startswith("http"):
-            base_url = f"http://{base_url}"
+    # Build success/cancel URLs
+    base_url = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "http://localhost:8000"
+    if not base_url.startswith("http"):
+        base_url = f"http://{base_url}"
 
-        checkout_session = stripe.checkout.Session.create(
-            payment_method_types=["card"],
-            line_items=[
-                {
-                    "price_data": {
-                        "currency": currency,
-                        "unit_amount": amount_in_cents,
-                        "product_data": {
-                            "name": "Wallet Deposit",
-                            "description": f"Deposit for user {user.username}",
-                        },
+    return {
+        "payment_method_types": ["card"],
+        "line_items": [
+            {
+                "price_data": {
+                    "currency": currency,
+                    "unit_amount": amount_in_cents,
+                    "product_data": {
+                        "name": "Wallet Deposit",
+                        "description": f"Deposit for user {user.username}",
                     },
-                    "quantity": 1,
-                }
-            ],
-            mode="payment",
-            success_url=f"{base_url}/api/payments/success?session_id={{CHECKOUT_SESSION_ID}}",
-            cancel_url=f"{base_url}/api/payments/cancel",
-            client_reference_id=str(user.id),  # Important: This lets us know WHO paid when the Webhook arrives.
-            metadata={"user_id": str(user.id), "username": user.username},
-        )
+                },
+                "quantity": 1,
+            }
+        ],
+        "mode": "payment",
+        "success_url": f"{base_url}/api/payments/success?session_id={{CHECKOUT_SESSION_ID}}",
+        "cancel_url": f"{base_url}/api/payments/cancel",
+        "client_reference_id": str(user.id),  # Important: This lets us know WHO paid when the Webhook arrives.
+        "metadata": {"user_id": str(user.id), "username": user.username},
+    }
+
+
+async def acreate_checkout_session(user, amount, currency="usd"):
+    """
+    Creates a Stripe Checkout Session, returning its URL (None on failure).
+    Async (Stripe's httpx client): the calling request doesn't hold a thread while Stripe answers.
+    """
+
+    try:
+        checkout_session = await stripe.checkout.Session.create_async(**checkout_session_params(user, amount, currency))
         return checkout_session.url
 
     except Exception as e:
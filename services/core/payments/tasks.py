@@ -0,0 +1,67 @@
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from .ledger import create_checkpoints
+from .settlement import SETTLE_BATCH_SIZE, settle_batch
+from .webhooks import STRIPE_BATCH_SIZE, apply_stripe_events
+
+logger = logging.getLogger(__name__)
+
+SETTLE_MAX_BATCHES = 20
+STRIPE_MAX_BATCHES = 20
+
+
+@shared_task
+def settle_finished_auctions(batch_size: int = SETTLE_BATCH_SIZE, max_batches: int = SETTLE_MAX_BATCHES):
+    """
+    Task for paying out FINISHED auctions (running in the background every 1 minute).
+    Safe to run on several workers at once: each batch claims its auctions with SKIP LOCKED.
+    """
+
+    count = 0
+    for _ in range(max_batches):
+        settled = settle_batch(batch_size)
+        count += settled
+        if settled < batch_size:
+            break
+    else:
+        # Backlog left: continue on another run instead of holding this worker.
+        settle_finished_auctions.delay(batch_size=batch_size, max_batches=max_batches)
+
+    logger.info(f"Settled {count} finished auctions.")
+
+    return f"Settled {count} finished auctions."
+
+
+@shared_task
+def create_wallet_checkpoints():
+    """
+    Task for checkpointing wallet balances as of midnight UTC (running in the background daily at 00:15).
+    The delay lets transactions stamped just before midnight commit before they are summed.
+    """
+
+    as_of = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    count = create_checkpoints(as_of)
+
+    return f"Created {count} wallet checkpoints as of {as_of.isoformat()}."
+
+
+@shared_task
+def process_stripe_events(batch_size: int = STRIPE_BATCH_SIZE, max_batches: int = STRIPE_MAX_BATCHES):
+    """
+    Task for applying stored Stripe webhook events (queued by the webhook, plus every 1 minute as a safety net).
+    Concurrent runs split the pending events between them (SKIP LOCKED) instead of waiting.
+    """
+
+    count = 0
+    for _ in range(max_batches):
+        processed = apply_stripe_events(batch_size)
+        count += processed
+        if processed < batch_size:
+            break
+    else:
+        process_stripe_events.delay(batch_size=batch_size, max_batches=max_batches)
+
+    return f"Processed {count} Stripe events."
@@ -1 +1,375 @@
-# Create your tests here.
+import hashlib
+import hmac
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import stripe
+from auctions.models import AuctionListing
+from auctions.tests.factories import AuctionListingFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from users.tests.factories import UserFactory
+
+from payments.ledger import balances_as_of, create_checkpoints
+from payments.models import StripeEvent, Wallet, WalletCheckpoint, WalletTransaction
+from payments.services import InsufficientFunds, hold_funds
+from payments.settlement import settle_batch
+from payments.tasks import process_stripe_events, settle_finished_auctions
+
+
+@pytest.mark.django_db
+class TestWalletConditionalGet:
+    def test_wallet_not_modified(self, api_client):
+        """Test that an unchanged wallet answers 304 to If-None-Match."""
+        user = UserFactory()
+        Wallet.objects.create(user=user, balance=100)
+        api_client.force_authenticate(user=user)
+        url = reverse("wallet-detail")
+
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response["ETag"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_wallet_etag_changes_on_balance_change(self, api_client):
+        """Test that any wallet save invalidates the wallet and transaction list ETags."""
+        user = UserFactory()
+        wallet = Wallet.objects.create(user=user, balance=100)
+        api_client.force_authenticate(user=user)
+
+        wallet_etag = api_client.get(reverse("wallet-detail"))["ETag"]
+        tx_etag = api_client.get(reverse("wallet_transactions"))["ETag"]
+
+        wallet.balance = 50
+        wallet.save()
+
+        response = api_client.get(reverse("wallet-detail"), HTTP_IF_NONE_MATCH=wallet_etag)
+        assert response.status_code == status.HTTP_200_OK
+        response = api_client.get(reverse("wallet_transactions"), HTTP_IF_NONE_MATCH=tx_etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_wallet_auto_provisioned_without_etag_lookup(self, api_client):
+        """Test that the first request still provisions the wallet."""
+        user = UserFactory()
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse("wallet-detail"))
+        assert response.status_code == status.HTTP_200_OK
+        assert Wallet.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+class TestSettlement:
+    def finished(self, winner, price, **kwargs):
+        return AuctionListingFactory(
+            status=AuctionListing.Status.FINISHED, winner=winner, current_price=price, **kwargs
+        )
+
+    def test_settles_holds_into_seller_balances(self):
+        """Test that winners' holds move to sellers with ledger rows on both sides."""
+        winner = UserFactory()
+        Wallet.objects.create(user=winner, balance=0, held_balance=300)
+        first = self.finished(winner, "100.00")
+        second = self.finished(winner, "150.00", product__owner=first.product.owner)
+        no_winner = AuctionListingFactory(status=AuctionListing.Status.FINISHED)
+
+        assert settle_finished_auctions() == "Settled 3 finished auctions."
+
+        winner_wallet = Wallet.objects.get(user=winner)
+        assert winner_wallet.held_balance == Decimal("50.00")
+        seller_wallet = Wallet.objects.get(user=first.product.owner)  # Auto-provisioned
+        assert seller_wallet.balance == Decimal("250.00")
+
+        assert set(
+            WalletTransaction.objects.filter(reference_id=str(first.id)).values_list("transaction_type", "wallet")
+        ) == {
+            (WalletTransaction.Type.PAYMENT, winner_wallet.id),
+            (WalletTransaction.Type.SALE, seller_wallet.id),
+        }
+        for auction in (first, second, no_winner):
+            auction.refresh_from_db()
+            assert auction.settled_at is not None
+
+    def test_idempotent(self):
+        """Test that settled auctions are never paid out twice."""
+        winner = UserFactory()
+        Wallet.objects.create(user=winner, held_balance=100)
+        auction = self.finished(winner, "100.00")
+
+        assert settle_batch() == 1
+        assert settle_batch() == 0
+
+        assert WalletTransaction.objects.filter(reference_id=str(auction.id)).count() == 2
+        assert Wallet.objects.get(user=auction.product.owner).balance == Decimal("100.00")
+
+    def test_insufficient_hold_is_set_aside(self):
+        """Test that an auction whose hold can't cover the price is flagged alone, without partial payouts."""
+        now = timezone.now()
+        broke, winner = UserFactory(), UserFactory()
+        Wallet.objects.create(user=broke, held_balance=10)
+        Wallet.objects.create(user=winner, held_balance=100)
+        failing = self.finished(broke, "100.00", end_time=now - timedelta(hours=2), start_time=now - timedelta(days=1))
+        queued = self.finished(winner, "100.00", end_time=now - timedelta(hours=1), start_time=now - timedelta(days=1))
+
+        assert settle_batch() == 1
+        assert settle_batch() == 0  # Not claimed again
+
+        failing.refresh_from_db()
+        assert failing.settled_at is None
+        assert failing.settlement_failed_at is not None
+        assert not WalletTransaction.objects.filter(reference_id=str(failing.id)).exists()
+        assert Wallet.objects.get(user=broke).held_balance == Decimal("10.00")
+        queued.refresh_from_db()
+        assert queued.settled_at is not None
+        assert Wallet.objects.get(user=queued.product.owner).balance == Decimal("100.00")
+
+
+@pytest.mark.django_db
+class TestWalletStatement:
+    def record(self, wallet, transaction_type, amount, day):
+        transaction = WalletTransaction.objects.create(wallet=wallet, transaction_type=transaction_type, amount=amount)
+        WalletTransaction.objects.filter(id=transaction.id).update(created_at=datetime(2026, 1, day, 12, tzinfo=UTC))
+        return transaction
+
+    def ledger(self, user):
+        # Jan 1: +500, Jan 2: bid holds 200, Jan 3: bid released, Jan 4: another hold paid out
+        wallet = Wallet.objects.create(user=user, balance=200, held_balance=0)
+        self.record(wallet, WalletTransaction.Type.DEPOSIT, "500.00", 1)
+        self.record(wallet, WalletTransaction.Type.BID_HOLD, "200.00", 2)
+        self.record(wallet, WalletTransaction.Type.BID_RELEASE, "200.00", 3)
+        self.record(wallet, WalletTransaction.Type.BID_HOLD, "300.00", 4)
+        self.record(wallet, WalletTransaction.Type.PAYMENT, "300.00", 4)
+        return wallet
+
+    def test_checkpoints_follow_ledger(self):
+        """Test that checkpoints carry the signed ledger sums forward and are not duplicated on re-run."""
+        wallet = self.ledger(UserFactory())
+        idle = Wallet.objects.create(user=UserFactory())
+
+        create_checkpoints(datetime(2026, 1, 3, tzinfo=UTC))
+        create_checkpoints(datetime(2026, 1, 5, tzinfo=UTC))
+        create_checkpoints(datetime(2026, 1, 5, tzinfo=UTC))
+
+        checkpoints = list(wallet.checkpoints.order_by("as_of").values_list("balance", "held_balance"))
+        assert checkpoints == [(Decimal("300.00"), Decimal("200.00")), (Decimal("200.00"), Decimal("0.00"))]
+        assert not idle.checkpoints.exists()
+
+    def test_balances_start_from_nearest_checkpoint(self):
+        """Test that balances are the nearest checkpoint plus only the rows after it."""
+        wallet = self.ledger(UserFactory())
+        # Deliberately off by 1000 from the ledger, so reading past it would show.
+        WalletCheckpoint.objects.create(
+            wallet=wallet, as_of=datetime(2026, 1, 2, 18, tzinfo=UTC), balance="1300.00", held_balance="200.00"
+        )
+
+        assert balances_as_of(wallet.id, datetime(2026, 1, 2, tzinfo=UTC)) == (Decimal("500.00"), Decimal("0.00"))
+        assert balances_as_of(wallet.id, datetime(2026, 1, 5, tzinfo=UTC)) == (Decimal("1200.00"), Decimal("0.00"))
+
+    def test_statement_endpoint(self, api_client):
+        """Test that the statement returns period balances and only that period's transactions."""
+        user = UserFactory()
+        self.ledger(user)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(
+            reverse("wallet_statement"), {"start": "2026-01-02T00:00:00Z", "end": "2026-01-04T00:00:00Z"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["opening_balance"] == "500.00"
+        assert response.data["opening_held_balance"] == "0.00"
+        assert response.data["closing_balance"] == "500.00"
+        assert response.data["closing_held_balance"] == "0.00"
+        assert [row["transaction_type"] for row in response.data["results"]] == ["BID_RELEASE", "BID_HOLD"]
+
+    def test_statement_rejects_inverted_period(self, api_client):
+        """Test that end must come after start."""
+        user = UserFactory()
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(
+            reverse("wallet_statement"), {"start": "2026-01-04T00:00:00Z", "end": "2026-01-02T00:00:00Z"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_transactions_cursor_pagination(self, api_client):
+        """Test that the ledger is served newest first in cursor pages."""
+        user = UserFactory()
+        self.ledger(user)
+        api_client.force_authenticate(user=user)
+
+        first = api_client.get(reverse("wallet_transactions"), {"page_size": 3})
+        assert len(first.data["results"]) == 3
+        assert first.data["results"][0]["created_at"].startswith("2026-01-04")
+
+        second = api_client.get(first.data["next"])
+        assert [row["transaction_type"] for row in second.data["results"]] == ["BID_HOLD", "DEPOSIT"]
+        assert second.data["next"] is None
+
+
+WEBHOOK_SECRET = "whsec_test"
+
+
+def stripe_signature(payload: str, secret: str = WEBHOOK_SECRET) -> str:
+    """Sign a payload the way Stripe does (Stripe-Signature header, v1 scheme)."""
+    timestamp = int(time.time())
+    digest = hmac.new(secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def checkout_event(event_id, session_id, user, amount_total=5000):
+    return {
+        "id": event_id,
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {
+            "object": {
+                "id": session_id,
+                "object": "checkout.session",
+                "client_reference_id": str(user.id) if user else None,
+                "amount_total": amount_total,
+            }
+        },
+    }
+
+
+@pytest.mark.django_db
+class TestDeposit:
+    def test_returns_the_checkout_url(self, api_client):
+        """Test that the deposit answers with the URL of the session created through Stripe's async client."""
+        user = UserFactory()
+        api_client.force_authenticate(user=user)
+
+        with patch("payments.stripe_utils.stripe.checkout.Session.create_async", new_callable=AsyncMock) as create:
+            create.return_value.url = "https://checkout.stripe.com/c/pay/cs_1"
+            response = api_client.post(reverse("deposit"), {"amount": "25.00"}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"checkout_url": "https://checkout.stripe.com/c/pay/cs_1"}
+        (params,) = [call.kwargs for call in create.await_args_list]
+        assert params["line_items"][0]["price_data"]["unit_amount"] == 2500
+        assert params["client_reference_id"] == str(user.id)
+
+    def test_stripe_failure_is_unavailable(self, api_client):
+        api_client.force_authenticate(user=UserFactory())
+
+        with patch(
+            "payments.stripe_utils.stripe.checkout.Session.create_async", side_effect=stripe.APIConnectionError("down")
+        ):
+            response = api_client.post(reverse("deposit"), {"amount": "25.00"}, format="json")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+@pytest.mark.django_db
+class TestStripeWebhook:
+    @pytest.fixture(autouse=True)
+    def webhook_secret(self, settings):
+        settings.STRIPE_WEBHOOK_SECRET = WEBHOOK_SECRET
+
+    def post(self, api_client, event, signature=None):
+        payload = json.dumps(event)
+        return api_client.post(
+            reverse("stripe-webhook"),
+            data=payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=signature or stripe_signature(payload),
+        )
+
+    def test_stores_event_and_acknowledges(self, api_client, django_capture_on_commit_callbacks):
+        """Test that the webhook only stores the event and queues the worker."""
+        user = UserFactory()
+        wallet = Wallet.objects.create(user=user)
+
+        with patch("payments.views.process_stripe_events.delay") as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                response = self.post(api_client, checkout_event("evt_1", "cs_1", user))
+
+        assert response.status_code == status.HTTP_200_OK
+        event = StripeEvent.objects.get(event_id="evt_1")
+        assert event.status == StripeEvent.Status.PENDING
+        assert event.session_id == "cs_1"
+        wallet.refresh_from_db()
+        assert wallet.balance == 0
+        delay.assert_called_once()
+
+    def test_redelivery_is_dropped(self, api_client):
+        """Test that a retried event, or another event for the same session, is stored once."""
+        user = UserFactory()
+
+        with patch("payments.views.process_stripe_events.delay"):
+            for event in (
+                checkout_event("evt_1", "cs_1", user),
+                checkout_event("evt_1", "cs_1", user),
+                checkout_event("evt_2", "cs_1", user),
+            ):
+                assert self.post(api_client, event).status_code == status.HTTP_200_OK
+
+        assert StripeEvent.objects.count() == 1
+
+    def test_rejects_bad_signature(self, api_client):
+        """Test that unsigned payloads are neither stored nor acknowledged."""
+        response = self.post(api_client, checkout_event("evt_1", "cs_1", UserFactory()), signature="t=1,v1=bad")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not StripeEvent.objects.exists()
+
+    def test_worker_credits_batch_once(self):
+        """Test that the worker credits every completed checkout once and skips the rest."""
+        alice, bob = UserFactory(), UserFactory()
+        Wallet.objects.create(user=alice, balance=10)
+        events = [
+            checkout_event("evt_1", "cs_1", alice, 5000),
+            checkout_event("evt_2", "cs_2", alice, 2550),
+            checkout_event("evt_3", "cs_3", bob, 1000),  # Bob has no wallet yet
+            checkout_event("evt_4", "cs_4", None),
+            {"id": "evt_5", "type": "payment_intent.created", "data": {"object": {"id": "pi_1"}}},
+        ]
+        for event in events:
+            StripeEvent.objects.create(
+                event_id=event["id"], event_type=event["type"], session_id=event["data"]["object"]["id"], payload=event
+            )
+
+        assert process_stripe_events() == "Processed 5 Stripe events."
+        assert process_stripe_events() == "Processed 0 Stripe events."
+
+        assert Wallet.objects.get(user=alice).balance == Decimal("85.50")
+        assert Wallet.objects.get(user=bob).balance == Decimal("10.00")
+        assert set(
+            WalletTransaction.objects.filter(transaction_type=WalletTransaction.Type.DEPOSIT).values_list(
+                "reference_id", flat=True
+            )
+        ) == {"cs_1", "cs_2", "cs_3"}
+        assert dict(StripeEvent.objects.values_list("event_id", "status")) == {
+            "evt_1": "PROCESSED",
+            "evt_2": "PROCESSED",
+            "evt_3": "PROCESSED",
+            "evt_4": "FAILED",
+            "evt_5": "IGNORED",
+        }
+
+
+@pytest.mark.django_db
+class TestWalletServices:
+    def test_hold_is_guarded(self):
+        """Test that a hold larger than the available balance changes nothing."""
+        user = UserFactory()
+        wallet = Wallet.objects.create(user=user, balance=50)
+
+        with pytest.raises(InsufficientFunds):
+            hold_funds(user.id, Decimal("60.00"), "ref")
+
+        balances = hold_funds(user.id, Decimal("50.00"), "ref")
+
+        assert (balances.wallet_id, balances.balance, balances.held_balance) == (wallet.id, 0, 50)
+        wallet.refresh_from_db()
+        assert wallet.version == 2
+        assert WalletTransaction.objects.get().transaction_type == WalletTransaction.Type.BID_HOLD
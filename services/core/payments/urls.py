@@ -4,6 +4,7 @@ from .views import (
     DepositAPIView,
     StripeWebhookView,
     WalletRetrieveAPIView,
+    WalletStatementAPIView,
     WalletTransactionListAPIView,
     WithdrawalListAPIView,
     WithdrawAPIView,
@@ -15,5 +16,6 @@ urlpatterns = [
     path("withdraw/", WithdrawAPIView.as_view(), name="withdraw"),
     path("webhook/stripe/", StripeWebhookView.as_view(), name="stripe-webhook"),
     path("transactions/", WalletTransactionListAPIView.as_view(), name="wallet_transactions"),
+    path("statement/", WalletStatementAPIView.as_view(), name="wallet_statement"),
     path("withdrawals/", WithdrawalListAPIView.as_view(), name="withdrawal_requests"),
 ]
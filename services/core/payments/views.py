@@ -1,6 +1,9 @@
+import hashlib
+import json
 import logging
-from decimal import Decimal
 
+from common.db import retry_on_conflict
+from common.views import AsyncAPIViewMixin, AsyncReadMixin, ConditionalGetMixin
 from django.db import transaction
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -8,19 +11,33 @@ from rest_framework import generics, permissions, status, views
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from .ledger import ZERO, balances_as_of
 from .models import Wallet, WalletTransaction, WithdrawalRequest
+from .pagination import WalletTransactionCursorPagination
 from .serializers import (
     DepositSerializer,
+    StatementPeriodSerializer,
+    StatementSummarySerializer,
     WalletSerializer,
     WalletTransactionSerializer,
     WithdrawSerializer,
 )
-from .stripe_utils import create_checkout_session, handle_webhook_event
+from .services import InsufficientFunds, hold_funds
+from .stripe_utils import acreate_checkout_session, handle_webhook_event
+from .tasks import process_stripe_events
+from .webhooks import record_stripe_event
 
 logger = logging.getLogger(__name__)
 
 
-class WalletRetrieveAPIView(generics.RetrieveAPIView):
+def get_wallet_validators(user):
+    """
+    Wallet version/timestamp by the unique user index. Every balance change and ledger write saves the wallet.
+    """
+    return Wallet.objects.filter(user_id=user.id).values_list("id", "version", "updated_at").first()
+
+
+class WalletRetrieveAPIView(AsyncReadMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     """
     Get the current user's wallet balance.
     """
@@ -28,24 +45,32 @@ class WalletRetrieveAPIView(generics.RetrieveAPIView):
     serializer_class = WalletSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_validators(self):
+        row = get_wallet_validators(self.request.user)
+        if row is None:
+            return None  # Not provisioned yet, let get_object() create it.
+        wallet_id, version, updated_at = row
+        return f"wallet-{wallet_id}-v{version}", updated_at
+
     def get_object(self):
         # Create wallet if it doesn't exist (Auto-provisioning)
-        wallet, _ = Wallet.objects.get_or_create(user=self.request.user)
+        wallet, _ = Wallet.objects.get_or_create(user_id=self.request.user.pk)
         return wallet
 
 
-class DepositAPIView(views.APIView):
+class DepositAPIView(AsyncAPIViewMixin, views.APIView):
     """
     Initiate a deposit via Stripe Checkout.
+    Async: the request waits for Stripe on the event loop, not on a thread.
     """
 
     permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = DepositSerializer(data=request.data)
         if serializer.is_valid():
             amount = serializer.validated_data["amount"]
-            checkout_url = create_checkout_session(request.user, amount)
+            checkout_url = await acreate_checkout_session(request.user, amount)
 
             if checkout_url:
                 return Response({"checkout_url": checkout_url}, status=status.HTTP_200_OK)
@@ -62,6 +87,7 @@ class DepositAPIView(views.APIView):
 class StripeWebhookView(views.APIView):
     """
     Handle Stripe Webhooks (e.g., checkout.session.completed)
+    Verifies and stores the event, then acknowledges; the wallet is credited by a worker.
     """
 
     permission_classes = [permissions.AllowAny]  # Stripe calls this, not a user.
@@ -75,49 +101,11 @@ class StripeWebhookView(views.APIView):
         if not event:
             return Response({"status": "invalid payload or signature"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Handle specific events
-        if event["type"] == "checkout.session.completed":
-            session = event["data"]["object"]
-            self.handle_checkout_completed(session)
+        record_stripe_event(json.loads(payload))
+        transaction.on_commit(lambda: process_stripe_events.delay())
 
         return Response({"status": "success"}, status=status.HTTP_200_OK)
 
-    def handle_checkout_completed(self, session):
-        """
-        Credit the user's wallet.
-        """
-        try:
-            client_reference_id = session.get("client_reference_id")
-            amount_total = session.get("amount_total")  # In cents
-
-            if not client_reference_id or amount_total is None:
-                logger.error("Missing user ID or amount in session")
-                return
-
-            user_id = client_reference_id
-            amount = Decimal(amount_total) / 100
-
-            with transaction.atomic():
-                # Lock the wallet to update balance safely
-                wallet = Wallet.objects.select_for_update().get(user__id=user_id)
-                wallet.balance += amount
-                wallet.save()
-
-                # Create Transaction Record
-                WalletTransaction.objects.create(
-                    wallet=wallet,
-                    transaction_type=WalletTransaction.Type.DEPOSIT,
-                    amount=amount,
-                    reference_id=session.get("id"),  # Stripe Session ID
-                )
-
-                logger.info(f"Deposited {amount} to user {user_id}")
-
-        except Wallet.DoesNotExist:
-            logger.error(f"Wallet not found for user {client_reference_id}")
-        except Exception as e:
-            logger.error(f"Error processing webhook: {e}")
-
 
 class WithdrawAPIView(generics.CreateAPIView):
     """
@@ -127,40 +115,80 @@ class WithdrawAPIView(generics.CreateAPIView):
     serializer_class = WithdrawSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @retry_on_conflict()
     def perform_create(self, serializer):
         amount = serializer.validated_data["amount"]
         user = self.request.user
 
-        with transaction.atomic():
-            # Lock wallet to check funds
-            wallet = Wallet.objects.select_for_update().get(user=user)
-
-            if wallet.balance < amount:
-                raise ValidationError({"amount": "Insufficient funds."})
-
-            # Create Request
-            withdrawal = serializer.save(user=user)
+        try:
+            with transaction.atomic():
+                # Create Request
+                withdrawal = serializer.save(user_id=user.pk)
 
-            wallet.balance -= amount
-            wallet.held_balance += amount
-            wallet.save()
+                # Hold the amount until the request is processed (guarded update, logged as withdraw intent)
+                hold_funds(user.pk, amount, str(withdrawal.id), transaction_type=WalletTransaction.Type.WITHDRAW)
+        except InsufficientFunds:
+            raise ValidationError({"amount": "Insufficient funds."}) from None
 
-            # Log the hold
-            WalletTransaction.objects.create(
-                wallet=wallet,
-                transaction_type=WalletTransaction.Type.WITHDRAW,  # Marking as withdraw intent
-                amount=amount,
-                reference_id=str(withdrawal.id),
-            )
 
+class WalletTransactionListAPIView(AsyncReadMixin, ConditionalGetMixin, generics.ListAPIView):
+    """
+    The current user's ledger, newest first, one cursor page at a time.
+    """
 
-class WalletTransactionListAPIView(generics.ListAPIView):
     serializer_class = WalletTransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = WalletTransactionCursorPagination
+    wallet_id = None
+
+    def get_validators(self):
+        row = get_wallet_validators(self.request.user)
+        if row is None:
+            return None
+        self.wallet_id, version, updated_at = row
+        # Query params (filters, cursors) select a different representation of the same ledger.
+        query = hashlib.sha1(self.request.META.get("QUERY_STRING", "").encode()).hexdigest()[:12]
+        return f"wallet-{self.wallet_id}-v{version}-tx-{query}", updated_at
+
+    def get_queryset(self):
+        # By wallet_id (found with the validators) so the (wallet, -created_at, -id) index serves the page directly.
+        # No wallet yet means no transactions.
+        return WalletTransaction.objects.filter(wallet_id=self.wallet_id)
+
+
+class WalletStatementAPIView(WalletTransactionListAPIView):
+    """
+    Statement for `?start=&end=`: opening/closing balances of the period and its transactions (paginated).
+    Balances come from the nearest checkpoint plus the ledger rows since, never from the whole history.
+    """
 
     def get_queryset(self):
-        # Return transactions for the current user's wallet
-        return WalletTransaction.objects.filter(wallet__user=self.request.user).order_by("-created_at")
+        return super().get_queryset().filter(created_at__gte=self.period["start"], created_at__lt=self.period["end"])
+
+    def list(self, request, *args, **kwargs):
+        serializer = StatementPeriodSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        self.period = serializer.validated_data
+
+        if self.wallet_id is None:
+            opening = closing = (ZERO, ZERO)
+        else:
+            opening = balances_as_of(self.wallet_id, self.period["start"])
+            closing = balances_as_of(self.wallet_id, self.period["end"])
+
+        summary = StatementSummarySerializer(
+            {
+                **self.period,
+                "opening_balance": opening[0],
+                "opening_held_balance": opening[1],
+                "closing_balance": closing[0],
+                "closing_held_balance": closing[1],
+            }
+        ).data
+
+        response = super().list(request, *args, **kwargs)
+        response.data = {**summary, **response.data}
+        return response
 
 
 class WithdrawalListAPIView(generics.ListAPIView):
@@ -168,4 +196,4 @@ class WithdrawalListAPIView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return WithdrawalRequest.objects.filter(user=self.request.user).order_by("-created_at")
+        return WithdrawalRequest.objects.filter(user_id=self.request.user.pk).order_by("-created_at")
@@ -0,0 +1,136 @@
+import logging
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+from common.db import retry_on_conflict
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .models import StripeEvent, Wallet, WalletTransaction
+from .services import apply_wallet_deltas
+
+logger = logging.getLogger(__name__)
+
+STRIPE_BATCH_SIZE = 200
+
+
+def record_stripe_event(event: dict) -> None:
+    """
+    Store a verified Stripe event for the worker. Redeliveries (same event id, or another completion event
+    for an already recorded Checkout Session) hit a unique constraint and are dropped by ON CONFLICT DO NOTHING.
+    """
+
+    session_id = None
+    if event["type"].startswith("checkout.session."):
+        session_id = event["data"]["object"].get("id")
+
+    StripeEvent.objects.bulk_create(
+        [
+            StripeEvent(
+                event_id=event["id"],
+                event_type=event["type"],
+                session_id=session_id,
+                payload=event,
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def parse_checkout(event: StripeEvent) -> tuple[str, Decimal]:
+    """
+    `(user_id, amount)` credited by a completed Checkout Session. Raises ValueError if the session can't be credited.
+    """
+
+    session = event.payload["data"]["object"]
+    client_reference_id = session.get("client_reference_id")
+    amount_total = session.get("amount_total")  # In cents
+
+    if not client_reference_id or amount_total is None:
+        raise ValueError("Missing user ID or amount in session")
+
+    return str(uuid.UUID(client_reference_id)), Decimal(amount_total) / 100
+
+
+@retry_on_conflict()
+def apply_stripe_events(batch_size: int = STRIPE_BATCH_SIZE) -> int:
+    """
+    Apply up to `batch_size` pending Stripe events in one transaction and return how many were handled.
+    Every completed checkout in the batch is credited with one wallet UPDATE and one ledger INSERT.
+
+    Events are claimed with SKIP LOCKED and marked in the same transaction as the credit,
+    so each one is applied exactly once even with several workers.
+    """
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        events = list(
+            StripeEvent.objects.select_for_update(skip_locked=True)
+            .filter(status=StripeEvent.Status.PENDING)
+            .order_by("created_at")[:batch_size]
+        )
+        if not events:
+            return 0
+
+        deposits = []
+        for event in events:
+            event.processed_at = now
+            if event.event_type != StripeEvent.CHECKOUT_COMPLETED:
+                event.status = StripeEvent.Status.IGNORED
+                continue
+            try:
+                user_id, amount = parse_checkout(event)
+            except ValueError as exc:
+                event.status, event.error = StripeEvent.Status.FAILED, str(exc)
+                continue
+            deposits.append((event, user_id, amount))
+
+        known = {
+            str(user_id)
+            for user_id in get_user_model()
+            .objects.filter(id__in=[user_id for _, user_id, _ in deposits])
+            .values_list("id", flat=True)
+        }
+        credits: dict = defaultdict(Decimal)
+        for event, user_id, amount in deposits:
+            if user_id in known:
+                event.status = StripeEvent.Status.PROCESSED
+                credits[user_id] += amount
+            else:
+                event.status, event.error = StripeEvent.Status.FAILED, f"User {user_id} not found"
+
+        if credits:
+            # Users who paid before ever opening their wallet get one now
+            Wallet.objects.bulk_create([Wallet(user_id=user_id) for user_id in credits], ignore_conflicts=True)
+            wallet_ids = {
+                str(user_id): wallet_id
+                for user_id, wallet_id in Wallet.objects.select_for_update()
+                .filter(user_id__in=list(credits))
+                .order_by("user_id")  # Canonical wallet lock order
+                .values_list("user_id", "id")
+            }
+            apply_wallet_deltas(credits, "balance", now)
+            WalletTransaction.objects.bulk_create(
+                [
+                    WalletTransaction(
+                        wallet_id=wallet_ids[user_id],
+                        transaction_type=WalletTransaction.Type.DEPOSIT,
+                        amount=amount,
+                        reference_id=event.session_id,  # Stripe Session ID
+                    )
+                    for event, user_id, amount in deposits
+                    if event.status == StripeEvent.Status.PROCESSED
+                ]
+            )
+
+        StripeEvent.objects.bulk_update(events, ["status", "error", "processed_at"])
+
+    for event in events:
+        if event.status == StripeEvent.Status.FAILED:
+            logger.error(f"Stripe event {event.event_id} failed: {event.error}")
+    logger.info(f"Processed {len(events)} Stripe events ({sum(credits.values(), Decimal(0))} deposited).")
+
+    return len(events)
@@ -0,0 +1,97 @@
+"""
+Endpoint benchmarks: every hot endpoint runs against synthetic datasets of several sizes and must stay within its
+query and latency budgets (see test_endpoints.py). Results of the run are written to `BENCHMARK_RESULTS`
+(JSON, default benchmark-results.json) so runs can be compared between commits.
+
+Run with `make benchmark` or `pytest tests/benchmarks`. On a slower machine, scale the latency budgets with
+`BENCHMARK_LATENCY_FACTOR` (query budgets never scale).
+"""
+
+import io
+import json
+import os
+import platform
+import subprocess
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+import pytest
+from auctions.synthetic import GENERATED_MODELS, SyntheticDataset
+from django.core.management import call_command
+from django.db import connection
+
+# Dataset sizes the budgets are declared for. One month of history keeps a realistic share of auctions open.
+SIZES = {
+    "small": {"users": 100, "auctions": 200},
+    "large": {"users": 2000, "auctions": 4000},
+}
+BIDS_PER_AUCTION = 15
+MONTHS = 1
+SEED = 42
+
+_results: list[dict] = []
+
+
+class Dataset(NamedTuple):
+    size: str  # Key of SIZES
+    synthetic: SyntheticDataset
+
+
+@pytest.fixture(scope="module", params=list(SIZES))
+def dataset(request, django_db_setup, django_db_blocker):
+    """
+    A committed synthetic dataset, shared by the module's benchmarks and removed afterwards.
+    Each benchmark still runs in its own rolled-back transaction, so writes (bids, purchases) don't leak.
+    """
+
+    size = SIZES[request.param]
+    now = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    with django_db_blocker.unblock():
+        call_command(
+            "generate_dataset",
+            f"--users={size['users']}",
+            f"--auctions={size['auctions']}",
+            f"--bids-per-auction={BIDS_PER_AUCTION}",
+            f"--months={MONTHS}",
+            f"--seed={SEED}",
+            f"--now={now.isoformat()}",
+            "--flush",
+            "--force",
+            stdout=io.StringIO(),
+        )
+        yield Dataset(
+            request.param, SyntheticDataset(size["users"], size["auctions"], BIDS_PER_AUCTION, MONTHS, SEED, now)
+        )
+
+        tables = ", ".join(f'"{model._meta.db_table}"' for model in GENERATED_MODELS)
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {tables} CASCADE")
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    return _results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return os.environ.get("GIT_COMMIT")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+
+    report = {
+        "commit": git_commit(),
+        "recorded_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "latency_factor": float(os.environ.get("BENCHMARK_LATENCY_FACTOR", 1)),
+        "results": _results,
+    }
+    with open(os.environ.get("BENCHMARK_RESULTS", "benchmark-results.json"), "w") as output:
+        json.dump(report, output, indent=2)
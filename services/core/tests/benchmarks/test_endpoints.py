@@ -0,0 +1,175 @@
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from auctions.models import AuctionListing
+from auctions.tests.factories import AuctionListingFactory
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from payments.models import Wallet
+from rest_framework.test import APIClient
+from users.models import User
+from users.serializers import MyTokenObtainPairSerializer
+
+WARMUP = 2
+REPEAT = 15
+
+
+@dataclass(frozen=True)
+class Budget:
+    queries: int  # Per request, at every dataset size
+    latency_ms: dict[str, float]  # Median per request, by dataset size
+
+
+# A regression against these fails the suite. Tighten them when an endpoint gets faster.
+BUDGETS = {
+    "auction_list": Budget(queries=1, latency_ms={"small": 50, "large": 500}),
+    "auction_search": Budget(queries=1, latency_ms={"small": 30, "large": 150}),
+    "auction_detail": Budget(queries=3, latency_ms={"small": 80, "large": 300}),
+    "my_bids": Budget(queries=1, latency_ms={"small": 80, "large": 300}),
+    "place_bid": Budget(queries=1, latency_ms={"small": 15, "large": 15}),
+    "buy_now": Budget(queries=7, latency_ms={"small": 30, "large": 30}),
+    "wallet": Budget(queries=2, latency_ms={"small": 15, "large": 15}),
+    "transactions": Budget(queries=2, latency_ms={"small": 25, "large": 25}),
+}
+
+
+def authenticated_client(user_id) -> APIClient:
+    """
+    A client sending a real access token, so the JWT authentication is part of what is measured.
+    """
+
+    client = APIClient()
+    token = MyTokenObtainPairSerializer.get_token(User.objects.get(id=user_id)).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def fund(user_id, amount="1000000.00") -> None:
+    Wallet.objects.filter(user_id=user_id).update(balance=Decimal(amount))
+
+
+def bench(name, dataset, benchmark_results, request_once):
+    """
+    Time `request_once(iteration)` (returning a response) and check the endpoint's budgets.
+    The queries are counted on the first measured request; the latency is the median of REPEAT requests.
+    """
+
+    budget = BUDGETS[name]
+    for iteration in range(WARMUP):
+        assert request_once(iteration).status_code < 400
+
+    timings = []
+    for iteration in range(WARMUP, WARMUP + REPEAT):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = request_once(iteration)
+            timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code < 400, response.content
+        if iteration == WARMUP:
+            query_count = len(queries)
+
+    factor = float(os.environ.get("BENCHMARK_LATENCY_FACTOR", 1))
+    median = statistics.median(timings)
+    latency_budget = budget.latency_ms[dataset.size] * factor
+    benchmark_results.append(
+        {
+            "endpoint": name,
+            "size": dataset.size,
+            "queries": query_count,
+            "query_budget": budget.queries,
+            "median_ms": round(median, 2),
+            "p95_ms": round(statistics.quantiles(timings, n=20, method="inclusive")[-1], 2),
+            "max_ms": round(max(timings), 2),
+            "latency_budget_ms": latency_budget,
+        }
+    )
+
+    assert query_count <= budget.queries, f"{name}: {query_count} queries, budget {budget.queries}"
+    assert median <= latency_budget, f"{name} ({dataset.size}): median {median:.1f} ms, budget {latency_budget} ms"
+
+
+def open_auction(owner_exclude):
+    """
+    An auction accepting bids for the rest of the run, not owned by `owner_exclude`.
+    """
+
+    return (
+        AuctionListing.objects.filter(
+            status=AuctionListing.Status.ACTIVE, end_time__gt=timezone.now() + timedelta(hours=1)
+        )
+        .exclude(product__owner_id=owner_exclude)
+        .order_by("-bid_count")
+        .first()
+    )
+
+
+@pytest.mark.django_db
+class TestEndpointBudgets:
+    def test_auction_list(self, dataset, benchmark_results, api_client):
+        url = reverse("auction_list")
+        bench(
+            "auction_list",
+            dataset,
+            benchmark_results,
+            lambda _: api_client.get(url, {"status": "ACTIVE", "ordering": "-bid_count", "min_price": "10"}),
+        )
+
+    def test_auction_search(self, dataset, benchmark_results, api_client):
+        url = reverse("auction_list")
+        bench(
+            "auction_search",
+            dataset,
+            benchmark_results,
+            lambda _: api_client.get(url, {"search": "item #1", "category": "ELECTRONICS"}),
+        )
+
+    def test_auction_detail(self, dataset, benchmark_results, api_client):
+        hottest = AuctionListing.objects.order_by("-bid_count").first()
+        url = reverse("auction_detail", kwargs={"id": hottest.id})
+        bench("auction_detail", dataset, benchmark_results, lambda _: api_client.get(url))
+
+    def test_my_bids(self, dataset, benchmark_results):
+        client = authenticated_client(dataset.synthetic.user_id(0))  # A power bidder
+        url = reverse("user_bids")
+        bench("my_bids", dataset, benchmark_results, lambda _: client.get(url))
+
+    def test_place_bid(self, dataset, benchmark_results):
+        bidder_id = dataset.synthetic.user_id(0)
+        fund(bidder_id)
+        auction = open_auction(bidder_id)
+        client = authenticated_client(bidder_id)
+        url = reverse("auction_bid", kwargs={"id": auction.id})
+
+        def bid(iteration):
+            return client.post(url, {"amount": str(auction.current_price + iteration + 1)}, format="json")
+
+        bench("place_bid", dataset, benchmark_results, bid)
+
+    def test_buy_now(self, dataset, benchmark_results):
+        buyer_id = dataset.synthetic.user_id(1)
+        fund(buyer_id)
+        # Buy-now closes the auction, so every request gets its own.
+        auctions = AuctionListingFactory.create_batch(WARMUP + REPEAT, buy_now_price="50.00")
+        client = authenticated_client(buyer_id)
+
+        def buy(iteration):
+            return client.post(reverse("auction_buy_now", kwargs={"id": auctions[iteration].id}))
+
+        bench("buy_now", dataset, benchmark_results, buy)
+
+    def test_wallet(self, dataset, benchmark_results):
+        client = authenticated_client(dataset.synthetic.user_id(0))
+        url = reverse("wallet-detail")
+        bench("wallet", dataset, benchmark_results, lambda _: client.get(url))
+
+    def test_transactions(self, dataset, benchmark_results):
+        client = authenticated_client(dataset.synthetic.user_id(0))
+        url = reverse("wallet_transactions")
+        bench("transactions", dataset, benchmark_results, lambda _: client.get(url))
@@ -1,7 +1,12 @@
+from common.routers import route_user
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
 from rest_framework import exceptions
 from rest_framework.authentication import CSRFCheck
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 
 
 def enforce_csrf(request):
@@ -19,6 +24,38 @@ def enforce_csrf(request):
         raise exceptions.PermissionDenied("CSRF Failed: %s" % reason)
 
 
+def load_user(user_id):
+    try:
+        user = get_user_model().objects.get(pk=user_id)
+    except get_user_model().DoesNotExist:
+        raise exceptions.AuthenticationFailed("User not found", code="user_not_found") from None
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed("User is inactive", code="user_inactive")
+    return user
+
+
+class TokenUser(SimpleLazyObject):
+    """
+    `request.user` answered from the access token: `id`/`pk`, `username` and the authentication flags come from
+    the claims, anything else (email, is_staff, save(), use as a model instance) loads the user row once.
+    Filter by `user_id=request.user.id` rather than `user=request.user` to keep it a claims-only request.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __bool__(self):  # `request.user and ...` in permission checks
+        return True
+
+    def __init__(self, token):
+        user_id = get_user_model()._meta.pk.to_python(token[api_settings.USER_ID_CLAIM])
+        super().__init__(lambda: load_user(user_id))
+        # Instance attributes are found before the lazy proxying __getattr__ runs.
+        self.__dict__["id"] = self.__dict__["pk"] = user_id
+        if "username" in token:
+            self.__dict__["username"] = token["username"]
+
+
 class CustomJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
         header = self.get_header(request)
@@ -37,3 +74,16 @@ class CustomJWTAuthentication(JWTAuthentication):
 
         validated_token = self.get_validated_token(raw_token)
         return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        """
+        A TokenUser instead of a users query per request (the row is loaded only if a view needs more than claims).
+        A deactivated user keeps access until their access token expires.
+        """
+
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        # Users who just wrote read from the primary (from here on, including a lazy load of their row)
+        route_user(validated_token[api_settings.USER_ID_CLAIM])
+        return TokenUser(validated_token)
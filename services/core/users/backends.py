@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import hash_password, verify_password
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend with the password check on the hashing pool (see users.hashing).
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)  # type: ignore[attr-defined]
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)  # type: ignore[attr-defined]
+        except UserModel.DoesNotExist:
+            # Hash anyway, so an unknown username takes as long as a wrong password.
+            hash_password(password, "login")
+            return None
+
+        if verify_password(user, password, "login") and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,169 @@
+"""
+Password hashing off the request threads.
+
+Hashing is deliberately slow CPU work. Done inline, a signup or login burst pins every worker and unrelated reads
+stall behind it. Here every hash or verification runs on a small per-process thread pool
+(`PASSWORD_HASH_WORKERS`; the hashers release the GIL while they work), so hashing never takes more than that many
+cores per process. Each endpoint admits at most `PASSWORD_HASH_CONCURRENCY[endpoint]` requests (running or queued)
+per process, and a request that can't get in within `PASSWORD_HASH_ADMIT_TIMEOUT` seconds gets a 503 instead of
+waiting behind the whole burst.
+
+Hashes made with an outdated hasher or cost are upgraded on login, but only for a `PASSWORD_REHASH_RATE` fraction
+of logins and only when the pool is idle, in the background: raising the hasher cost spreads the upgrade over
+time instead of doubling the CPU cost of every login at once.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.db import close_old_connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_slots: dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+_pending = 0  # Submitted and not finished, all endpoints
+
+_metrics: dict[str, dict] = defaultdict(
+    lambda: {"admitted": 0, "rejected": 0, "queue_wait_ms": 0.0, "queue_wait_max_ms": 0.0, "hash_ms": 0.0}
+)
+_rehashed = 0
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in requests right now, please retry in a moment."
+    default_code = "hashing_busy"
+
+
+def _slot(endpoint: str) -> threading.BoundedSemaphore:
+    with _lock:
+        if endpoint not in _slots:
+            _slots[endpoint] = threading.BoundedSemaphore(settings.PASSWORD_HASH_CONCURRENCY[endpoint])
+        return _slots[endpoint]
+
+
+def _record(endpoint: str, **values) -> None:
+    with _lock:
+        metrics = _metrics[endpoint]
+        for name, value in values.items():
+            metrics[name] += value
+        if "queue_wait_ms" in values:
+            metrics["queue_wait_max_ms"] = max(metrics["queue_wait_max_ms"], values["queue_wait_ms"])
+
+
+def _submit(func, *args):
+    global _pending
+
+    def done(_):
+        global _pending
+        with _lock:
+            _pending -= 1
+
+    with _lock:
+        _pending += 1
+    future = _executor.submit(func, *args)
+    future.add_done_callback(done)
+    return future
+
+
+def run_hashing(endpoint: str, func, *args):
+    """
+    Run `func(*args)` (a hash or a verification) on the hashing pool under `endpoint`'s concurrency cap,
+    blocking the calling request until it is done. Raises HashingBusy if the endpoint is saturated.
+    """
+
+    slot = _slot(endpoint)
+    if not slot.acquire(timeout=settings.PASSWORD_HASH_ADMIT_TIMEOUT):
+        _record(endpoint, rejected=1)
+        logger.warning(f"Password hashing for {endpoint} is saturated, request rejected.")
+        raise HashingBusy()
+
+    try:
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started, time.perf_counter()
+
+        result, started, finished = _submit(timed).result()
+    finally:
+        slot.release()
+
+    _record(
+        endpoint,
+        admitted=1,
+        queue_wait_ms=(started - submitted) * 1000,
+        hash_ms=(finished - started) * 1000,
+    )
+    return result
+
+
+def hash_password(raw_password: str, endpoint: str) -> str:
+    return run_hashing(endpoint, make_password, raw_password)
+
+
+def verify_password(user, raw_password: str, endpoint: str) -> bool:
+    """
+    Check `raw_password` against the user's hash on the pool, then maybe upgrade the hash (see module docstring).
+    """
+
+    encoded = user.password
+    valid = run_hashing(endpoint, check_password, raw_password, encoded)
+    if valid and needs_rehash(encoded) and should_rehash():
+        _submit(rehash, user.pk, raw_password, encoded)
+    return valid
+
+
+def needs_rehash(encoded: str) -> bool:
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = get_hasher("default")
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def should_rehash() -> bool:
+    with _lock:
+        idle = _pending < settings.PASSWORD_HASH_WORKERS
+    return idle and random.random() < settings.PASSWORD_REHASH_RATE
+
+
+def rehash(user_id, raw_password: str, encoded: str) -> None:
+    """
+    Store a fresh hash, unless the password changed in the meantime (the update is guarded on the old hash).
+    """
+
+    global _rehashed
+    try:
+        updated = (
+            get_user_model().objects.filter(pk=user_id, password=encoded).update(password=make_password(raw_password))
+        )
+        with _lock:
+            _rehashed += updated
+    except Exception:
+        logger.exception(f"Rehashing the password of user {user_id} failed.")
+    finally:
+        close_old_connections()  # The pool thread's own connection
+
+
+def hashing_metrics() -> dict:
+    with _lock:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "pending": _pending,
+            "rehashed": _rehashed,
+            "endpoints": {endpoint: dict(metrics) for endpoint, metrics in _metrics.items()},
+        }
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.migrations.recorder import MigrationRecorder
+
+from users.tokens import blacklist_jti, get_blacklist_client
+
+# simplejwt's token_blacklist app tables, left behind once the app is uninstalled
+OUTSTANDING_TABLE = "token_blacklist_outstandingtoken"
+BLACKLISTED_TABLE = "token_blacklist_blacklistedtoken"
+
+STILL_BLACKLISTED = f"""
+    SELECT o.jti, EXTRACT(EPOCH FROM o.expires_at) FROM "{BLACKLISTED_TABLE}" b
+    JOIN "{OUTSTANDING_TABLE}" o ON o.id = b.token_id
+    WHERE o.expires_at > now()
+"""
+
+
+class Command(BaseCommand):
+    help = "Moves the still-valid entries of simplejwt's SQL token blacklist into Valkey, then drops its tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be migrated without writing")
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s), to_regclass(%s)", [OUTSTANDING_TABLE, BLACKLISTED_TABLE])
+            if None in cursor.fetchone():
+                self.stdout.write("No SQL token blacklist left, nothing to do.")
+                return
+
+            cursor.execute(f'SELECT count(*) FROM "{OUTSTANDING_TABLE}"')
+            outstanding = cursor.fetchone()[0]
+            cursor.execute(STILL_BLACKLISTED)
+            blacklisted = cursor.fetchall()
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"Would migrate {len(blacklisted)} unexpired blacklisted tokens and drop {outstanding} token rows."
+            )
+            return
+
+        # Valkey first: if it fails, the tables are still there to retry from.
+        get_blacklist_client().ping()
+        migrated = sum(blacklist_jti(jti, float(expires_at)) for jti, expires_at in blacklisted)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE "{BLACKLISTED_TABLE}", "{OUTSTANDING_TABLE}"')
+            recorder = MigrationRecorder(connection)
+            if recorder.has_table():
+                recorder.migration_qs.filter(app="token_blacklist").delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Migrated {migrated} blacklisted tokens to Valkey, dropped {outstanding} token rows.")
+        )
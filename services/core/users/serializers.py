@@ -2,11 +2,16 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
 
+from .hashing import hash_password, verify_password
 from .models import User
+from .tokens import RefreshToken
 
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
@@ -17,6 +22,11 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         return token
 
 
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    # Rotation blacklists the old token in Valkey
+    token_class = RefreshToken
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -36,7 +46,7 @@ class ChangePasswordSerializer(serializers.Serializer):
 
     def validate_old_password(self, value):
         user = self.context["request"].user
-        if not user.check_password(value):
+        if not verify_password(user, value, "change_password"):
             raise serializers.ValidationError("Old password is not correct.")
         return value
 
@@ -56,7 +66,10 @@ class RegisterSerializer(serializers.ModelSerializer):
         return attrs
 
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data["username"], email=validated_data["email"], password=validated_data["password"]
+        user = User(
+            username=User.normalize_username(validated_data["username"]),
+            email=User.objects.normalize_email(validated_data["email"]),
+            password=hash_password(validated_data["password"], "register"),
         )
+        user.save()
         return user
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import CustomJWTAuthentication, TokenUser
+from users.serializers import MyTokenObtainPairSerializer
+from users.tests.factories import UserFactory
+
+
+def access_token(user):
+    return MyTokenObtainPairSerializer.get_token(user).access_token
+
+
+def users_queries(queries):
+    return [query["sql"] for query in queries if 'FROM "users"' in query["sql"]]
+
+
+@pytest.mark.django_db
+class TestTokenUser:
+    def test_claims_need_no_query(self, django_assert_num_queries):
+        user = UserFactory(username="alice")
+        token = access_token(user)
+
+        with django_assert_num_queries(0):
+            token_user = TokenUser(token)
+            assert token_user.id == token_user.pk == user.id
+            assert token_user.username == "alice"
+            assert token_user and token_user.is_authenticated and not token_user.is_anonymous
+
+    def test_other_attributes_load_the_user_once(self, django_assert_num_queries):
+        user = UserFactory(email="alice@example.com")
+        token_user = TokenUser(access_token(user))
+
+        with django_assert_num_queries(1):
+            assert token_user.email == "alice@example.com"
+            assert token_user.is_staff is False
+            assert token_user == user
+
+    def test_inactive_user_fails_on_load(self, api_client):
+        user = UserFactory(is_active=False)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token(user)}")
+
+        response = api_client.get(reverse("user_me"))  # Reads the email: loads the user
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_token_without_user_id(self):
+        token = AccessToken()
+        token.payload.pop("user_id", None)
+
+        with pytest.raises(InvalidToken):
+            CustomJWTAuthentication().get_user(token)
+
+
+@pytest.mark.django_db
+def test_authenticated_read_skips_users_query(api_client):
+    user = UserFactory()
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token(user)}")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("user_bids"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert users_queries(queries.captured_queries) == []
@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.urls import reverse
+from rest_framework import status
+
+from users import hashing
+from users.tests.factories import UserFactory
+
+MD5 = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+
+@pytest.fixture(autouse=True)
+def fresh_slots():
+    hashing._slots.clear()
+    yield
+    hashing._slots.clear()
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    def test_hash_and_verify_on_pool(self):
+        user = UserFactory.build(password=hashing.hash_password("s3cret-pass", "register"))
+
+        assert hashing.verify_password(user, "s3cret-pass", "login")
+        assert not hashing.verify_password(user, "wrong", "login")
+
+        metrics = hashing.hashing_metrics()["endpoints"]
+        assert metrics["register"]["admitted"] >= 1
+        assert metrics["login"]["admitted"] >= 2
+        assert metrics["login"]["queue_wait_max_ms"] >= 0
+
+    def test_saturated_endpoint_is_rejected(self, settings, api_client):
+        settings.PASSWORD_HASH_CONCURRENCY = {**settings.PASSWORD_HASH_CONCURRENCY, "login": 1}
+        settings.PASSWORD_HASH_ADMIT_TIMEOUT = 0
+        user = UserFactory()
+        user.set_password("s3cret-pass")
+        user.save()
+
+        hashing._slot("login").acquire()  # Another login is hashing
+        response = api_client.post(reverse("user_login"), {"username": user.username, "password": "s3cret-pass"})
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert hashing.hashing_metrics()["endpoints"]["login"]["rejected"] >= 1
+
+    def test_login_upgrades_outdated_hash_in_background(self, settings, api_client):
+        settings.PASSWORD_HASHERS = [*settings.PASSWORD_HASHERS, MD5]
+        settings.PASSWORD_REHASH_RATE = 1
+        user = UserFactory(password=make_password("s3cret-pass", hasher="md5"))
+
+        with patch("users.hashing._submit", wraps=hashing._submit) as submit:
+            response = api_client.post(reverse("user_login"), {"username": user.username, "password": "s3cret-pass"})
+
+        assert response.status_code == status.HTTP_200_OK
+        rehash_calls = [call for call in submit.call_args_list if call.args[0] is hashing.rehash]
+        assert [call.args[1:] for call in rehash_calls] == [(user.pk, "s3cret-pass", user.password)]
+
+    def test_no_upgrade_when_rate_is_zero(self, settings):
+        settings.PASSWORD_HASHERS = [*settings.PASSWORD_HASHERS, MD5]
+        settings.PASSWORD_REHASH_RATE = 0
+        user = UserFactory.build(password=make_password("s3cret-pass", hasher="md5"))
+
+        with patch("users.hashing.rehash") as rehash:
+            assert hashing.verify_password(user, "s3cret-pass", "login")
+
+        rehash.assert_not_called()
+
+    @patch("users.hashing.close_old_connections")
+    def test_rehash_is_guarded_on_old_hash(self, close_old_connections, settings):
+        settings.PASSWORD_HASHERS = [*settings.PASSWORD_HASHERS, MD5]
+        old = make_password("s3cret-pass", hasher="md5")
+        user = UserFactory(password=old)
+
+        hashing.rehash(user.pk, "s3cret-pass", "md5$stale$hash")  # Password changed since: untouched
+        user.refresh_from_db()
+        assert user.password == old
+
+        hashing.rehash(user.pk, "s3cret-pass", old)
+        user.refresh_from_db()
+        assert not hashing.needs_rehash(user.password)
+        assert user.check_password("s3cret-pass")
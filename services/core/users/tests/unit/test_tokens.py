@@ -0,0 +1,95 @@
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+import redis
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+
+from users.tests.factories import UserFactory
+from users.tokens import RefreshToken, blacklist_key
+
+
+@pytest.mark.django_db
+class TestTokenBlacklist:
+    def test_blacklist_expires_with_token(self, token_blacklist):
+        token = RefreshToken.for_user(UserFactory())
+        token.blacklist()
+
+        key = blacklist_key(token["jti"])
+        lifetime = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()
+        assert lifetime - 5 < token_blacklist.ttl(key) <= lifetime + 1
+        with pytest.raises(TokenError, match="blacklisted"):
+            RefreshToken(str(token))
+
+    def test_rotated_refresh_token_is_rejected(self, api_client):
+        token = str(RefreshToken.for_user(UserFactory()))
+
+        first = api_client.post(reverse("token_refresh"), {"refresh": token})
+        replay = api_client.post(reverse("token_refresh"), {"refresh": token})
+
+        assert first.status_code == status.HTTP_200_OK
+        assert replay.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_unavailable_blacklist_fails_closed(self, token_blacklist):
+        token = str(RefreshToken.for_user(UserFactory()))
+
+        with patch.object(token_blacklist, "exists", side_effect=redis.ConnectionError("down")):
+            with pytest.raises(TokenError, match="unavailable"):
+                RefreshToken(token)
+
+
+@pytest.mark.django_db
+class TestMigrateTokenBlacklistCommand:
+    @pytest.fixture(autouse=True)
+    def no_sql_blacklist(self):
+        # A database created while the token_blacklist app was installed still has its tables.
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS token_blacklist_blacklistedtoken, token_blacklist_outstandingtoken")
+
+    def create_sql_blacklist(self, rows):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE token_blacklist_outstandingtoken (id bigint PRIMARY KEY, jti varchar(255), "
+                "expires_at timestamptz)"
+            )
+            cursor.execute("CREATE TABLE token_blacklist_blacklistedtoken (id bigint PRIMARY KEY, token_id bigint)")
+            for id, jti, expires_in, blacklisted in rows:
+                cursor.execute(
+                    "INSERT INTO token_blacklist_outstandingtoken VALUES (%s, %s, now() + %s * interval '1 second')",
+                    [id, jti, expires_in],
+                )
+                if blacklisted:
+                    cursor.execute("INSERT INTO token_blacklist_blacklistedtoken VALUES (%s, %s)", [id, id])
+
+    def test_migrates_live_entries_and_drops_tables(self, token_blacklist):
+        self.create_sql_blacklist([(1, "live", 600, True), (2, "expired", -600, True), (3, "issued", 600, False)])
+
+        out = StringIO()
+        call_command("migrate_token_blacklist", stdout=out)
+
+        assert token_blacklist.exists(blacklist_key("live"))
+        assert 590 < token_blacklist.ttl(blacklist_key("live")) <= 601
+        assert not token_blacklist.exists(blacklist_key("expired"), blacklist_key("issued"))
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('token_blacklist_outstandingtoken')")
+            assert cursor.fetchone()[0] is None
+        assert "Migrated 1 blacklisted tokens" in out.getvalue()
+
+    def test_dry_run_and_nothing_to_do(self, token_blacklist):
+        out = StringIO()
+        call_command("migrate_token_blacklist", stdout=out)
+        assert "nothing to do" in out.getvalue()
+
+        self.create_sql_blacklist([(1, "live", 600, True)])
+        call_command("migrate_token_blacklist", "--dry-run", stdout=out)
+
+        assert "Would migrate 1" in out.getvalue()
+        assert token_blacklist.dbsize() == 0
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM token_blacklist_blacklistedtoken")
+            assert cursor.fetchone()[0] == 1
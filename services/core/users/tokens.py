@@ -0,0 +1,63 @@
+import logging
+import time
+
+import redis
+from common.valkey import get_client
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+def blacklist_key(jti: str) -> str:
+    return f"jwt:blacklist:{jti}"
+
+
+def get_blacklist_client() -> redis.Redis:
+    return get_client(settings.TOKEN_BLACKLIST_URL)
+
+
+def blacklist_jti(jti: str, expires_at: float) -> bool:
+    """
+    Blacklist a token id until the token would have expired anyway (epoch seconds), after which the key
+    disappears by itself. Returns False if the token already expired (nothing to remember).
+    """
+
+    ttl = int(expires_at - time.time()) + 1
+    if ttl <= 0:
+        return False
+    get_blacklist_client().set(blacklist_key(jti), 1, ex=ttl)
+    return True
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Refresh token whose blacklist lives in Valkey instead of simplejwt's outstanding/blacklisted token tables:
+    one key per revoked token, expiring with it, so the blacklist stays as small as the set of revoked tokens
+    still alive and a check is a single EXISTS.
+    """
+
+    def verify(self, *args, **kwargs) -> None:
+        self.check_blacklist()
+        super().verify(*args, **kwargs)
+
+    def check_blacklist(self) -> None:
+        try:
+            blacklisted = get_blacklist_client().exists(blacklist_key(self.payload[api_settings.JTI_CLAIM]))
+        except redis.RedisError as exc:
+            # Fail closed: a refresh token we can't check could be a revoked one.
+            logger.error(f"Token blacklist unavailable: {exc}")
+            raise TokenError(_("Token blacklist unavailable")) from exc
+
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self) -> None:  # type: ignore[override]  # No BlacklistedToken row: the entry lives in Valkey
+        blacklist_jti(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+
+    def outstand(self) -> None:
+        # Issued tokens aren't tracked: only revoked ones need remembering.
+        return None
@@ -6,6 +6,7 @@ from .views import (
     LoginView,
     LogoutView,
     MeAPIView,
+    PasswordHashingMetricsAPIView,
     RegisterView,
 )
 
@@ -16,4 +17,5 @@ urlpatterns = [
     path("me/", MeAPIView.as_view(), name="user_me"),
     path("change-password/", ChangePasswordView.as_view(), name="change_password"),
     path("token/refresh/", CookieTokenRefreshView.as_view(), name="token_refresh"),
+    path("hashing/metrics/", PasswordHashingMetricsAPIView.as_view(), name="password_hashing_metrics"),
 ]
@@ -3,9 +3,9 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from .hashing import hash_password, hashing_metrics
 from .models import User
 from .serializers import (
     ChangePasswordSerializer,
@@ -14,6 +14,7 @@ from .serializers import (
     UserSerializer,
     UserUpdateSerializer,
 )
+from .tokens import RefreshToken
 from .utils import set_auth_cookies
 
 
@@ -52,13 +53,9 @@ class ChangePasswordView(generics.UpdateAPIView):
         serializer = self.get_serializer(data=request.data)
 
         if serializer.is_valid():
-            # Check old password
-            if not self.object.check_password(serializer.data.get("old_password")):
-                return Response({"old_password": ["Wrong password."]}, status=status.HTTP_400_BAD_REQUEST)
-
-            # set_password also hashes the password that the user will get
-            self.object.set_password(serializer.data.get("new_password"))
-            self.object.save()
+            # The old password was checked by the serializer; hash the new one on the hashing pool
+            self.object.password = hash_password(serializer.data.get("new_password"), "change_password")
+            self.object.save(update_fields=["password"])
 
             response = {
                 "status": "success",
@@ -167,3 +164,14 @@ class CookieTokenRefreshView(TokenRefreshView):
             return response
         except (InvalidToken, TokenError) as e:
             return Response({"detail": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+
+
+class PasswordHashingMetricsAPIView(APIView):
+    """
+    Hashing pool metrics of the serving process: admitted/rejected requests, queue wait and hash time per endpoint.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(hashing_metrics())
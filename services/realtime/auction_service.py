@@ -1,12 +1,22 @@
-import uuid
-from datetime import datetime
 from decimal import Decimal
 
-from models import AuctionListing, BidTransaction, Wallet
-from sqlalchemy import insert, select
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.auth import AuthenticatedUser
 
+# SYNC: Matches core's auction_place_bid() stored function (services/core/auctions/sql/place_bid.sql)
+PLACE_BID = text("SELECT * FROM auction_place_bid(CAST(:auction_id AS uuid), CAST(:bidder_id AS uuid), :amount)")
+
+# Refusal statuses of auction_place_bid -> client error messages
+BID_ERRORS = {
+    "not_found": "Auction not found",
+    "not_active": "Auction is not active",
+    "ended": "Auction has expired",
+    "own_auction": "You cannot bid on your own auction",
+    "too_low": "Bid amount must be higher than current price {price}",
+    "insufficient_funds": "Insufficient funds",
+}
+
 
 class AuctionService:
     def __init__(self, db: AsyncSession):
@@ -15,64 +25,19 @@ class AuctionService:
     async def place_bid(self, auction_id: str, user: AuthenticatedUser, amount: Decimal) -> dict:
         """
         Thread-Safe (Concurrency Handled) Auction Function
+        Locking, validation, holds/releases, the bid and ledger rows all happen in core's auction_place_bid()
+        stored function, in one round trip; the REST API places bids through the same function.
         """
 
         try:
-            # Start Transaction (automatically in AsyncSession)
-
-            # 1. Lock the wallet FIRST (to avoid deadlocks, order matters if multiple resources)
-            # We want to ensure user has money.
-            query_wallet = select(Wallet).where(Wallet.user_id == user.id).with_for_update()
-            result_wallet = await self.db.execute(query_wallet)
-            wallet = result_wallet.scalar_one_or_none()
-
-            if not wallet:
-                return {"success": False, "error": "Wallet not found"}
-
-            if wallet.balance < amount:
-                return {"success": False, "error": f"Insufficient funds. Balance: {wallet.balance}"}
-
-            # 2. Lock the auction
-            query_auction = select(AuctionListing).where(AuctionListing.id == auction_id).with_for_update()
-            result_auction = await self.db.execute(query_auction)
-            auction = result_auction.scalar_one_or_none()
-
-            if not auction:
-                return {"success": False, "error": "Auction not found"}
-
-            # Validate auction status
-            if auction.status != "ACTIVE":
-                return {"success": False, "error": "Auction is not active"}
-
-            if datetime.utcnow() > auction.end_time.replace(tzinfo=None):
-                return {"success": False, "error": "Auction has expired"}
-
-            if amount <= auction.current_price:
-                return {
-                    "success": False,
-                    "error": f"Bid amount must be higher than current price {auction.current_price}",
-                }
-
-            # 3. Deduct Money & Hold
-            wallet.balance -= amount
-            wallet.held_balance += amount
-            # Direct object update works in SQLAlchemy session
-
-            # 4. Update Auction
-            auction.current_price = amount
-
-            # 5. Insert Bid
-            new_bid_id = str(uuid.uuid4())
-            await self.db.execute(
-                insert(BidTransaction).values(
-                    id=new_bid_id,
-                    auction_id=auction_id,
-                    bidder_id=user.id,
-                    amount=amount,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow(),
-                )
+            result = await self.db.execute(
+                PLACE_BID, {"auction_id": str(auction_id), "bidder_id": str(user.id), "amount": amount}
             )
+            row = result.mappings().one()
+
+            if row["status"] != "ok":
+                await self.db.rollback()
+                return {"success": False, "error": BID_ERRORS[row["status"]].format(price=row["price"])}
 
             # Commit Transaction
             await self.db.commit()
@@ -82,9 +47,9 @@ class AuctionService:
                 "bidder_id": str(user.id),
                 "bidder_name": user.username or "Unknown",
                 "auction_id": str(auction_id),
-                "new_price": str(amount),
-                "timestamp": datetime.utcnow().isoformat(),
-                "new_balance": str(wallet.balance),  # Return new balance for private ACK
+                "new_price": str(row["price"]),
+                "timestamp": row["bid_at"].isoformat(),
+                "new_balance": str(row["balance"]),  # Return new balance for private ACK
             }
 
         except Exception as e:
@@ -13,8 +13,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 def mock_redis():
     """Mock Redis client."""
     mock = AsyncMock(spec=Redis)
+    # publish/eval are declared sync (returning awaitables), so the spec alone doesn't make them coroutines
     # Mock publish to return integer (number of clients received)
-    mock.publish.return_value = 1
+    mock.publish = AsyncMock(return_value=1)
+    mock.eval = AsyncMock(return_value=1)
     return mock
 
 
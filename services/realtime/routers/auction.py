@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+from datetime import datetime
 from decimal import Decimal
 
 from auction_service import AuctionService
@@ -10,7 +11,7 @@ from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.auth import AuthenticatedUser, get_current_user
-from utils.redis import redis_listener
+from utils.redis import record_bid, redis_listener
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -101,6 +102,9 @@ async def websocket_endpoint(
                         # Publish to Redis channel
                         await redis_client.publish(channel_name, broadcast_msg)
 
+                        # 3. Count it towards the "hot auctions" ranking
+                        await record_bid(redis_client, auction_id, datetime.fromisoformat(result["timestamp"]))
+
                     else:
                         # Send error message to client (Example: "Bid amount must be greater than current price")
                         await websocket.send_json({"type": "ERROR", "message": result["error"]})
@@ -73,6 +73,10 @@ async def test_websocket_place_bid(authenticated_client, mock_redis):
             # masked username for "test_bidder" is "t***r"
             assert msg_data["bidder"]["username"] == "t***r"
 
+            # 3. Verify the bid counted towards the hot index
+            script, numkeys, *keys_and_args = mock_redis.eval.call_args.args
+            assert keys_and_args[:3] == ["auctions:ending_soon", "auctions:hot", auction_id]
+
 
 @pytest.mark.asyncio
 async def test_websocket_place_bid_failure(authenticated_client):
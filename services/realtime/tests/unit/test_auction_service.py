@@ -0,0 +1,74 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from auction_service import PLACE_BID, AuctionService
+from utils.auth import AuthenticatedUser
+
+BIDDER = AuthenticatedUser(id="11111111-1111-1111-1111-111111111111", username="bidder")
+AUCTION_ID = "22222222-2222-2222-2222-222222222222"
+
+
+def place_bid_row(status, **overrides):
+    """A row as auction_place_bid() returns it."""
+    row = {
+        "status": status,
+        "bid_id": None,
+        "bid_at": None,
+        "price": Decimal("100.00"),
+        "previous_winner_id": None,
+        "bid_count": None,
+        "unique_bidders": None,
+        "balance": None,
+        "held_balance": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def returning(mock_db_session, row):
+    result = MagicMock()
+    result.mappings.return_value.one.return_value = row
+    mock_db_session.execute.return_value = result
+
+
+@pytest.mark.asyncio
+async def test_place_bid_accepted(mock_db_session):
+    """Test that an accepted bid is committed and mapped from the function's row."""
+    bid_at = datetime(2026, 1, 1, 12, tzinfo=UTC)
+    returning(
+        mock_db_session,
+        place_bid_row("ok", bid_at=bid_at, price=Decimal("150.00"), balance=Decimal("850.00"), bid_count=3),
+    )
+
+    result = await AuctionService(mock_db_session).place_bid(AUCTION_ID, BIDDER, Decimal("150.00"))
+
+    statement, params = mock_db_session.execute.call_args.args
+    assert statement is PLACE_BID
+    assert params == {"auction_id": AUCTION_ID, "bidder_id": BIDDER.id, "amount": Decimal("150.00")}
+    assert result == {
+        "success": True,
+        "bidder_id": BIDDER.id,
+        "bidder_name": "bidder",
+        "auction_id": AUCTION_ID,
+        "new_price": "150.00",
+        "timestamp": bid_at.isoformat(),
+        "new_balance": "850.00",
+    }
+    mock_db_session.commit.assert_awaited_once()
+    mock_db_session.rollback.assert_not_awaited()
+    mock_db_session.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_place_bid_refused(mock_db_session):
+    """Test that a refused bid is rolled back and reported with the current price."""
+    returning(mock_db_session, place_bid_row("too_low", price=Decimal("120.00")))
+
+    result = await AuctionService(mock_db_session).place_bid(AUCTION_ID, BIDDER, Decimal("110.00"))
+
+    assert result == {"success": False, "error": "Bid amount must be higher than current price 120.00"}
+    mock_db_session.rollback.assert_awaited_once()
+    mock_db_session.commit.assert_not_awaited()
+    mock_db_session.close.assert_awaited_once()
@@ -1,10 +1,32 @@
 import logging
+import math
+from datetime import datetime
 
 from fastapi import WebSocket
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 logger = logging.getLogger(__name__)
 
+# SYNC: Matches core's ranking indexes (services/core/auctions/rankings.py)
+ENDING_SOON_KEY = "auctions:ending_soon"
+HOT_KEY = "auctions:hot"
+HOT_TAU = 3600 / math.log(2)  # One hour half-life
+RECORD_BID_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+local score = tonumber(ARGV[2])
+local current = redis.call('ZSCORE', KEYS[2], ARGV[1])
+if current then
+    current = tonumber(current)
+    local high = math.max(current, score)
+    score = high + math.log(math.exp(current - high) + math.exp(score - high))
+end
+redis.call('ZADD', KEYS[2], string.format('%.17g', score), ARGV[1])
+return 1
+"""
+
 
 async def redis_listener(
     websocket: WebSocket,
@@ -33,3 +55,16 @@ async def redis_listener(
         # Unsubscribe and close the connection
         await pubsub.unsubscribe(channel_name)
         await pubsub.aclose()
+
+
+async def record_bid(redis_client: Redis, auction_id: str, bid_at: datetime):
+    """
+    Count an accepted bid towards the auction's activity in the "hot" index (best effort).
+    """
+
+    try:
+        await redis_client.eval(
+            RECORD_BID_SCRIPT, 2, ENDING_SOON_KEY, HOT_KEY, str(auction_id), bid_at.timestamp() / HOT_TAU
+        )
+    except RedisError as e:
+        logger.warning(f"Could not record bid on Auction {auction_id} in the hot index: {e}")